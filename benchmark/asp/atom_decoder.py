@@ -0,0 +1,191 @@
+"""
+Decoding of a witness's shown atoms into typed records.
+
+`decode_witness` reads atoms as clingo prints them (`--outf=2`, or `str(symbol)` from the
+in-process engine) and dispatches on the predicate name through `DECODERS`, so atoms of other
+predicates (`fl/2`, most of a large witness) cost one dict lookup. Only the atoms it decodes
+are split into their top-level arguments by `split_arguments`, which keeps nested terms and
+quoted strings intact; the arity then picks the decoder. An atom whose arguments do not have
+the expected shape is kept as its string.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypedDict
+
+
+class NonexecFeedback(TypedDict, total=False):
+    message: str
+    subject: str
+    action: str
+    time: int
+    # only for act/4 (intentional actions)
+    intention: str
+
+
+class Unjustified(TypedDict):
+    subject: str
+    fluent: str
+    intention: str
+    time: int
+
+
+class OpenCommitmentFrame(TypedDict):
+    subject: str
+    intention: str
+
+
+class Conflict(TypedDict):
+    threatener: str
+    threatener_intention: str
+    threatened_actor: str
+    threatened_intention: str
+    action: str
+    summary: str
+
+
+def split_quoted(inner: str) -> List[str]:
+    """Top-level comma split of an argument list that contains string terms."""
+    args: List[str] = []
+    depth = 0
+    quoted = False
+    escaped = False
+    begin = 0
+    for i, ch in enumerate(inner):
+        if quoted:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                quoted = False
+        elif ch == '"':
+            quoted = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(inner[begin:i])
+            begin = i + 1
+    if depth or quoted:
+        raise ValueError(f"unbalanced arguments: {inner}")
+    args.append(inner[begin:])
+    return args
+
+
+def split_arguments(term: str) -> Tuple[str, List[str]]:
+    """`name(a,f(b,c),"x,y")` -> `("name", ["a", "f(b,c)", '"x,y"'])`; a constant has no arguments."""
+    start = term.find("(")
+    if start < 0:
+        return term, []
+    if term[-1] != ")":
+        raise ValueError(f"not a term: {term}")
+    inner = term[start + 1 : -1]
+    if '"' in inner:
+        return term[:start], split_quoted(inner)
+    if "(" not in inner:
+        return term[:start], inner.split(",")
+    # rejoin the pieces of a plain comma split until their parentheses balance
+    args: List[str] = []
+    pending = ""
+    for piece in inner.split(","):
+        pending = f"{pending},{piece}" if pending else piece
+        if pending.count("(") == pending.count(")"):
+            args.append(pending)
+            pending = ""
+    if pending:
+        raise ValueError(f"unbalanced arguments: {inner}")
+    return term[:start], args
+
+
+def string_value(term: str) -> str:
+    """The text of a string term (`"a \\"b\\""` -> `a "b"`)."""
+    if len(term) < 2 or term[0] != '"' or term[-1] != '"':
+        raise ValueError(f"not a string: {term}")
+    text = term[1:-1]
+    if "\\" not in text:
+        return text
+    return text.replace("\\\\", "\0").replace('\\"', '"').replace("\\n", "\n").replace("\0", "\\")
+
+
+def decode_nonexec_act(args: List[str]) -> NonexecFeedback:
+    # nonexec_feedback("msg", act(Subj, Action, T)) or act(Subj, Action, I, T)
+    name, act = split_arguments(args[1])
+    if name != "act" or len(act) not in (3, 4):
+        raise ValueError(f"not an act/3 or act/4 term: {args[1]}")
+    record: NonexecFeedback = {
+        "message": string_value(args[0]),
+        "subject": act[0],
+        "action": act[1],
+        "time": int(act[-1]),
+    }
+    if len(act) == 4:
+        record["intention"] = act[2]
+    return record
+
+
+def decode_nonexec_action(args: List[str]) -> NonexecFeedback:
+    # nonexec_feedback("msg", move(Subj, Dest), T): the subject is the action's first argument
+    name, params = split_arguments(args[1])
+    if not params:
+        raise ValueError(f"action without a subject: {args[1]}")
+    return {
+        "message": string_value(args[0]),
+        "subject": params[0],
+        "action": f"{name}({','.join(params[1:])})" if len(params) > 1 else name,
+        "time": int(args[2]),
+    }
+
+
+def decode_unjustified(args: List[str]) -> Unjustified:
+    return {"subject": args[0], "fluent": args[1], "intention": args[2], "time": int(args[3])}
+
+
+def decode_open_frame(args: List[str]) -> OpenCommitmentFrame:
+    return {"subject": args[0], "intention": args[1]}
+
+
+def decode_conflict(args: List[str]) -> Conflict:
+    thr, thr_int, targ, targ_int, act = args
+    return {
+        "threatener": thr,
+        "threatener_intention": thr_int,
+        "threatened_actor": targ,
+        "threatened_intention": targ_int,
+        "action": act,
+        "summary": f"{thr} (intends {thr_int}) threatens {targ}'s intention {targ_int} via {act}",
+    }
+
+
+# predicate -> (result list, {arity: decoder}); atoms without a decoder for their arity (or
+# whose decoder fails) are kept as strings, and predicates mapped to None are not split at all
+DECODERS: Dict[str, Tuple[str, Optional[Dict[int, Callable]]]] = {
+    "nonexec_feedback": ("nonexec_feedback", {2: decode_nonexec_act, 3: decode_nonexec_action}),
+    "unjustified": ("unjustified", {4: decode_unjustified}),
+    "open_commitment_frame": ("open_commitment_frames", {2: decode_open_frame}),
+    "conflict": ("conflicts", {5: decode_conflict}),
+    "act": ("acts", None),
+}
+
+
+def decode_witness(atoms: Iterable[str]) -> Dict[str, List]:
+    """
+    Sort a witness's atoms into `nonexec_feedback`, `unjustified`, `open_commitment_frames`,
+    `conflicts` (records) and `acts` (strings).
+    """
+    decoded: Dict[str, List] = {key: [] for key, _ in DECODERS.values()}
+    for atom in atoms:
+        paren = atom.find("(")
+        entry = DECODERS.get(atom[:paren] if paren > 0 else atom)
+        if entry is None:
+            continue
+        key, by_arity = entry
+        if by_arity is None:
+            decoded[key].append(atom)
+            continue
+        try:
+            _, args = split_arguments(atom)
+            decoder = by_arity.get(len(args))
+            decoded[key].append(decoder(args) if decoder else atom)
+        except (ValueError, IndexError):
+            decoded[key].append(atom)
+    return decoded
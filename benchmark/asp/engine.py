@@ -0,0 +1,592 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import clingo  # type: ignore
+    from clingo import ast as clingo_ast  # type: ignore
+except Exception:  # pragma: no cover
+    clingo = None
+    clingo_ast = None
+
+from benchmark.asp import solver_limits
+from benchmark.asp.ground_cache import GroundCache
+
+
+# `:- not act(...).` is the only statement (besides #const/comments) that lets a plan be
+# expressed as solver assumptions over an already grounded program.
+REQUIRED_ATOM_PATTERN = re.compile(r"^:-\s*not\s+([a-z_][A-Za-z0-9_]*\(.*\))\s*\.$")
+CONST_PATTERN = re.compile(r"^#const\s+\w+\s*=\s*[^.]+\.$")
+# how often a bounded solve checks its deadline (and lets KeyboardInterrupt through)
+SOLVE_POLL_SECONDS = 0.05
+# predicates whose facts span the horizon (`astep(0..maxstep-1). step(0..maxstep).`)
+STEP_PREDICATES = ("astep", "step")
+HORIZON_PART = """
+#program check(k).
+#external query(k).
+:- act(S, A, T), T >= k, query(k).
+:- act(S, A, I, T), T >= k, query(k).
+"""
+
+
+def plan_assumptions(constraints_text: str) -> Optional[List[str]]:
+    """
+    Return the atoms a plan requires to be true, or None if the plan text contains
+    anything else (facts, other constraints) and therefore has to be grounded with the program.
+    """
+    atoms: List[str] = []
+    for line in constraints_text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("%") or CONST_PATTERN.match(line):
+            continue
+        m = REQUIRED_ATOM_PATTERN.match(line)
+        if not m:
+            return None
+        try:
+            clingo.parse_term(m.group(1))
+        except RuntimeError:
+            # not a ground atom (e.g. Western's `:- not conflict(_,_,_,_,_).`)
+            return None
+        atoms.append(m.group(1))
+    return atoms
+
+
+def strip_consts(constraints_text: str) -> str:
+    """The plan without its `#const` lines (the horizon is chosen per solve instead)."""
+    return "\n".join(l for l in constraints_text.splitlines() if not CONST_PATTERN.match(l.strip()))
+
+
+def make_control(maxstep: int, messages: List[str], first_model_only: bool = False) -> "clingo.Control":
+    """
+    Control enumerating all models (like `clingo 0`), or stopping at the first one (`clingo 1`),
+    collecting log messages instead of printing them.
+    """
+    return clingo.Control(
+        ["-c", f"maxstep={maxstep}", f"--models={1 if first_model_only else 0}"],
+        logger=lambda code, msg: messages.append(msg.rstrip()),
+        message_limit=100,
+    )
+
+
+def control_stats(ctl: "clingo.Control") -> Dict:
+    """Solver statistics of the last solve call, in the same shape as `ASPValidator.output_stats`."""
+    stats = ctl.statistics
+    summary = stats["summary"]
+    lp = stats["problem"]["lp"]
+    solvers = stats["solving"]["solvers"]
+    return {
+        "solve_time": summary["times"]["solve"],
+        "cpu_time": summary["times"]["cpu"],
+        "atoms": int(lp["atoms"]),
+        "rules": int(lp["rules"]),
+        "choices": int(solvers["choices"]),
+        "conflicts": int(solvers["conflicts"]),
+        "models": int(summary["models"]["enumerated"]),
+        "exhausted": bool(summary["exhausted"]),
+    }
+
+
+def bounded_solve(
+    ctl: "clingo.Control", on_model: Callable, assumptions: Sequence = (), timeout: Optional[float] = None
+) -> bool:
+    """
+    Solve asynchronously, cancelling the search after `timeout` seconds (or when
+    `kill_running_solvers` interrupts it); returns True if the search was cut off.
+    """
+    deadline = time.perf_counter() + timeout if timeout else None
+    solver_limits.register(ctl)
+    try:
+        with ctl.solve(assumptions=list(assumptions), on_model=on_model, async_=True) as handle:
+            while not handle.wait(SOLVE_POLL_SECONDS):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    handle.cancel()
+                    return True
+            return handle.get().interrupted
+    finally:
+        solver_limits.unregister(ctl)
+
+
+def clingo_output(files: List[str], models: List[List[str]], stats: Optional[Dict] = None) -> Dict:
+    """Mirror the shape of `clingo --outf=2` so consumers can treat both engines alike."""
+    stats = stats or {}
+    data = {
+        "Solver": f"clingo version {clingo.__version__}",
+        "Input": list(files),
+        "Call": [{"Witnesses": [{"Value": m} for m in models]}],
+        # a cut-off search without a model decided nothing, like clingo's UNKNOWN
+        "Result": "SATISFIABLE" if models else ("UNKNOWN" if stats.get("timed_out") else "UNSATISFIABLE"),
+        "Models": {"Number": len(models), "More": "no" if stats.get("exhausted", True) else "yes"},
+    }
+    if stats:
+        data["Time"] = {
+            "Total": stats.get("total_time"),
+            "Solve": stats.get("solve_time"),
+            "CPU": stats.get("cpu_time"),
+        }
+    return data
+
+
+class GroundedBase:
+    """
+    Domain + instance program grounded once for a fixed maxstep.
+
+    Plans are checked by solving under assumptions, so the ground program is shared by
+    every plan validated against the same instance. Solving is serialized per base since
+    a clingo Control must not be used from several threads at once. With a `GroundCache`,
+    the ground program is loaded from disk (and written there first on a miss) instead of
+    being grounded in this process.
+    """
+
+    def __init__(
+        self,
+        files: List[str],
+        maxstep: int,
+        first_model_only: bool = False,
+        disk_cache: Optional[GroundCache] = None,
+    ):
+        self.files = list(files)
+        self.maxstep = maxstep
+        self.first_model_only = first_model_only
+        self.lock = threading.Lock()
+        self.messages: List[str] = []
+        # "hit" / "stored" when the program came from the disk cache, "error" if that failed
+        self.disk_cache: Optional[str] = None
+        started = time.perf_counter()
+        if disk_cache is None or not self.load_cached(disk_cache):
+            self.ground_sources()
+        self.ground_time = time.perf_counter() - started
+
+    def ground_sources(self) -> None:
+        self.ctl = make_control(self.maxstep, self.messages, self.first_model_only)
+        for f in self.files:
+            self.ctl.load(f)
+        self.ctl.ground([("base", [])])
+        self.from_disk = False
+
+    def load_cached(self, disk_cache: GroundCache) -> bool:
+        path = disk_cache.path(self.files, self.maxstep)
+        status = "hit"
+        try:
+            if not path.exists():
+                disk_cache.store(self.files, self.maxstep, path)
+                status = "stored"
+            ctl = make_control(self.maxstep, self.messages, self.first_model_only)
+            ctl.load(str(path))
+            ctl.ground([("base", [])])
+        except (OSError, RuntimeError) as e:
+            # unwritable cache or unreadable entry: ground the sources as without a cache, and
+            # drop a damaged entry so that the next process writes it again
+            self.messages.append(f"ground cache: {str(e).strip()}")
+            self.disk_cache = "error"
+            if status == "hit":
+                path.unlink(missing_ok=True)
+            return False
+        self.ctl = ctl
+        self.from_disk = True
+        self.disk_cache = status
+        return True
+
+    def solve(self, atoms: List[str], timeout: Optional[float] = None) -> Tuple[Dict, Dict]:
+        """Solve under the plan's assumptions; returns (clingo-style output, solver stats)."""
+        symbols = [clingo.parse_term(a) for a in atoms]
+        models: List[List[str]] = []
+        # grounding happened once for every plan on this base; only the solve is paid per plan
+        stats: Dict = {"ground_time": self.ground_time, "ground_cached": True}
+        if self.disk_cache:
+            stats["disk_cache"] = self.disk_cache
+        with self.lock:
+            missing = any(self.ctl.symbolic_atoms[s] is None for s in symbols)
+            if missing and self.from_disk:
+                # a loaded program only knows its shown atoms; the plan needs the full one
+                started = time.perf_counter()
+                self.ground_sources()
+                self.ground_time += time.perf_counter() - started
+                stats["ground_time"] = self.ground_time
+                missing = any(self.ctl.symbolic_atoms[s] is None for s in symbols)
+            # An atom that was never grounded can't be made true: `:- not atom.` always fires.
+            if missing:
+                stats.update(total_time=0.0, solve_time=0.0, models=0, exhausted=True)
+                return clingo_output(self.files, models, stats), stats
+            started = time.perf_counter()
+            timed_out = bounded_solve(
+                self.ctl,
+                lambda m: models.append([str(s) for s in m.symbols(shown=True)]),
+                assumptions=[(s, True) for s in symbols],
+                timeout=timeout,
+            )
+            stats["total_time"] = time.perf_counter() - started
+            stats.update(control_stats(self.ctl), timed_out=timed_out)
+        return clingo_output(self.files, models, stats), stats
+
+
+class HorizonTransformer(clingo_ast.Transformer if clingo_ast else object):
+    """Replaces the `maxstep` constant by the `check(k)` parameter, noting whether it occurred."""
+
+    def __init__(self):
+        self.found = False
+
+    def visit_Function(self, node):
+        if node.name == "maxstep" and not node.arguments:
+            self.found = True
+            return clingo_ast.Function(node.location, "k", [], 0)
+        return node.update(**self.visit_children(node))
+
+    def visit_SymbolicTerm(self, node):
+        if node.symbol.type == clingo.SymbolType.Function and node.symbol.match("maxstep", 0):
+            self.found = True
+            return clingo_ast.SymbolicTerm(node.location, clingo.Function("k"))
+        return node
+
+
+def defines_steps(stmt) -> bool:
+    head = getattr(stmt, "head", None)
+    atom = getattr(head, "atom", None)
+    symbol = getattr(atom, "symbol", None)
+    return (
+        stmt.ast_type == clingo_ast.ASTType.Rule
+        and not stmt.body
+        and getattr(symbol, "name", None) in STEP_PREDICATES
+    )
+
+
+def split_horizon(statements: List) -> Tuple[List, List]:
+    """
+    Split a program into its horizon-independent part and the statements that refer to
+    `maxstep` (the goal), rewritten for `#program check(k)`: `maxstep` becomes `k` and rule
+    bodies get `query(k)`, so they only apply while horizon k is queried. The step range
+    facts stay in the base, where `maxstep` is the capacity of the grounding.
+    """
+    base, horizon = [], []
+    for stmt in statements:
+        if stmt.ast_type == clingo_ast.ASTType.Program:
+            continue
+        transformer = HorizonTransformer()
+        rewritten = transformer(stmt)
+        if not transformer.found or defines_steps(stmt):
+            base.append(stmt)
+            continue
+        if rewritten.ast_type == clingo_ast.ASTType.Rule:
+            loc = rewritten.location
+            k = clingo_ast.Function(loc, "k", [], 0)
+            query = clingo_ast.Literal(
+                loc, clingo_ast.Sign.NoSign, clingo_ast.SymbolicAtom(clingo_ast.Function(loc, "query", [k], 0))
+            )
+            rewritten = rewritten.update(body=list(rewritten.body) + [query])
+        horizon.append(rewritten)
+    return base, horizon
+
+
+def guarded_plan(index: int, constraints_text: str) -> str:
+    """
+    A plan's statements with `batch_plan(index)` added to every rule body, so several plans
+    can be grounded into one program and each is switched on by its `#external`.
+    """
+    lines = [f"#external batch_plan({index})."]
+
+    def add(stmt) -> None:
+        if stmt.ast_type in (clingo_ast.ASTType.Program, clingo_ast.ASTType.Definition):
+            return
+        if stmt.ast_type == clingo_ast.ASTType.Rule:
+            loc = stmt.location
+            guard = clingo_ast.Function(loc, "batch_plan", [clingo_ast.SymbolicTerm(loc, clingo.Number(index))], 0)
+            literal = clingo_ast.Literal(loc, clingo_ast.Sign.NoSign, clingo_ast.SymbolicAtom(guard))
+            stmt = stmt.update(body=list(stmt.body) + [literal])
+        lines.append(str(stmt))
+
+    clingo_ast.parse_string(constraints_text, add)
+    return "\n".join(lines) + "\n"
+
+
+def within_horizon(symbol: "clingo.Symbol", horizon: int) -> bool:
+    """False for shown atoms about steps past the horizon (their last argument is the step)."""
+    args = symbol.arguments if symbol.type == clingo.SymbolType.Function else []
+    return not (args and args[-1].type == clingo.SymbolType.Number and args[-1].number > horizon)
+
+
+class IncrementalBase:
+    """
+    Domain + instance program grounded once for checks at any horizon up to its capacity.
+
+    The encodings fix the step range and the goal at `maxstep`, so the time steps cannot be
+    grounded one `#program step(t)` part at a time. Instead the horizon-independent rules
+    are grounded for `capacity` steps and each horizon k gets a small `#program check(k)`
+    part with the goal at step k, guarded by `#external query(k)`, plus constraints
+    forbidding actions from step k on. Checking at horizon k solves with `query(k)` assigned
+    true and the other queries false, so one grounding answers every horizon and a larger one
+    only regrounds the base (at twice the capacity). `extra` (plan facts, choice rules) is
+    grounded with the base.
+    """
+
+    def __init__(self, files: List[str], capacity: int, extra: str = "", first_model_only: bool = False):
+        self.files = list(files)
+        self.extra = strip_consts(extra)
+        self.first_model_only = first_model_only
+        self.lock = threading.Lock()
+        self.messages: List[str] = []
+        self.ctl: Optional["clingo.Control"] = None
+        self.capacity = 0
+        self.horizons: set = set()
+        # grounding done since the last solve, reported by the next one
+        self.ground_time = 0.0
+        self.regrounded = False
+        self.ground(capacity)
+
+    def ground(self, capacity: int) -> None:
+        started = time.perf_counter()
+        ctl = make_control(capacity, self.messages, self.first_model_only)
+        statements: List = []
+        clingo_ast.parse_files(self.files, statements.append)
+        clingo_ast.parse_string(self.extra, statements.append)
+        base, horizon = split_horizon(statements)
+        with clingo_ast.ProgramBuilder(ctl) as builder:
+            for stmt in base:
+                builder.add(stmt)
+            clingo_ast.parse_string(HORIZON_PART, builder.add)
+            for stmt in horizon:
+                builder.add(stmt)
+        ctl.ground([("base", [])])
+        self.ctl, self.capacity, self.horizons = ctl, capacity, set()
+        self.ground_time += time.perf_counter() - started
+        self.regrounded = True
+
+    def prepare(self, horizon: int) -> None:
+        """Ground what a check at `horizon` needs: a larger base if necessary, then `check(horizon)`."""
+        if horizon > self.capacity:
+            self.ground(max(horizon, 2 * self.capacity, 1))
+        if horizon not in self.horizons:
+            started = time.perf_counter()
+            self.ctl.ground([("check", [clingo.Number(horizon)])])
+            self.horizons.add(horizon)
+            self.ground_time += time.perf_counter() - started
+
+    def solve(
+        self, atoms: List[str], horizon: int, timeout: Optional[float] = None, externals: Sequence[str] = ()
+    ) -> Tuple[Dict, Dict]:
+        """
+        Solve at `horizon` under the plan's assumptions, with the `externals` (e.g. the
+        plan's `batch_plan(i)`) set true; returns (clingo-style output, solver stats).
+        """
+        symbols = [clingo.parse_term(a) for a in atoms]
+        models: List[List[str]] = []
+        with self.lock:
+            self.prepare(horizon)
+            stats: Dict = {
+                "ground_time": self.ground_time,
+                "ground_cached": not self.regrounded,
+                "horizon": horizon,
+                "capacity": self.capacity,
+            }
+            self.ground_time, self.regrounded = 0.0, False
+            if any(self.ctl.symbolic_atoms[s] is None for s in symbols):
+                stats.update(total_time=0.0, solve_time=0.0, models=0, exhausted=True)
+                return clingo_output(self.files, models, stats), stats
+            started = time.perf_counter()
+            # externals are false unless assigned, and an assumption cannot override that
+            switched = [clingo.Function("query", [clingo.Number(horizon)])]
+            switched += [clingo.parse_term(e) for e in externals]
+            for external in switched:
+                self.ctl.assign_external(external, True)
+            try:
+                timed_out = bounded_solve(
+                    self.ctl,
+                    lambda m: models.append([str(s) for s in m.symbols(shown=True) if within_horizon(s, horizon)]),
+                    assumptions=[(s, True) for s in symbols],
+                    timeout=timeout,
+                )
+                # read before the externals are released, which resets the solve statistics
+                stats.update(control_stats(self.ctl), timed_out=timed_out)
+            finally:
+                for external in switched:
+                    self.ctl.assign_external(external, False)
+            stats["total_time"] = time.perf_counter() - started
+        return clingo_output(self.files, models, stats), stats
+
+
+class ClingoEngine:
+    """
+    In-process clingo validation with a bounded cache of grounded bases.
+
+    Bases are keyed by the input files (and their mtimes) plus maxstep, i.e. one per
+    (domain, asp_version, instance, maxstep). Plans that cannot be expressed as assumptions
+    (act/4 facts in Aladdin/Western drive grounding) are solved on a fresh Control, which
+    still avoids the clingo process spawn.
+    """
+
+    def __init__(self, max_bases: int = 64):
+        self.max_bases = max_bases
+        self.bases: "OrderedDict[Tuple, object]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def base_key(self, files: List[str], maxstep: Optional[int], first_model_only: bool = False) -> Tuple:
+        return (tuple((f, os.stat(f).st_mtime_ns) for f in files), maxstep, first_model_only)
+
+    def grounded_base(
+        self, files: List[str], maxstep: int, first_model_only: bool = False, ground_cache_dir: Optional[str] = None
+    ) -> GroundedBase:
+        disk_cache = GroundCache(ground_cache_dir) if ground_cache_dir else None
+        return self.cached_base(
+            files, maxstep, first_model_only, lambda: GroundedBase(files, maxstep, first_model_only, disk_cache)
+        )
+
+    def incremental_base(self, files: List[str], capacity: int, first_model_only: bool = False) -> IncrementalBase:
+        return self.cached_base(
+            files, None, first_model_only, lambda: IncrementalBase(files, capacity, "", first_model_only)
+        )
+
+    def cached_base(self, files: List[str], maxstep: Optional[int], first_model_only: bool, build: Callable):
+        key = self.base_key(files, maxstep, first_model_only)
+        with self.lock:
+            base = self.bases.get(key)
+            if base is not None:
+                self.bases.move_to_end(key)
+                return base
+        # Ground outside the cache lock so other instances are not blocked meanwhile.
+        base = build()
+        with self.lock:
+            base = self.bases.setdefault(key, base)
+            self.bases.move_to_end(key)
+            while len(self.bases) > self.max_bases:
+                self.bases.popitem(last=False)
+        return base
+
+    def solve_fresh(
+        self,
+        files: List[str],
+        maxstep: int,
+        constraints_text: str,
+        messages: List[str],
+        first_model_only: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Dict, Dict]:
+        started = time.perf_counter()
+        ctl = make_control(maxstep, messages, first_model_only)
+        for f in files:
+            ctl.load(f)
+        ctl.add("base", [], constraints_text)
+        ctl.ground([("base", [])])
+        grounded = time.perf_counter()
+        models: List[List[str]] = []
+        # grounding is not interruptible; the time limit covers the search
+        timed_out = bounded_solve(
+            ctl, lambda m: models.append([str(s) for s in m.symbols(shown=True)]), timeout=timeout
+        )
+        stats: Dict = {
+            "ground_time": grounded - started,
+            "ground_cached": False,
+            "total_time": time.perf_counter() - started,
+            "timed_out": timed_out,
+        }
+        stats.update(control_stats(ctl))
+        return clingo_output(files, models, stats), stats
+
+    def solve(
+        self,
+        files: List[str],
+        maxstep: int,
+        constraints_text: str,
+        first_model_only: bool = False,
+        timeout: Optional[float] = None,
+        incremental: bool = False,
+        ground_cache_dir: Optional[str] = None,
+    ) -> Tuple[Dict, Dict]:
+        """
+        Solve a plan and return (clingo-style output, {"strategy", "messages", "stats"}).
+        A search still running after `timeout` seconds is cancelled (`stats["timed_out"]`).
+        With `incremental`, assumption plans share one `IncrementalBase` per instance
+        whatever their maxstep. With `ground_cache_dir`, the fixed-maxstep base of an
+        assumption plan is loaded from (or stored to) that `GroundCache`.
+        """
+        atoms = plan_assumptions(constraints_text)
+        if atoms is not None and incremental:
+            base = self.incremental_base(files, maxstep, first_model_only)
+            data, stats = base.solve(atoms, maxstep, timeout=timeout)
+            return data, {"strategy": "incremental", "messages": list(base.messages), "stats": stats}
+        if atoms is not None:
+            base = self.grounded_base(files, maxstep, first_model_only, ground_cache_dir)
+            data, stats = base.solve(atoms, timeout=timeout)
+            return data, {"strategy": "assumptions", "messages": list(base.messages), "stats": stats}
+        messages: List[str] = []
+        data, stats = self.solve_fresh(files, maxstep, constraints_text, messages, first_model_only, timeout)
+        return data, {"strategy": "fresh", "messages": messages, "stats": stats}
+
+    def solve_horizons(
+        self,
+        files: List[str],
+        horizons: Sequence[int],
+        constraints_text: str = "",
+        first_model_only: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[int, Dict, Dict]]:
+        """
+        Check one plan (or, with an empty plan, the encoding itself) at each of `horizons`
+        on a single `IncrementalBase`, yielding (horizon, clingo-style output, meta) as each
+        solve finishes, so a caller can stop early. The base is grounded for the first
+        horizon and regrounded at twice the capacity whenever a horizon outgrows it; plans
+        that are not assumptions are grounded into a base of their own.
+        """
+        horizons = list(horizons)
+        if not horizons:
+            return
+        atoms = plan_assumptions(constraints_text)
+        if atoms is not None:
+            base = self.incremental_base(files, horizons[0], first_model_only)
+        else:
+            base = IncrementalBase(files, horizons[0], constraints_text, first_model_only)
+            atoms = []
+        for horizon in horizons:
+            data, stats = base.solve(atoms, horizon, timeout=timeout)
+            yield horizon, data, {"strategy": "incremental", "messages": list(base.messages), "stats": stats}
+
+    def solve_many(
+        self,
+        files: List[str],
+        plans: Sequence[Tuple[int, str]],
+        first_model_only: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[Dict, Dict]]:
+        """
+        Check several `(maxstep, constraints_text)` plans for one instance, returning
+        `(clingo-style output, meta)` per plan in order. Everything is grounded once and the
+        plans are solved one after another on the same Control: assumption plans on the
+        instance's shared `IncrementalBase`, the others guarded by `batch_plan(i)` (see
+        `guarded_plan`) in one base of their own. Each plan is checked at its own maxstep.
+        """
+        if not plans:
+            return []
+        results: List[Optional[Tuple[Dict, Dict]]] = [None] * len(plans)
+        capacity = max(maxstep for maxstep, _ in plans)
+        assumptions = [plan_assumptions(text) for _, text in plans]
+        if any(atoms is not None for atoms in assumptions):
+            base = self.incremental_base(files, capacity, first_model_only)
+            for i, ((maxstep, _), atoms) in enumerate(zip(plans, assumptions)):
+                if atoms is not None:
+                    data, stats = base.solve(atoms, maxstep, timeout=timeout)
+                    results[i] = data, {"strategy": "batch", "messages": list(base.messages), "stats": stats}
+        guarded = [i for i, atoms in enumerate(assumptions) if atoms is None]
+        if guarded:
+            program = "".join(guarded_plan(i, plans[i][1]) for i in guarded)
+            base = IncrementalBase(files, capacity, program, first_model_only)
+            for i in guarded:
+                data, stats = base.solve([], plans[i][0], timeout=timeout, externals=[f"batch_plan({i})"])
+                results[i] = data, {"strategy": "batch", "messages": list(base.messages), "stats": stats}
+        return results
+
+    def clear(self) -> None:
+        with self.lock:
+            self.bases.clear()
+
+
+_engine: Optional[ClingoEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ClingoEngine:
+    """Process-wide engine so bases survive across ExperimentRunner instances."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ClingoEngine()
+        return _engine
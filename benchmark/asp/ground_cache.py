@@ -0,0 +1,83 @@
+"""
+On-disk cache of ground programs.
+
+A `GroundedBase` (domain + instance program at one maxstep) is stored as the aspif text that
+`clingo --pre=aspif` prints: the program after grounding and clasp's preprocessing, with the
+shown atoms as output statements. Loading that file into a Control skips grounding entirely,
+so a fresh process (or a fresh worker node sharing the directory) starts solving right away.
+
+Entries are named by a hash of the clingo version, maxstep and the *content* of every input
+file in load order, so they survive checkouts and copies, can be shared between machines, and
+never go stale: an edited encoding or instance simply hashes to a new entry. Entries are
+written to a temporary file and renamed into place, so concurrent writers are harmless. The
+directory can be pruned or deleted at any time.
+
+Only shown atoms are addressable in a loaded program, which is enough for plans that require
+shown `act` atoms; `GroundedBase` regrounds from the source files if a plan needs another one.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import List
+
+try:
+    import clingo  # type: ignore
+except Exception:  # pragma: no cover
+    clingo = None
+
+from benchmark.asp import solver_limits
+
+GROUND_CACHE_FORMAT = "aspif-1"
+# writing an entry runs clingo in a subprocess; give up (and ground in-process) after this long
+STORE_TIMEOUT_SECONDS = 1800
+
+
+def ground_cache_key(files: List[str], maxstep: int) -> str:
+    digest = hashlib.sha256(f"{GROUND_CACHE_FORMAT}|{clingo.__version__}|{maxstep}".encode("utf-8"))
+    for path in files:
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+class GroundCache:
+    """Directory of `<key>.aspif` ground programs; see the module docstring."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, files: List[str], maxstep: int) -> Path:
+        key = ground_cache_key(files, maxstep)
+        return self.root / key[:2] / f"{key}.aspif"
+
+    def store(self, files: List[str], maxstep: int, path: Path) -> None:
+        """Ground `files` into `path` with the clingo module's own executable; RuntimeError if that fails."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        cmd = [sys.executable, "-m", "clingo", "--pre=aspif", "-c", f"maxstep={maxstep}", *files]
+        try:
+            with open(tmp, "wb") as out:
+                # own session and registered like a validation run, so cancelling a sweep kills it
+                proc = subprocess.Popen(cmd, stdout=out, stderr=subprocess.PIPE, start_new_session=True)
+                solver_limits.register(proc)
+                try:
+                    _, stderr = proc.communicate(timeout=STORE_TIMEOUT_SECONDS)
+                except BaseException:
+                    solver_limits.kill_process_group(proc)
+                    proc.wait()
+                    raise
+                finally:
+                    solver_limits.unregister(proc)
+            if proc.returncode != 0:
+                raise RuntimeError(stderr.decode("utf-8", "replace").strip() or f"clingo exited {proc.returncode}")
+            os.replace(tmp, path)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"could not write ground program {path}: {e}") from e
+        finally:
+            if tmp.exists():
+                tmp.unlink()
@@ -0,0 +1,387 @@
+"""
+Reference plans: the shortest plan the domain encoding admits for an instance.
+
+The encoding is solved with its own constraints, without any LLM plan, at horizons
+`maxstep = 1, 2, ...` until the first satisfiable one. Each horizon is a separate clingo
+subprocess under the validator's time/memory limits, since the encodings fix the goal at
+`maxstep` and grounding can blow up (Aladdin) where only a subprocess can be stopped.
+`--incremental` scans in-process on one incremental grounding instead (see
+`benchmark.asp.engine.IncrementalBase`), where the time limit only bounds the search; with
+`--memory-mb` the scan stays on subprocesses. The first model at that horizon is the reference
+plan, and its horizon is the optimal plan length (`plan_length`), since an LLM plan takes one
+step per action. Encodings whose action choice rule is commented out (Aladdin/Western `base`,
+which only check given plans) get the choice rule of their `original` encoding, Western plans
+must produce a conflict as in validation, and no plan may derive the feedback atoms
+(`nonexec_feedback`, `unjustified`, `open_commitment_frame`) that make validation reject it.
+
+Results are cached per `asp_version` in the instance catalog (`entry["reference"]`) with a
+hash of the program, so a changed encoding or instance invalidates them. `python -m
+benchmark.asp.reference_plans` precomputes them on a process pool; `get_reference` looks
+one up for the runner, which uses it for optimality gaps and `asp.tight_maxstep`.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmark.asp import solver_limits
+from benchmark.asp.validator import ASPValidator
+from benchmark.instance_catalog import load_catalog, select_instances, update_catalog
+from benchmark.io.file_cache import fingerprint
+
+REFERENCE_VERSION = 3
+DEFAULT_MAX_HORIZON = 40
+DEFAULT_HORIZON_TIMEOUT = 30.0
+
+ACTION_CHOICE_PATTERN = re.compile(r"^\s*\{\s*act\(", re.M)
+# action choice rules of the `original` encodings, for encodings that only check given plans
+ACTION_CHOICE_RULES = {
+    "aladdin": (
+        "{act(Subj, Act, T) : unintentional_action(Act)} 1 :- character(Subj), astep(T).\n"
+        "{act(Subj, Act, I, T) : intentional_action(Act), intention(I)} 1 :- "
+        "character(Subj), intends(Subj, I, t, T), astep(T).\n"
+    ),
+    "western": (
+        "{act(Subj, Act, T) : unintentional_action(Act)} 1 :- character(Subj), astep(T).\n"
+        "{act(Subj, Act, I, T) : intentional_action(Act), intention(I)} 1 :- "
+        "character(Subj), intends(Subj, I, t, T), astep(T).\n"
+    ),
+}
+STEP_PATTERN = re.compile(r",\s*(\d+)\)$")
+SHOW_ACTIONS = "#show act/3.\n#show act/4.\n"
+# goals that validation adds with the plan instead of reading them from goal.lp
+PLAN_GOALS = {"western": ":- not conflict(_,_,_,_,_).\n"}
+# a plan with feedback atoms fails validation, so the search must not return one
+FEEDBACK_CONSTRAINTS = (
+    ":- nonexec_feedback(_,_).\n"
+    ":- nonexec_feedback(_,_,_).\n"
+    ":- unjustified(_,_,_,_).\n"
+    ":- open_commitment_frame(_,_).\n"
+)
+
+
+def reference_program(domain: str, files: List[str]) -> str:
+    """Rules added to the encoding so that it searches for plans instead of checking one."""
+    extra = ""
+    if not any(ACTION_CHOICE_PATTERN.search(Path(f).read_text()) for f in files):
+        extra += ACTION_CHOICE_RULES.get(domain, "")
+    return extra + PLAN_GOALS.get(domain, "") + FEEDBACK_CONSTRAINTS
+
+
+def program_sha256(files: List[str], extra: str) -> str:
+    digest = hashlib.sha256(f"v{REFERENCE_VERSION}\n".encode("utf-8"))
+    for f in files:
+        digest.update(Path(f).read_bytes())
+    digest.update(extra.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def reference_validator(
+    domains_root: Path,
+    domain: str,
+    asp_version: str,
+    instance_dir: Path,
+    clingo_path: str = "clingo",
+    horizon_timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    incremental: bool = False,
+) -> ASPValidator:
+    return ASPValidator(
+        domain,
+        Path(domains_root) / domain / asp_version,
+        Path(instance_dir),
+        clingo_path=clingo_path,
+        use_clingo_api=incremental,
+        first_model_only=True,
+        timeout_seconds=horizon_timeout,
+        memory_limit_mb=memory_limit_mb,
+        incremental=incremental,
+        search_only_timeout=incremental,
+    )
+
+
+def solve_horizon(validator: ASPValidator, program_path: str, horizon: int) -> Tuple[str, List[str]]:
+    """`(result, plan)` at one horizon; result is SATISFIABLE, UNSATISFIABLE or UNKNOWN."""
+    cmd = [validator.clingo_path, *validator.clingo_input_files(), program_path]
+    cmd += ["-c", f"maxstep={horizon}", "--outf=2", "1"]
+    time_limit = solver_limits.clingo_time_limit(validator.timeout_seconds)
+    if time_limit:
+        cmd.append(f"--time-limit={time_limit}")
+    stdout, stderr, returncode, killed = validator.run_clingo(cmd, time_limit)
+    try:
+        data = json.loads(stdout)
+    except ValueError:
+        if killed or solver_limits.memory_exceeded(returncode, stderr):
+            return "UNKNOWN", []
+        raise RuntimeError(f"clingo failed (exit {returncode}): {stderr.strip()[-500:]}") from None
+    result = data.get("Result", "UNKNOWN")
+    if killed and result != "SATISFIABLE":
+        result = "UNKNOWN"
+    if result != "SATISFIABLE":
+        return result, []
+    witnesses = data["Call"][-1]["Witnesses"]
+    acts = [a for a in witnesses[0]["Value"] if a.startswith("act(")]
+    return result, ordered_plan(acts)
+
+
+def ordered_plan(acts: List[str]) -> List[str]:
+    return sorted(acts, key=lambda a: int(STEP_PATTERN.search(a).group(1)))
+
+
+def scan_incremental(validator: ASPValidator, program: str, max_horizon: int):
+    """`(horizon, result, plan)` for horizons 1.. on one incremental grounding, up to the first decided plan."""
+    checks = validator.validate_plan_horizons(program, range(1, max_horizon + 1), stop_at_first=True)
+    for horizon, checked in checks:
+        if checked["satisfiable"]:
+            yield horizon, "SATISFIABLE", ordered_plan(checked["acts"])
+        elif checked.get("limit_exceeded"):
+            yield horizon, "UNKNOWN", []
+        else:
+            yield horizon, "UNSATISFIABLE", []
+
+
+def compute_reference(
+    domains_root: Path,
+    domain: str,
+    asp_version: str,
+    instance_dir: Path,
+    max_horizon: int = DEFAULT_MAX_HORIZON,
+    horizon_timeout: Optional[float] = DEFAULT_HORIZON_TIMEOUT,
+    clingo_path: str = "clingo",
+    memory_limit_mb: Optional[int] = None,
+    incremental: bool = False,
+) -> Dict:
+    """
+    Scan horizons upward until the first satisfiable one. The scan stops at an UNKNOWN
+    horizon (grounding plus search overran `horizon_timeout` seconds or the memory limit),
+    since a plan found above it would not be known to be the shortest.
+    """
+    started = time.perf_counter()
+    # without the clingo module the validator falls back to the subprocess scan
+    validator = reference_validator(
+        domains_root, domain, asp_version, instance_dir, clingo_path, horizon_timeout, memory_limit_mb, incremental
+    )
+    files = validator.clingo_input_files()
+    extra = reference_program(domain, files)
+    reference: Dict = {
+        "status": "no_plan",
+        "plan_length": None,
+        "horizon": None,
+        "plan": [],
+        "horizons": [],
+        "max_horizon": max_horizon,
+        "horizon_timeout": horizon_timeout,
+        "program_sha256": program_sha256(files, extra),
+    }
+    if validator.incremental:
+        scan = scan_incremental(validator, extra + SHOW_ACTIONS, max_horizon)
+        reference["incremental"] = True
+    else:
+        with tempfile.NamedTemporaryFile("w", suffix=".lp", delete=False) as tf:
+            tf.write(extra + SHOW_ACTIONS)
+        scan = ((h, *solve_horizon(validator, tf.name, h)) for h in range(1, max_horizon + 1))
+    try:
+        solve_started = time.perf_counter()
+        for horizon, result, plan in scan:
+            reference["horizons"].append(
+                {"horizon": horizon, "result": result, "time": time.perf_counter() - solve_started}
+            )
+            solve_started = time.perf_counter()
+            if result == "UNKNOWN":
+                reference["status"] = "unknown"
+                break
+            if result == "SATISFIABLE":
+                # an LLM plan takes one step per action, so its length compares with the horizon;
+                # the first model may leave steps empty and is not the fewest acts
+                reference.update(status="solved", plan_length=horizon, horizon=horizon, plan=plan)
+                break
+    finally:
+        if not validator.incremental:
+            Path(tf.name).unlink(missing_ok=True)
+    reference["time"] = time.perf_counter() - started
+    return reference
+
+
+def compute_entry(job: Tuple) -> Tuple[str, Dict]:
+    domains_root, domain, asp_version, path, options = job
+    return path, compute_reference(domains_root, domain, asp_version, Path(domains_root) / path, **options)
+
+
+# (domains_root, domain, asp_version, instance_dir) -> (file stamps, input files, program_sha256)
+_programs: Dict[Tuple[str, str, str, str], Tuple[List, List[str], str]] = {}
+_programs_lock = threading.Lock()
+
+
+def current_program_sha256(domains_root: Path, domain: str, asp_version: str, instance_dir: Path) -> str:
+    """`program_sha256` of an instance's reference program, rehashed only when an input file's (mtime, size) changed."""
+    key = (str(domains_root), domain, asp_version, str(instance_dir))
+    with _programs_lock:
+        cached = _programs.get(key)
+    if cached is not None and fingerprint([Path(f) for f in cached[1]]) == cached[0]:
+        return cached[2]
+    files = reference_validator(domains_root, domain, asp_version, instance_dir).clingo_input_files()
+    stamps = fingerprint([Path(f) for f in files])
+    digest = program_sha256(files, reference_program(domain, files))
+    with _programs_lock:
+        _programs[key] = (stamps, files, digest)
+    return digest
+
+
+def is_current(reference: Optional[Dict], domains_root: Path, domain: str, asp_version: str, instance_dir: Path) -> bool:
+    if not reference:
+        return False
+    return reference.get("program_sha256") == current_program_sha256(domains_root, domain, asp_version, instance_dir)
+
+
+def precompute_references(
+    domains_root: Path,
+    domain: str,
+    asp_version: str,
+    selector=None,
+    workers: int = 1,
+    max_horizon: int = DEFAULT_MAX_HORIZON,
+    horizon_timeout: Optional[float] = DEFAULT_HORIZON_TIMEOUT,
+    clingo_path: str = "clingo",
+    memory_limit_mb: Optional[int] = None,
+    force: bool = False,
+    incremental: bool = False,
+) -> Dict[str, Dict]:
+    """
+    Compute missing or stale reference plans for the selected instances on `workers`
+    processes. Each result is written to the catalog as soon as it is done, so an
+    interrupted precompute keeps what it finished.
+    """
+    domains_root = Path(domains_root)
+    options = {
+        "max_horizon": max_horizon,
+        "horizon_timeout": horizon_timeout,
+        "clingo_path": clingo_path,
+        "memory_limit_mb": memory_limit_mb,
+        "incremental": incremental,
+    }
+    entries = select_instances(load_catalog(domains_root, domain), selector)
+    jobs = [
+        (str(domains_root), domain, asp_version, e["path"], options)
+        for e in entries
+        if force
+        or not is_current(
+            (e.get("reference") or {}).get(asp_version), domains_root, domain, asp_version, domains_root / e["path"]
+        )
+    ]
+    print(f"{len(entries) - len(jobs)} of {len(entries)} reference plans are current; computing {len(jobs)}", file=sys.stderr)
+    references: Dict[str, Dict] = {}
+
+    def store(path: str, reference: Dict) -> None:
+        references[path] = reference
+        stored = next((e.get("reference") or {} for e in entries if e["path"] == path), {})
+        update_catalog(domains_root, domain, {path: {"reference": {**stored, asp_version: reference}}})
+        length = reference["plan_length"] if reference["status"] == "solved" else reference["status"]
+        print(f"[{len(references)}/{len(jobs)}] {path}: {length} ({reference['time']:.1f}s)", file=sys.stderr)
+
+    if workers <= 1:
+        for job in jobs:
+            store(*compute_entry(job))
+        return references
+
+    # imported here: the pipeline module imports the runner, which imports this module
+    from benchmark.runner.pipeline import cancel_validation, make_validation_pool
+
+    pool = make_validation_pool(workers)
+    try:
+        pending = {pool.submit(compute_entry, job) for job in jobs}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                store(*future.result())
+    except BaseException:
+        cancel_validation(pool)
+        raise
+    pool.shutdown()
+    return references
+
+
+_references: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+_references_lock = threading.Lock()
+
+
+def get_reference(domains_root: Path, domain: str, asp_version: str, instance_dir: Path) -> Optional[Dict]:
+    """
+    The solved reference of an instance if it was precomputed for the current program,
+    else None. The catalog is read once per process and domain, and the program is only
+    rehashed when one of its files changed (`current_program_sha256`).
+    """
+    key = (str(Path(domains_root).resolve()), domain)
+    with _references_lock:
+        by_path = _references.get(key)
+        if by_path is None:
+            by_path = {e["path"]: e.get("reference") or {} for e in load_catalog(Path(domains_root), domain)}
+            _references[key] = by_path
+    try:
+        path = Path(instance_dir).resolve().relative_to(Path(domains_root).resolve()).as_posix()
+    except ValueError:
+        return None
+    reference = by_path.get(path, {}).get(asp_version)
+    if not reference or reference.get("status") != "solved":
+        return None
+    if not is_current(reference, domains_root, domain, asp_version, instance_dir):
+        return None
+    return reference
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Precompute shortest reference plans into the instance catalog")
+    parser.add_argument("--domain", required=True, choices=["aladdin", "secret_agent", "western"])
+    parser.add_argument("--asp-version", default="base", help="Encoding to plan with (default: base)")
+    parser.add_argument("--domains-root", default="benchmark/domains", help="Domains root directory")
+    parser.add_argument("--select", nargs="+", help="Instance catalog selector (default: every instance)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes solving instances in parallel")
+    parser.add_argument("--max-horizon", type=int, default=DEFAULT_MAX_HORIZON, help="Largest maxstep to try")
+    parser.add_argument(
+        "--horizon-timeout",
+        type=float,
+        default=DEFAULT_HORIZON_TIMEOUT,
+        help="Search time limit per horizon in seconds; the scan stops at a horizon that hits it",
+    )
+    parser.add_argument("--clingo", default="clingo", help="clingo executable (default: clingo)")
+    parser.add_argument("--memory-mb", type=int, help="Address-space limit of each clingo call")
+    parser.add_argument("--force", action="store_true", help="Recompute references that are already current")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Scan horizons in-process on one incremental grounding (needs the clingo module; "
+        "--horizon-timeout then bounds only the search)",
+    )
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_arg_parser().parse_args(argv)
+    references = precompute_references(
+        Path(args.domains_root),
+        args.domain,
+        args.asp_version,
+        selector=args.select,
+        workers=args.workers,
+        max_horizon=args.max_horizon,
+        horizon_timeout=args.horizon_timeout,
+        clingo_path=args.clingo,
+        memory_limit_mb=args.memory_mb,
+        force=args.force,
+        incremental=args.incremental,
+    )
+    counts: Dict[str, int] = {}
+    for reference in references.values():
+        counts[reference["status"]] = counts.get(reference["status"], 0) + 1
+    print(" ".join(f"{status}={count}" for status, count in sorted(counts.items())) or "nothing to do")
+
+
+if __name__ == "__main__":
+    main()
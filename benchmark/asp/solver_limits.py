@@ -0,0 +1,163 @@
+"""
+Resource limits and cancellation for clingo validation.
+
+A clingo subprocess gets clingo's own `--time-limit`, an address-space cap (RLIMIT_AS) and a
+CPU-time cap slightly above the wall limit, and runs in its own session so the whole process
+group can be killed. In-process solves (clingo API) are bounded by waiting on an async solve
+handle and interrupting the control. Either way the solve is registered here while it runs,
+so `kill_running_solvers()` can stop everything this process has in flight: the sweep calls
+it on Ctrl-C/SIGTERM, and validation workers call it from their SIGTERM handler.
+"""
+
+import atexit
+import math
+import os
+import signal
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Optional, Set
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# extra wall time granted after clingo's own --time-limit before the child is killed
+KILL_GRACE_SECONDS = 2.0
+# clingo exit codes (bit flags): 1 = interrupted (time limit or signal), 33 = out of memory
+CLINGO_EXIT_INTERRUPTED = 1
+CLINGO_EXIT_MEMORY = 33
+MEMORY_ERROR_MARKERS = ("std::bad_alloc", "MemoryError", "Cannot allocate memory")
+
+_running: Set = set()
+_running_lock = threading.Lock()
+
+
+def clingo_time_limit(timeout_seconds: Optional[float]) -> Optional[int]:
+    """clingo's `--time-limit` takes whole seconds."""
+    if not timeout_seconds:
+        return None
+    return max(1, math.ceil(timeout_seconds))
+
+
+def limit_child(pid: int, memory_limit_mb: Optional[int], timeout_seconds: Optional[float]) -> None:
+    """
+    Apply rlimits to an already started child. `prlimit` on the pid avoids a `preexec_fn`,
+    which is unsafe in a process that runs threads (LLM workers, the log writer).
+    """
+    if resource is None or not hasattr(resource, "prlimit"):
+        return
+    try:
+        if memory_limit_mb:
+            limit = int(memory_limit_mb) * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+        if timeout_seconds:
+            cpu = math.ceil(timeout_seconds + KILL_GRACE_SECONDS)
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu, cpu + 1))
+    except (OSError, ValueError):
+        # the child may already have exited; limits are best effort
+        pass
+
+
+def kill_process_group(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, AttributeError):
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+
+def register(solver) -> None:
+    """Track a running `subprocess.Popen` or `clingo.Control` until `unregister`."""
+    with _running_lock:
+        _running.add(solver)
+
+
+def unregister(solver) -> None:
+    with _running_lock:
+        _running.discard(solver)
+
+
+def kill_running_solvers(blocking: bool = True) -> int:
+    """
+    Kill every clingo child and interrupt every in-process solve; returns how many.
+    A signal handler passes `blocking=False`: the code it interrupted may hold the lock, and
+    since the handler runs between two bytecodes of that thread the set is consistent anyway.
+    """
+    acquired = _running_lock.acquire(blocking)
+    try:
+        solvers = list(_running)
+        _running.clear()
+    finally:
+        if acquired:
+            _running_lock.release()
+    for solver in solvers:
+        if isinstance(solver, subprocess.Popen):
+            kill_process_group(solver)
+        else:
+            try:
+                solver.interrupt()
+            except Exception:
+                pass
+    return len(solvers)
+
+
+def cpu_limit_hit(returncode: Optional[int]) -> bool:
+    sigxcpu = getattr(signal, "SIGXCPU", None)
+    return sigxcpu is not None and returncode == -sigxcpu
+
+
+def memory_exceeded(returncode: Optional[int], stderr: Optional[str]) -> bool:
+    if returncode == CLINGO_EXIT_MEMORY:
+        return True
+    return any(marker in (stderr or "") for marker in MEMORY_ERROR_MARKERS)
+
+
+class WorkerTerminated(BaseException):
+    """Raised by a validation worker's SIGTERM handler into the task it interrupts."""
+
+    def __init__(self, signum: int):
+        super().__init__(signum)
+        self.signum = signum
+
+
+_in_task = False
+
+
+def install_worker_cancellation() -> None:
+    """
+    Process-pool initializer for validation workers. Ctrl-C is left to the parent, which
+    cancels the sweep and terminates the workers; SIGTERM then kills the worker's clingo
+    children, since they run in their own sessions and would outlive it. The handler only
+    does that and raises: a task unwinds (releasing every lock it holds) into
+    `cancellable_task`, which exits the worker; an idle worker exits through SystemExit.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def on_term(signum, frame):
+        kill_running_solvers(blocking=False)
+        if _in_task:
+            raise WorkerTerminated(signum)
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, on_term)
+
+
+@contextmanager
+def cancellable_task():
+    """Wrap a validation worker's task so that SIGTERM ends the worker once the task has unwound."""
+    global _in_task
+    _in_task = True
+    try:
+        yield
+    except WorkerTerminated as e:
+        _in_task = False
+        # flush buffered logs and columnar rows of finished runs; a plain exit would be
+        # swallowed by the pool's worker loop
+        atexit._run_exitfuncs()
+        os._exit(128 + e.signum)
+    finally:
+        _in_task = False
@@ -1,10 +1,11 @@
 import json
+import logging
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import subprocess
-import re
 import shutil
+import time
 
 try:
     import clingo  # type: ignore
@@ -12,8 +13,16 @@ except Exception:  # pragma: no cover
     clingo = None
 
 from benchmark.asp.action_utils import ActionMapper
+from benchmark.asp.atom_decoder import decode_witness
+from benchmark.instrumentation import span
+from benchmark.asp.engine import get_engine
+from benchmark.asp import solver_limits
 from benchmark.io.constraints_collectors import BaseConstraintsCollector, get_collector
 
+logger = logging.getLogger(__name__)
+# fallback notices already logged by this process (one per reason, not one per run)
+_warned_fallbacks = set()
+
 
 class ASPValidator:
     """Runs clingo and parses its JSON output."""
@@ -26,12 +35,44 @@ class ASPValidator:
         clingo_path: str = "clingo",
         use_clingo_api: bool = False,
         collector: BaseConstraintsCollector = None,
+        first_model_only: bool = False,
+        timeout_seconds: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        incremental: bool = False,
+        ground_cache_dir: Optional[str] = None,
+        search_only_timeout: bool = False,
     ):
         self.domain = domain
         self.domain_dir = domain_dir
         self.instance_dir = instance_dir
         self.clingo_path = clingo_path
         self.use_clingo_api = use_clingo_api and clingo is not None
+        # in-process solving cannot be held to a memory limit, and its time limit only cancels the
+        # search (grounding runs to completion); unless the caller accepts the latter
+        # (`search_only_timeout`), enforce the limits on the clingo subprocess instead
+        unenforced = [
+            name
+            for name, value in (
+                ("memory_limit_mb", memory_limit_mb),
+                ("timeout_seconds", timeout_seconds and not search_only_timeout),
+            )
+            if value
+        ]
+        if self.use_clingo_api and unenforced:
+            self.use_clingo_api = False
+            reason = ", ".join(unenforced)
+            if reason not in _warned_fallbacks:
+                _warned_fallbacks.add(reason)
+                logger.warning("asp.%s cannot be enforced in-process; validating with the clingo executable", reason)
+        # only satisfiability and the first witness are read, so enumeration can stop early
+        self.first_model_only = first_model_only
+        # API only: check plans of any length on one grounding per instance
+        self.incremental = incremental and self.use_clingo_api
+        # API only: load ground programs from / store them to this directory (GroundCache)
+        self.ground_cache_dir = ground_cache_dir if self.use_clingo_api else None
+        # per-validation limits; None means unbounded
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
         self.mapper = ActionMapper(domain)
         self.last_stdout: Optional[str] = None
         self.collector = get_collector(domain, domain_dir, instance_dir, collector)
@@ -72,36 +113,104 @@ class ASPValidator:
                 constraint_path = tf.name
 
         files = self.get_input_files() + [constraint_path]
-        cmd = [self.clingo_path, *files, "-c", f"maxstep={maxstep}", "--outf=2", "0"]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
+        models = "1" if self.first_model_only else "0"
+        cmd = [self.clingo_path, *files, "-c", f"maxstep={maxstep}", "--outf=2", "--stats", models]
+        time_limit = solver_limits.clingo_time_limit(self.timeout_seconds)
+        if time_limit:
+            cmd.append(f"--time-limit={time_limit}")
+        started = time.perf_counter()
+        try:
+            stdout, stderr, returncode, killed = self.run_clingo(cmd, time_limit)
+        finally:
+            if not constraints_path:
+                Path(constraint_path).unlink(missing_ok=True)
 
         result: Dict = {
             "cmd": cmd,
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-            "returncode": proc.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "returncode": returncode,
             "satisfiable": False,
             "nonexec_feedback": [],
             "unjustified": [],
             "open_commitment_frames": [],
             "conflicts": [],
         }
+        if self.memory_limit_mb and solver_limits.memory_exceeded(returncode, stderr):
+            result["limit_exceeded"] = "memory"
+        elif killed:
+            result["limit_exceeded"] = "time"
         # stash raw stdout for persistence
-        self.last_stdout = proc.stdout
+        self.last_stdout = stdout
 
         try:
-            data = json.loads(proc.stdout)
-            if data.get("Result") == "SATISFIABLE":
-                result["satisfiable"] = True
-                values = data["Call"][0]["Witnesses"][0]["Value"] if data["Call"] and data["Call"][0]["Witnesses"] else []
-                result.update(self.extract_symbols(values))
+            data = json.loads(stdout)
+            result.update(self.parse_output(data))
+            result["solver_stats"] = {
+                **self.output_stats(data),
+                "wall_time": time.perf_counter() - started,
+                "first_model_only": self.first_model_only,
+            }
+            # clingo stopped at --time-limit without deciding the plan
+            if time_limit and data.get("Result") == "UNKNOWN" and "limit_exceeded" not in result:
+                result["limit_exceeded"] = "time"
         except Exception:
             pass
         return result
 
+    def run_clingo(self, cmd: List[str], time_limit: Optional[int]):
+        """
+        Run clingo under the configured limits; returns (stdout, stderr, returncode, killed).
+        `killed` is True if clingo overran its own time limit by the grace period or its CPU rlimit.
+        """
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, start_new_session=True
+        )
+        solver_limits.register(proc)
+        try:
+            solver_limits.limit_child(proc.pid, self.memory_limit_mb, self.timeout_seconds)
+            wait = time_limit + solver_limits.KILL_GRACE_SECONDS if time_limit else None
+            try:
+                stdout, stderr = proc.communicate(timeout=wait)
+                return stdout, stderr, proc.returncode, solver_limits.cpu_limit_hit(proc.returncode)
+            except subprocess.TimeoutExpired:
+                solver_limits.kill_process_group(proc)
+                stdout, stderr = proc.communicate()
+                return stdout, stderr, proc.returncode, True
+        except BaseException:
+            # cancelled (KeyboardInterrupt) or failed: never leave clingo running
+            solver_limits.kill_process_group(proc)
+            proc.wait()
+            raise
+        finally:
+            solver_limits.unregister(proc)
+
     def validate_with_api(self, asp_constraints: str, maxstep: int) -> Dict:
+        """
+        Validate in-process through the shared clingo engine, which reuses a grounded
+        domain + instance base across plans whenever the plan allows it.
+        """
+        files = self.clingo_input_files()
+        started = time.perf_counter()
+        data, meta = get_engine().solve(
+            files,
+            maxstep,
+            asp_constraints,
+            first_model_only=self.first_model_only,
+            timeout=self.timeout_seconds,
+            incremental=self.incremental,
+            ground_cache_dir=self.ground_cache_dir,
+        )
+        result = self.api_result(data, meta, started)
+        # store the clingo-style JSON for persistence, same shape as --outf=2
+        self.last_stdout = json.dumps(data, indent=2)
+        return result
+
+    def api_result(self, data: Dict, meta: Dict, started: float) -> Dict:
         result: Dict = {
             "used_api": True,
+            "api_strategy": meta["strategy"],
+            "stderr": "\n".join(meta["messages"]),
             "satisfiable": False,
             "nonexec_feedback": [],
             "unjustified": [],
@@ -109,108 +218,122 @@ class ASPValidator:
             "conflicts": [],
             "acts": [],
         }
-        ctrl = clingo.Control(["-c", f"maxstep={maxstep}"])
-        for f in self.clingo_input_files():
-            ctrl.load(f)
-        ctrl.add("base", [], asp_constraints)
-        ctrl.ground([("base", [])])
-        models = []
-
-        def on_model(m):
-            models.append([str(s) for s in m.symbols(shown=True)])
-
-        ctrl.solve(on_model=on_model)
-        if models:
-            result["satisfiable"] = True
-            result.update(self.extract_symbols(models[0]))
-        # store a minimal raw representation for persistence
-        self.last_stdout = json.dumps({"models": models, "satisfiable": result["satisfiable"]})
+        if data.get("Result") == "UNKNOWN":
+            result["limit_exceeded"] = "time"
+        result.update(self.parse_output(data))
+        result["solver_stats"] = {
+            **meta["stats"],
+            "wall_time": time.perf_counter() - started,
+            "first_model_only": self.first_model_only,
+        }
         return result
 
-    def extract_symbols(self, values: List[str]) -> Dict:
-        nonexec = []
-        unjust = []
-        open_frames = []
-        conflicts = []
-        acts = []
-        for atom in values:
-            if atom.startswith("nonexec_feedback"):
-                parsed = self.parse_nonexec(atom)
-                nonexec.append(parsed or atom)
-            elif atom.startswith("unjustified"):
-                parsed = self.parse_unjustified(atom)
-                unjust.append(parsed or atom)
-            elif atom.startswith("open_commitment_frame"):
-                parsed = self.parse_open_frame(atom)
-                open_frames.append(parsed or atom)
-            elif atom.startswith("conflict"):
-                parsed = self.parse_conflict(atom)
-                conflicts.append(parsed or atom)
-            elif atom.startswith("act("):
-                acts.append(atom)
-        return {
-            "nonexec_feedback": nonexec,
-            "unjustified": unjust,
-            "open_commitment_frames": open_frames,
-            "conflicts": conflicts,
-            "acts": acts,
-        }
+    def validate_many(self, plans: Sequence[Dict]) -> List[Dict]:
+        """
+        Validate several plans for this instance; each plan is a dict with `constraints_text`,
+        `maxstep` and optionally `constraints_path`, as passed to `validate_plan`. Returns one
+        result per plan, in order, shaped like `validate_plan`'s; the raw clingo output of
+        each is in `self.last_stdouts`. With the clingo API the instance is grounded once for
+        all of them (`ClingoEngine.solve_many`); otherwise each plan is its own clingo call.
+        """
+        results: List[Dict] = []
+        self.last_stdouts: List[Optional[str]] = []
+        if not self.use_clingo_api:
+            for plan in plans:
+                results.append(
+                    self.validate_plan(
+                        [],
+                        maxstep=plan["maxstep"],
+                        constraints_text=plan["constraints_text"],
+                        constraints_path=plan.get("constraints_path"),
+                    )
+                )
+                self.last_stdouts.append(self.last_stdout)
+            return results
+        for plan in plans:
+            if plan.get("constraints_path"):
+                Path(plan["constraints_path"]).write_text(plan["constraints_text"])
+        solved = get_engine().solve_many(
+            self.clingo_input_files(),
+            [(plan["maxstep"], plan["constraints_text"]) for plan in plans],
+            first_model_only=self.first_model_only,
+            timeout=self.timeout_seconds,
+        )
+        for data, meta in solved:
+            result = self.api_result(data, meta, time.perf_counter())
+            # the shared grounding is charged to the first plan that needed it
+            result["solver_stats"]["wall_time"] = (meta["stats"].get("ground_time") or 0.0) + meta["stats"]["total_time"]
+            results.append(result)
+            self.last_stdouts.append(json.dumps(data, indent=2))
+        if solved:
+            self.last_stdout = self.last_stdouts[-1]
+        return results
 
-    def parse_nonexec(self, atom: str) -> Dict:
-        m = re.match(r'nonexec_feedback\("(.*)",\s*act\(([^,]+),\s*(.+),\s*(\d+)\)\)', atom)
-        if not m:
-            return {}
-        return {
-            "message": m.group(1),
-            "subject": m.group(2),
-            "action": m.group(3),
-            "time": int(m.group(4)),
-        }
+    def validate_plan_horizons(self, constraints_text: str, horizons: Sequence[int], stop_at_first: bool = False):
+        """
+        Check one plan at several horizons (`maxstep` values), yielding `(horizon, result)`
+        with `result` shaped like `validate_plan`'s. With the clingo API the checks share one
+        incremental grounding; otherwise each horizon is a separate clingo call. With
+        `stop_at_first` the sweep ends at the first satisfiable horizon.
+        """
+        if not self.use_clingo_api:
+            for horizon in horizons:
+                result = self.validate_plan([], maxstep=horizon, constraints_text=constraints_text)
+                yield horizon, result
+                if stop_at_first and result["satisfiable"]:
+                    return
+            return
+        started = time.perf_counter()
+        solves = get_engine().solve_horizons(
+            self.clingo_input_files(),
+            horizons,
+            constraints_text,
+            first_model_only=self.first_model_only,
+            timeout=self.timeout_seconds,
+        )
+        for horizon, data, meta in solves:
+            result = self.api_result(data, meta, started)
+            yield horizon, result
+            if stop_at_first and result["satisfiable"]:
+                return
+            started = time.perf_counter()
 
-    def parse_unjustified(self, atom: str) -> Dict:
-        m = re.match(r'unjustified\(([^,]+),\s*([^,]+),\s*([^,]+),\s*(\d+)\)', atom)
-        if not m:
-            return {}
+    @staticmethod
+    def output_stats(data: Dict) -> Dict:
+        """
+        Solver statistics from `--outf=2 --stats` output. The CLI reports no separate grounding
+        time, so `ground_time` is total minus solve time (parsing + grounding + preprocessing).
+        """
+        times = data.get("Time") or {}
+        stats = data.get("Stats") or {}
+        lp = stats.get("LP") or {}
+        core = stats.get("Core") or {}
+        rules = lp.get("Rules")
+        total, solve = times.get("Total"), times.get("Solve")
         return {
-            "subject": m.group(1),
-            "fluent": m.group(2),
-            "intention": m.group(3),
-            "time": int(m.group(4)),
+            "total_time": total,
+            "solve_time": solve,
+            "ground_time": total - solve if total is not None and solve is not None else None,
+            "ground_cached": False,
+            "cpu_time": times.get("CPU"),
+            "atoms": lp.get("Atoms"),
+            "rules": rules.get("Original") if isinstance(rules, dict) else rules,
+            "choices": core.get("Choices"),
+            "conflicts": core.get("Conflicts"),
+            "models": (data.get("Models") or {}).get("Number"),
+            "exhausted": (data.get("Models") or {}).get("More") == "no",
         }
 
-    def parse_open_frame(self, atom: str) -> Dict:
-        m = re.match(r'open_commitment_frame\(([^,]+),\s*([^)]+)\)', atom)
-        if not m:
+    def parse_output(self, data: Dict) -> Dict:
+        """Extract satisfiability and the first witness from `--outf=2` style output."""
+        if data.get("Result") != "SATISFIABLE":
             return {}
-        return {"subject": m.group(1), "intention": m.group(2)}
+        parsed: Dict = {"satisfiable": True}
+        values = data["Call"][0]["Witnesses"][0]["Value"] if data["Call"] and data["Call"][0]["Witnesses"] else []
+        with span("extract_symbols"):
+            parsed.update(self.extract_symbols(values))
+        return parsed
 
-    def parse_conflict(self, atom: str) -> Dict:
-        if not atom.startswith("conflict(") or not atom.endswith(")"):
-            return {}
-        inner = atom[len("conflict(") : -1]
-        parts = []
-        buf = []
-        depth = 0
-        for ch in inner:
-            if ch == "," and depth == 0:
-                parts.append("".join(buf).strip())
-                buf = []
-                continue
-            if ch == "(":
-                depth += 1
-            elif ch == ")":
-                depth = max(0, depth - 1)
-            buf.append(ch)
-        if buf:
-            parts.append("".join(buf).strip())
-        if len(parts) != 5:
-            return {}
-        thr, thr_int, targ, targ_int, act = parts
-        return {
-            "threatener": thr,
-            "threatener_intention": thr_int,
-            "threatened_actor": targ,
-            "threatened_intention": targ_int,
-            "action": act,
-            "summary": f"{thr} (intends {thr_int}) threatens {targ}'s intention {targ_int} via {act}",
-        }
+    def extract_symbols(self, values: List[str]) -> Dict:
+        """Feedback records and acts of a witness; see `benchmark.asp.atom_decoder`."""
+        return decode_witness(values)
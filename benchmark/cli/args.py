@@ -8,13 +8,137 @@ def build_arg_parser():
     parser.add_argument("--instance", help="Path to instance dir (defaults to domain/asp_version)")
     parser.add_argument("--model", help="Override model name")
     parser.add_argument("--clingo", help="Override clingo path")
+    parser.add_argument(
+        "--clingo-api",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Validate in-process with the clingo Python API instead of a clingo subprocess",
+    )
+    parser.add_argument(
+        "--first-model",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Stop clingo after the first model instead of enumerating all of them",
+    )
+    parser.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="With the clingo API, check plans of every length on one incremental grounding per instance",
+    )
+    parser.add_argument(
+        "--ground-cache",
+        metavar="DIR",
+        help="With the clingo API, load ground programs from DIR and store new ones there (shareable across processes)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        metavar="N",
+        help="With --revalidate, check up to N saved runs on the same instance in one batched solver call",
+    )
+    parser.add_argument(
+        "--asp-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Wall-clock limit per clingo validation; runs over it end at stage asp_timeout",
+    )
+    parser.add_argument(
+        "--asp-memory-mb",
+        type=int,
+        metavar="MB",
+        help="Address-space limit of the clingo subprocess; runs over it end at stage asp_memory",
+    )
     parser.add_argument("--maxstep", type=int, help="Override maxstep")
+    parser.add_argument(
+        "--tight-maxstep",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Without --maxstep, check plans at maxstep=len(actions) instead of len(actions)+1 "
+        "for instances with a precomputed reference plan",
+    )
     parser.add_argument("--response-file", help="Use pre-saved LLM response instead of calling API")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume a killed sweep: reuse RUN_ID, skip tasks its ledger marks done and rerun failed ones",
+    )
+    parser.add_argument(
+        "--coordinator",
+        action="store_true",
+        help="Queue the sweep's tasks in <output-dir>/<run_id>/queue.sqlite for --worker processes "
+        "and collect their results (with --resume RUN_ID: requeue failed tasks and collect again)",
+    )
+    parser.add_argument(
+        "--worker",
+        metavar="QUEUE",
+        help="Claim and run tasks from a coordinator's queue.sqlite until none is left; the coordinator's "
+        "options apply, options given here override them (e.g. --workers)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        metavar="SECONDS",
+        help="With --worker, how long claimed tasks stay leased without a heartbeat (default 120)",
+    )
+    parser.add_argument(
+        "--task-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="With --worker, stop renewing the lease of a task running longer than this, so it is "
+        "retried elsewhere (default 3600)",
+    )
+    parser.add_argument(
+        "--revalidate",
+        metavar="RESULTS_ROOT",
+        help="Re-validate every saved LLM response under a results tree (files or parquet) with the current parser/encodings "
+        "(no LLM calls; --domain/--model filter, --validation-workers sets parallelism)",
+    )
     parser.add_argument("--output", help="Where to write JSON result")
+    parser.add_argument("--trace", help="Write a Chrome trace-event JSON of per-stage spans to this path")
     parser.add_argument("--output-dir", help="Base directory to store run artifacts")
     parser.add_argument("--runs", type=int, help="Runs per instance per model")
     parser.add_argument("--instances", nargs="+", help="Explicit instance directories (relative or absolute)")
+    parser.add_argument(
+        "--select",
+        nargs="+",
+        metavar="TERM",
+        help="Pick instances from the domain's instance catalog, e.g. --select grid=12x12,14x14 per=5 seed=0 "
+        "(see benchmark/instance_catalog.py)",
+    )
     parser.add_argument("--workers", type=int, help="Number of parallel workers (default serial)")
+    parser.add_argument(
+        "--validation-workers",
+        type=int,
+        help="Processes for the parse/clingo stage when --workers > 1 (default: CPU count)",
+    )
+    parser.add_argument("--stage-queue-size", type=int, help="Max queued items per pipeline stage")
+    parser.add_argument(
+        "--scheduler",
+        choices=["asyncio", "threads"],
+        help="LLM stage scheduler when --workers > 1 (default: asyncio; --workers is then the in-flight limit)",
+    )
+    parser.add_argument(
+        "--artifact-backend",
+        choices=["files", "parquet"],
+        help="Per-run artifact files (default) or one columnar Parquet store per sweep",
+    )
+    parser.add_argument(
+        "--precompute-prompts",
+        action="store_true",
+        help="Build every prompt of the sweep up front on a process pool before any LLM call",
+    )
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Stream LLM responses and abort early on broken output format (default: llm.stream.enabled)",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=["off", "read", "write", "readwrite"],
+        help="LLM response cache mode (default: llm.cache.mode)",
+    )
     parser.add_argument("--max-tokens", type=int, help="Override LLM max_tokens")
     parser.add_argument("--max-output-tokens", type=int, help="Override LLM max_output_tokens if supported")
     parser.add_argument("--provider", choices=["openrouter", "openai", "anthropic"], help="LLM provider")
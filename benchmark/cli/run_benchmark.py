@@ -1,7 +1,8 @@
-import json
+import os
 import shlex
+import signal
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -18,14 +19,65 @@ from benchmark.cli.resolve_paths import (
     normalize_model_for_provider,
     resolve_instance_dir_for_response_file,
 )
+from benchmark.asp.solver_limits import kill_running_solvers
 from benchmark.config.config_loader import load_combined_config, to_experiment_config
 from benchmark.domain_registry import get_adapter
-from benchmark.reporting.summary import summarize_results
+from benchmark.instance_catalog import resolve_selection
+from benchmark.io.artifact_writer import result_dir
+from benchmark.io.task_ledger import TaskLedger, task_key
+from benchmark.io.task_queue import (
+    LEASE_SECONDS,
+    QUEUE_FILENAME,
+    TASK_TIMEOUT_SECONDS,
+    Heartbeat,
+    TaskQueue,
+    worker_name,
+)
+from benchmark.llm_clients.response_cache import all_cache_stats
+from benchmark.prompt_builders.prompt_cache import get_prompt, precompute_prompts
+from benchmark.reporting.sweep_output import SUMMARY_FILENAME, SweepOutput
 from benchmark.runner.experiment_runner import ExperimentRunner
+from benchmark.runner.pipeline import AsyncStagedPipeline, StagedPipeline, validate_batch_in_worker
+from benchmark.runner.revalidate import (
+    batch_saved_runs,
+    find_saved_runs,
+    find_saved_stores,
+    load_saved_run,
+    load_stored_runs,
+)
+
+
+# how often the coordinator (and an idle worker) looks at the task queue
+QUEUE_POLL_SECONDS = 2.0
+
+
+def cancel_on_sigterm(signum, frame):
+    """Treat SIGTERM (e.g. a job scheduler ending the sweep) like Ctrl-C."""
+    raise KeyboardInterrupt
+
+
+def select_or_fail(domains_root: Path, domain: str, selector) -> list:
+    instance_dirs = resolve_selection(domains_root, domain, selector)
+    if not instance_dirs:
+        raise ValueError(f"Selector {selector!r} matched no instances under {domains_root / domain / 'instances'}")
+    print(f"Selected {len(instance_dirs)} {domain} instances", file=sys.stderr)
+    return instance_dirs
 
 
 def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
     args = parse_args(argv)
+    signal.signal(signal.SIGTERM, cancel_on_sigterm)
+    task_queue = None
+    if args.worker:
+        # a worker runs the coordinator's sweep; options given to the worker override its options
+        task_queue = TaskQueue(Path(args.worker).resolve())
+        queue_meta = task_queue.meta()
+        if Path(queue_meta["cwd"]).is_dir():
+            os.chdir(queue_meta["cwd"])
+        args = parse_args(queue_meta["argv"] + argv)
+    if args.coordinator and args.revalidate:
+        raise ValueError("--coordinator does not support --revalidate")
 
     command_line = " ".join(
         shlex.quote(a) for a in [sys.executable, str(Path(sys.argv[0]).resolve()), *sys.argv[1:]]
@@ -49,9 +101,20 @@ def main(argv=None):
         runs_per_instance = args.runs or exp_cfg.runs_per_instance
 
     clingo_path = args.clingo or cfg["asp"]["clingo_path"]
+    use_clingo_api = args.clingo_api if args.clingo_api is not None else cfg["asp"].get("use_clingo_api", False)
+    first_model_only = args.first_model if args.first_model is not None else cfg["asp"].get("first_model_only", False)
+    asp_options = {
+        "asp_timeout": args.asp_timeout or cfg["asp"].get("timeout_seconds"),
+        "asp_memory_mb": args.asp_memory_mb or cfg["asp"].get("memory_limit_mb"),
+        "tight_maxstep": args.tight_maxstep if args.tight_maxstep is not None else cfg["asp"].get("tight_maxstep", False),
+        "incremental": args.incremental if args.incremental is not None else cfg["asp"].get("incremental", False),
+        "ground_cache_dir": args.ground_cache or cfg["asp"].get("ground_cache_dir"),
+    }
     provider = args.provider or llm_cfg.provider
+    cache_mode = args.cache_mode or llm_cfg.cache_mode
     maxstep = args.maxstep or exp_cfg.maxstep
     output_dir = Path(args.output_dir or exp_cfg.output_dir)
+    artifact_backend = args.artifact_backend or exp_cfg.artifact_backend
     workers = args.workers or exp_cfg.workers
 
     domains_root = Path(args.domains_root or cfg.get("domains_root", exp_cfg.domains_root))
@@ -60,6 +123,24 @@ def main(argv=None):
 
     base = Path.cwd()
 
+    if args.revalidate:
+        sink = run_revalidation(
+            args,
+            cmd_meta,
+            exp_cfg,
+            llm_cfg,
+            cfg_path,
+            domains_root,
+            output_dir,
+            clingo_path,
+            use_clingo_api,
+            first_model_only,
+            asp_options,
+            batch_size=args.batch_size or cfg["asp"].get("batch_size", 1),
+        )
+        write_output(args, sink, cmd_meta)
+        return
+
     response_text = None
     response_file_dir = None
     if args.response_file:
@@ -73,6 +154,8 @@ def main(argv=None):
             instance_dirs.append(Path(p) if Path(p).is_absolute() else base / p)
     elif args.instance:
         instance_dirs = [Path(args.instance) if Path(args.instance).is_absolute() else base / args.instance]
+    elif args.select:
+        instance_dirs = select_or_fail(domains_root, domain, args.select)
     elif response_file_dir:
         inferred = infer_instance_dir_from_response_file(response_file_dir, domains_root, domain)
         if inferred is None:
@@ -92,6 +175,8 @@ def main(argv=None):
             candidate = domains_root / domain / "instances" / inst_path
             resolved.append(candidate)
         instance_dirs = resolved
+    elif exp_cfg.select:
+        instance_dirs = select_or_fail(domains_root, domain, exp_cfg.select)
     else:
         adapter = get_adapter(domain)
         instance_dirs = adapter.default_instance_dirs(domains_root)
@@ -101,7 +186,14 @@ def main(argv=None):
                 f"No instances found under {expected}. Use --instance/--instances to specify manually."
             )
 
-    run_id_base = datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d_%H-%M-%S_%Z")
+    run_id_base = args.resume or datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d_%H-%M-%S_%Z")
+    ledger = None
+    if task_queue is not None:
+        run_id_base = queue_meta["run_id"]
+    else:
+        ledger = TaskLedger(output_dir / run_id_base / "ledger.jsonl")
+        if args.resume and not ledger.path.exists():
+            raise ValueError(f"No task ledger to resume at {ledger.path}")
 
     global_max_output_tokens = args.max_output_tokens or llm_cfg.max_output_tokens
     global_max_tokens = args.max_tokens or llm_cfg.max_tokens
@@ -109,15 +201,34 @@ def main(argv=None):
     domain_max_map = llm_cfg.domain_max_output_tokens or {}
     model_max_tokens_map = llm_cfg.model_max_tokens or {}
 
-    results = []
     tasks = [
         (idx, m, inst)
         for idx, (m, inst) in enumerate(
             [(m, inst) for m in models for inst in instance_dirs for unused in range(runs_per_instance)]
         )
     ]
+    # results are persisted by the runner; the sweep only aggregates them (the coordinator's
+    # job in a distributed sweep, so a worker keeps neither summary nor ledger)
+    sink = None
+    if task_queue is None:
+        sink = SweepOutput(output_dir / run_id_base / SUMMARY_FILENAME, args.output, args.trace)
+        ledger.record_sweep(cmd_meta, resumed=bool(args.resume))
+    if args.resume and task_queue is None:
+        # completed tasks are skipped and their saved results reused; failed/missing ones rerun
+        completed = ledger.completed()
+        remaining = []
+        for seq, m, inst in tasks:
+            entry = completed.get(task_key(seq, m, inst))
+            previous = ledger.load_result(entry) if entry else None
+            if previous is None:
+                remaining.append((seq, m, inst))
+                continue
+            previous.setdefault("invocation", cmd_meta)
+            sink.add(previous)
+        print(f"Resuming {run_id_base}: {sink.count}/{len(tasks)} tasks already done", file=sys.stderr)
+        tasks = remaining
 
-    def run_task(seq, model_name, inst_dir):
+    def runner_kwargs(seq, model_name, inst_dir):
         max_output_tokens = global_max_output_tokens
         if max_output_tokens is None:
             max_output_tokens = model_max_map.get(model_name)
@@ -139,7 +250,7 @@ def main(argv=None):
         if response_file_dir:
             inst_dir_for_runner = resolve_instance_dir_for_response_file(inst_dir, response_file_dir)
 
-        runner = ExperimentRunner(
+        return dict(
             base_dir=base,
             domains_root=domains_root,
             domain=domain,
@@ -158,116 +269,407 @@ def main(argv=None):
             llm_cfg=llm_cfg,
             response_file_dir=response_file_dir,
             instance_label_override=instance_label_override,
+            use_clingo_api=use_clingo_api,
+            first_model_only=first_model_only,
+            **asp_options,
+            cache_mode=cache_mode,
+            stream=args.stream,
+            artifact_backend=artifact_backend,
+            # tasks repeat each (model, instance) runs_per_instance times in a row
+            sample_index=seq % runs_per_instance,
         )
 
+    def run_prompt_only(runner, seq, model_name, inst_dir):
+        prompt, _ = get_prompt(runner.prompt_gen, domains_root, inst_dir)
+        run_id = f"{run_id_base}_prompt_only/run_{seq:04d}"
+        result = {
+            "stage": "prompt_only",
+            "success": True,
+            "prompt": prompt,
+            "run_id": run_id,
+            "metadata": runner.metadata(),
+            "invocation": cmd_meta,
+        }
+        runner.persist_result(result, run_id, prompt, llm_raw=None, parse=None, asp=None)
+        runner.copy_support_files(run_id)
+        print(f"--- Prompt saved for {inst_dir} at {run_id} ---")
+        print(prompt)
+        return result
+
+    def run_task(seq, model_name, inst_dir):
+        runner = ExperimentRunner(**runner_kwargs(seq, model_name, inst_dir))
         if args.prompt_only:
-            prompt = runner.prompt_gen.build_prompt(domains_root, inst_dir)
-            run_id = f"{run_id_base}_prompt_only/run_{seq:04d}"
-            result = {
-                "stage": "prompt_only",
-                "success": True,
-                "prompt": prompt,
-                "run_id": run_id,
-                "metadata": {"domain": domain, "instance": inst_dir.name, "model": model_name},
-                "invocation": cmd_meta,
-            }
-            runner.persist_result(result, run_id, prompt, llm_raw=None, parse=None, asp=None)
-            runner.copy_support_files(run_id)
-            print(f"--- Prompt saved for {inst_dir} at {run_id} ---")
-            print(prompt)
-            return result
+            return run_prompt_only(runner, seq, model_name, inst_dir)
 
         result = runner.run(response_text=response_text if args.response_file else None, run_seq=seq)
         result["invocation"] = cmd_meta
         return result
-    
-    total_tasks = len(tasks)
-    if workers and workers > 1:
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            future_map = {}
-            for i, (seq, m, inst) in enumerate(tasks, start=1):
-                print(f"[{i}/{total_tasks}] START domain={domain} model={m} instance={inst}")
-                future = executor.submit(run_task, seq, m, inst)
-                future_map[future] = (i, m, inst)
-
-            for future in as_completed(future_map):
-                i, m, inst = future_map[future]
-                result = future.result()
-                meta = result.get("metadata") or {}
-                asp = result.get("asp") or {}
-                satisfiable = asp.get("satisfiable")
-                if satisfiable is True:
-                    clingo_result = "SATISFIABLE"
-                elif satisfiable is False:
-                    clingo_result = "UNSATISFIABLE"
-                else:
-                    clingo_result = "N/A"
-
-                out_path = (
-                    f"{output_dir}/"
-                    f"{result.get('run_id')}/"
-                    f"{meta.get('domain')}/"
-                    f"{meta.get('asp_version')}/"
-                    f"{str(meta.get('model','')).replace('/','_')}/"
-                    f"{meta.get('instance')}"
-                )
 
-                print(
-                    f"[{i}/{total_tasks}] DONE  "
-                    f"Plan:{clingo_result} "
-                    f"domain={meta.get('domain')} "
-                    f"model={meta.get('model')} "
-                    f"instance={meta.get('instance')} "
-                    f"stage={result.get('stage')} "
-                    f"out={out_path}",
-                    file=sys.stderr,
-                    flush=True,
+    def llm_stage(task):
+        """Stage 1 of the staged pipeline; validation of the response happens in a worker process."""
+        i, seq, model_name, inst_dir = task
+        print(f"[{i}/{total_tasks}] START domain={domain} model={model_name} instance={inst_dir}")
+        kwargs = runner_kwargs(seq, model_name, inst_dir)
+        runner = ExperimentRunner(**kwargs)
+        if args.prompt_only:
+            return kwargs, {"result": run_prompt_only(runner, seq, model_name, inst_dir)}
+        return kwargs, runner.generate(response_text=response_text if args.response_file else None, run_seq=seq)
+
+    async def llm_astage(task):
+        """Coroutine variant of `llm_stage` for the asyncio scheduler."""
+        i, seq, model_name, inst_dir = task
+        print(f"[{i}/{total_tasks}] START domain={domain} model={model_name} instance={inst_dir}")
+        kwargs = runner_kwargs(seq, model_name, inst_dir)
+        runner = ExperimentRunner(**kwargs)
+        if args.prompt_only:
+            return kwargs, {"result": run_prompt_only(runner, seq, model_name, inst_dir)}
+        return kwargs, await runner.agenerate(response_text=response_text if args.response_file else None, run_seq=seq)
+
+    if task_queue is None and (args.precompute_prompts or exp_cfg.precompute_prompts):
+        started = time.time()
+        specs = []
+        for seq, m, inst in tasks:
+            kwargs = runner_kwargs(seq, m, inst)
+            specs.append((domain, kwargs["asp_version"], domains_root, kwargs["instance_dir"]))
+        built = precompute_prompts(specs, workers=args.validation_workers or exp_cfg.validation_workers)
+        print(f"Precomputed {built} prompts in {time.time() - started:.2f}s", file=sys.stderr)
+
+    def execute(numbered):
+        """Run `(i, seq, model, instance)` tasks, yielding `(i, seq, model, instance, result)` as they finish."""
+        if workers and workers > 1:
+            scheduler = args.scheduler or exp_cfg.scheduler
+            validation_workers = args.validation_workers or exp_cfg.validation_workers
+            queue_size = args.stage_queue_size or exp_cfg.stage_queue_size
+            if scheduler == "asyncio":
+                pipeline = AsyncStagedPipeline(
+                    llm_astage, concurrency=workers, validation_workers=validation_workers, queue_size=queue_size
                 )
-                results.append(result)
-
-    else:
-        for i, (seq, m, inst) in enumerate(tasks, start=1):
-            print(f"[{i}/{total_tasks}] START domain={domain} model={m} instance={inst}")
-            result = run_task(seq, m, inst)
-            meta = result.get("metadata") or {}
-            asp = result.get("asp") or {}
-            satisfiable = asp.get("satisfiable")
-            if satisfiable is True:
-                clingo_result = "SATISFIABLE"
-            elif satisfiable is False:
-                clingo_result = "UNSATISFIABLE"
             else:
-                clingo_result = "N/A"
-
-            out_path = (
-                f"{output_dir}/"
-                f"{result.get('run_id')}/"
-                f"{meta.get('domain')}/"
-                f"{meta.get('asp_version')}/"
-                f"{str(meta.get('model','')).replace('/','_')}/"
-                f"{meta.get('instance')}"
+                pipeline = StagedPipeline(
+                    llm_stage, llm_workers=workers, validation_workers=validation_workers, queue_size=queue_size
+                )
+            for (i, seq, m, inst), result in pipeline.run(numbered):
+                result.setdefault("invocation", cmd_meta)
+                yield i, seq, m, inst, result
+        else:
+            for i, seq, m, inst in numbered:
+                print(f"[{i}/{total_tasks}] START domain={domain} model={m} instance={inst}")
+                yield i, seq, m, inst, run_task(seq, m, inst)
+
+    if task_queue is not None:
+        total_tasks = sum(task_queue.counts().values())
+        try:
+            run_worker(
+                task_queue,
+                execute,
+                args.lease_seconds or LEASE_SECONDS,
+                args.task_timeout or TASK_TIMEOUT_SECONDS,
+                total_tasks,
+                output_dir,
+                artifact_backend,
             )
+        except KeyboardInterrupt:
+            kill_running_solvers()
+            flush_artifacts(artifact_backend)
+            raise SystemExit(130)
+        return
 
+    total_tasks = len(tasks)
+    try:
+        if args.coordinator:
+            task_queue = TaskQueue(output_dir / run_id_base / QUEUE_FILENAME, create=True)
+            task_queue.set_meta(run_id=run_id_base, argv=argv, cwd=str(Path.cwd()), invocation=cmd_meta)
+            run_coordinator(task_queue, tasks, ledger, sink, cmd_meta, output_dir)
+        else:
+            numbered = [(i, seq, m, inst) for i, (seq, m, inst) in enumerate(tasks, start=1)]
+            for i, seq, m, inst, result in execute(numbered):
+                ledger.record(
+                    seq, m, inst, result, result_dir(output_dir, result, artifact_backend), backend=artifact_backend
+                )
+                report_done(i, total_tasks, result, output_dir, artifact_backend)
+                sink.add(result)
+    except KeyboardInterrupt:
+        # the pipeline has terminated its validation workers; stop clingo runs of this process
+        kill_running_solvers()
+        flush_artifacts(artifact_backend)
+        sink.write_summary()
+        sink.discard()
+        if args.coordinator:
+            print(
+                f"Stopped collecting after {sink.count} finished tasks; workers keep running. "
+                f"Collect again with --coordinator --resume {run_id_base}",
+                file=sys.stderr,
+            )
+        else:
             print(
-                f"[{i}/{total_tasks}] DONE  "
-                f"Plan: {clingo_result} "
-                f"domain={meta.get('domain')} "
-                f"model={meta.get('model')} "
-                f"instance={meta.get('instance')} "
-                f"stage={result.get('stage')} "
-                f"out={out_path}",
+                f"Cancelled after {sink.count} finished tasks; continue with --resume {run_id_base}",
                 file=sys.stderr,
-                flush=True,
             )
-            results.append(result)
+        raise SystemExit(130)
+
+    flush_artifacts(artifact_backend)
+    write_output(args, sink, cmd_meta)
+
+
+def run_coordinator(task_queue, tasks, ledger, sink, cmd_meta, output_dir, poll_seconds=QUEUE_POLL_SECONDS):
+    """
+    Queue `tasks` for `--worker` processes and collect their results as they finish: each one
+    is recorded in the ledger and added to the summary, as a local sweep would. Returns when
+    every task is done or failed; tasks whose lease kept expiring are recorded as failed.
+    """
+    task_queue.enqueue(tasks)
+    print(
+        f"Queued {len(tasks)} tasks in {task_queue.path}; start workers with: "
+        f"python run_benchmark.py --worker {task_queue.path}",
+        file=sys.stderr,
+    )
+    waiting = {seq for seq, _, _ in tasks}
+    total_tasks = len(tasks)
+    cursor = 0
+    while waiting:
+        task_queue.abandon_expired()
+        for row in task_queue.finished(after=cursor):
+            cursor = row["finish_order"]
+            if row["seq"] not in waiting:
+                continue
+            waiting.discard(row["seq"])
+            entry = {"result_dir": row["result_dir"], "run_id": row["run_id"], "backend": row["backend"]}
+            result = ledger.load_result(entry) if row["result_dir"] else None
+            done = total_tasks - len(waiting)
+            if result is None:
+                # abandoned, or its result is gone: recorded as failed, so --resume reruns it
+                result = {"stage": "error", "success": False, "run_id": row["run_id"], "error": row["error"]}
+                print(
+                    f"[{done}/{total_tasks}] FAILED model={row['model']} instance={row['instance']}: "
+                    f"{row['error'] or 'no saved result'}",
+                    file=sys.stderr,
+                )
+            else:
+                report_done(done, total_tasks, result, output_dir, row["backend"])
+            result.setdefault("invocation", cmd_meta)
+            ledger.record(
+                row["seq"],
+                row["model"],
+                Path(row["instance"]),
+                result,
+                Path(row["result_dir"]) if row["result_dir"] else None,
+                backend=row["backend"] or "files",
+            )
+            sink.add(result)
+        if waiting:
+            time.sleep(poll_seconds)
+
+
+def run_worker(task_queue, execute, lease_seconds, task_timeout, total_tasks, output_dir, artifact_backend):
+    """
+    Run tasks from a coordinator's queue with `execute` until none is left. One pipeline runs
+    for the worker's lifetime, fed by a generator that claims a task whenever a slot frees up.
+    Results are persisted by the runner under the coordinator's run_id, as in a local sweep;
+    the queue only records where. Leases of running tasks are renewed by a heartbeat thread for
+    up to `task_timeout` seconds each; on exit the tasks still held are handed back.
+    """
+    worker = worker_name()
+    task_queue.register_worker(worker)
+    print(f"Worker {worker} on {task_queue.path}", file=sys.stderr)
+
+    def claims():
+        while True:
+            claimed = task_queue.claim(worker, 1, lease_seconds)
+            if claimed:
+                seq, m, inst = claimed[0]
+                heartbeat.started(seq)
+                yield seq + 1, seq, m, inst
+            elif task_queue.unfinished():
+                # this worker's own tasks are still running, or others hold tasks whose lease may expire
+                time.sleep(QUEUE_POLL_SECONDS)
+            else:
+                return
+
+    with Heartbeat(task_queue, worker, lease_seconds, task_timeout) as heartbeat:
+        try:
+            for i, seq, m, inst, result in execute(claims()):
+                heartbeat.finished(seq)
+                # rows of the columnar store must be on disk before the coordinator reads them
+                flush_artifacts(artifact_backend)
+                task_queue.complete(
+                    seq, worker, result, result_dir(output_dir, result, artifact_backend), artifact_backend
+                )
+                report_done(i, total_tasks, result, output_dir, artifact_backend)
+        finally:
+            task_queue.release(worker)
+
+
+def run_revalidation(
+    args,
+    cmd_meta,
+    exp_cfg,
+    llm_cfg,
+    cfg_path,
+    domains_root,
+    output_dir,
+    clingo_path,
+    use_clingo_api,
+    first_model_only,
+    asp_options,
+    batch_size=1,
+):
+    """
+    Re-run parse -> constraints -> clingo -> evaluation on every stored LLM response under
+    `--revalidate` (`llm_raw.txt` files and columnar stores), writing the results under a
+    fresh run_id. No LLM calls are made. With `batch_size > 1`, up to that many runs on the
+    same instance are checked together (`ASPValidator.validate_many`).
+    """
+    results_root = Path(args.revalidate)
+    loaded = [load_saved_run(run_dir, domains_root) for run_dir in find_saved_runs(results_root)]
+    for store in find_saved_stores(results_root):
+        loaded.extend(load_stored_runs(store, domains_root))
+    saved_runs = []
+    for saved in loaded:
+        if saved is None:
+            continue
+        meta = saved["metadata"]
+        if args.domain and meta["domain"] != args.domain:
+            continue
+        if args.model and meta.get("model") != args.model:
+            continue
+        saved_runs.append(saved)
+    if not saved_runs:
+        raise ValueError(f"No saved LLM responses found under {results_root}")
 
-    summary = summarize_results(results)
-    output_data = {"summary": summary, "runs": results, "invocation": cmd_meta}
+    run_id_base = datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d_%H-%M-%S_%Z")
+    total_tasks = len(saved_runs)
+    artifact_backend = args.artifact_backend or exp_cfg.artifact_backend
+
+    def stage(task):
+        i, saved = task
+        meta = saved["metadata"]
+        print(f"[{i}/{total_tasks}] START revalidate {saved['run_dir']}")
+        kwargs = dict(
+            base_dir=Path.cwd(),
+            domains_root=domains_root,
+            domain=meta["domain"],
+            asp_version=meta.get("asp_version") or exp_cfg.asp_version,
+            instance_dir=saved["instance_dir"],
+            model=meta.get("model") or "unknown",
+            provider=args.provider or llm_cfg.provider,
+            clingo_path=clingo_path,
+            maxstep=args.maxstep or meta.get("maxstep"),
+            config_path=cfg_path,
+            output_dir=output_dir,
+            exp_cfg=exp_cfg,
+            llm_cfg=llm_cfg,
+            instance_label_override=meta["instance"],
+            sample_index=meta.get("sample_index") or 0,
+            use_clingo_api=use_clingo_api,
+            first_model_only=first_model_only,
+            **asp_options,
+            artifact_backend=artifact_backend,
+            revalidated_from={
+                "run_dir": str(saved["run_dir"]),
+                "run_id": saved["run_id"],
+                "stage": saved["stage"],
+                "satisfiable": saved["satisfiable"],
+            },
+        )
+        pending = {
+            "run_id": f"{run_id_base}_revalidate/run_{i - 1:04d}",
+            "prompt": saved["prompt"],
+            "response_text": saved["response_text"],
+            "timing": saved["timing"],
+            "offline": True,
+        }
+        return kwargs, pending
+
+    def batch_stage(batch):
+        staged = [stage(task) for task in batch]
+        return [kwargs for kwargs, _ in staged], [pending for _, pending in staged]
+
+    sink = SweepOutput(output_dir / f"{run_id_base}_revalidate" / SUMMARY_FILENAME, args.output, args.trace)
+    validation_workers = args.validation_workers or exp_cfg.validation_workers
+    if batch_size > 1:
+        batches = batch_saved_runs(saved_runs, batch_size)
+        pipeline = StagedPipeline(
+            batch_stage,
+            llm_workers=1,
+            validation_workers=validation_workers,
+            queue_size=args.stage_queue_size,
+            validate=validate_batch_in_worker,
+        )
+        completed = (
+            (i, result)
+            for batch, results in pipeline.run(batches)
+            for (i, _), result in zip(batch, results)
+        )
+    elif len(saved_runs) > 1:
+        tasks = list(enumerate(saved_runs, start=1))
+        pipeline = StagedPipeline(
+            stage, llm_workers=1, validation_workers=validation_workers, queue_size=args.stage_queue_size
+        )
+        completed = ((i, result) for (i, _), result in pipeline.run(tasks))
+    else:
+        kwargs, pending = stage((1, saved_runs[0]))
+        completed = [(1, ExperimentRunner(**kwargs).validate_response(pending))]
+    changed = 0
+    for i, result in completed:
+        result.setdefault("invocation", cmd_meta)
+        report_done(i, total_tasks, result, output_dir, artifact_backend)
+        source = (result.get("metadata") or {}).get("revalidated_from") or {}
+        if (result.get("asp") or {}).get("satisfiable") != source.get("satisfiable"):
+            changed += 1
+        sink.add(result)
+    flush_artifacts(artifact_backend)
+    print(f"Revalidated {sink.count} runs from {results_root}: satisfiability changed for {changed}", file=sys.stderr)
+    return sink
+
+
+def report_done(i, total_tasks, result, output_dir, artifact_backend="files"):
+    meta = result.get("metadata") or {}
+    asp = result.get("asp") or {}
+    satisfiable = asp.get("satisfiable")
+    if asp.get("limit_exceeded"):
+        clingo_result = "UNKNOWN"
+    elif satisfiable is True:
+        clingo_result = "SATISFIABLE"
+    elif satisfiable is False:
+        clingo_result = "UNSATISFIABLE"
+    else:
+        clingo_result = "N/A"
+
+    out_path = result_dir(output_dir, result, artifact_backend)
+
+    print(
+        f"[{i}/{total_tasks}] DONE  "
+        f"Plan: {clingo_result} "
+        f"domain={meta.get('domain')} "
+        f"model={meta.get('model')} "
+        f"instance={meta.get('instance')} "
+        f"stage={result.get('stage')} "
+        f"out={out_path}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def flush_artifacts(artifact_backend):
+    """Write out rows the columnar store still buffers in this process."""
+    if artifact_backend == "parquet":
+        from benchmark.io.columnar_store import close_columnar_stores
 
-    if args.output:
-        Path(args.output).write_text(json.dumps(output_data, indent=2))
-    # else:
-    #     print(json.dumps(output_data, indent=2))
+        close_columnar_stores()
+
+
+def write_output(args, sink, cmd_meta):
+    """Final `summary.json`, plus `--output` and `--trace` assembled from the sweep's spools."""
+    cache_stats = all_cache_stats()
+    for stats in cache_stats.values():
+        print(
+            f"LLM cache {stats['path']}: hits={stats['hits']} misses={stats['misses']} "
+            f"writes={stats['writes']} hit_rate={stats['hit_rate']:.2f}",
+            file=sys.stderr,
+        )
+    sink.close(cmd_meta, {"cache": cache_stats} if cache_stats else None)
+    if args.trace:
+        print(f"Wrote {sink.trace_events} trace events to {args.trace}", file=sys.stderr)
 
 
 if __name__ == "__main__":
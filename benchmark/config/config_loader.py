@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -14,6 +14,19 @@ class LlmConfig:
     model_max_tokens: Dict[str, int]
     model_max_output_tokens: Dict[str, int]
     domain_max_output_tokens: Dict[str, int]
+    base_url: Optional[str] = None
+    temperature: float = 0.7
+    cache_mode: str = "off"
+    cache_path: str = ".cache/llm_responses.sqlite"
+    cache_ttl_seconds: Optional[float] = None
+    cache_max_entries: Optional[int] = None
+    rate_limits: Dict[str, Dict] = field(default_factory=dict)
+    max_retries: int = 5
+    retry_backoff_base: float = 1.0
+    retry_backoff_max: float = 60.0
+    stream: bool = False
+    stream_abort_on_format_error: bool = True
+    stream_max_preamble_chars: int = 2000
 
 
 @dataclass
@@ -27,6 +40,12 @@ class ExperimentConfig:
     output_dir: str
     workers: int
     domains_root: str
+    validation_workers: Optional[int] = None
+    stage_queue_size: Optional[int] = None
+    scheduler: str = "asyncio"
+    precompute_prompts: bool = False
+    artifact_backend: str = "files"
+    select: Optional[str] = None
 
 
 def load_combined_config(default_path: Path, user_path: Optional[Path]) -> Dict:
@@ -42,6 +61,9 @@ def load_combined_config(default_path: Path, user_path: Optional[Path]) -> Dict:
 def to_experiment_config(cfg: Dict) -> (ExperimentConfig, LlmConfig):
     exp = cfg.get("experiment", {})
     llm_cfg = cfg.get("llm", {})
+    cache_cfg = llm_cfg.get("cache", {}) or {}
+    retry_cfg = llm_cfg.get("retry", {}) or {}
+    stream_cfg = llm_cfg.get("stream", {}) or {}
     exp_cfg = ExperimentConfig(
         domain=exp.get("domain", "aladdin"),
         asp_version=exp.get("asp_version", "original"),
@@ -52,6 +74,12 @@ def to_experiment_config(cfg: Dict) -> (ExperimentConfig, LlmConfig):
         output_dir=exp.get("output_dir", "results"),
         workers=exp.get("workers", 1),
         domains_root=cfg.get("domains_root", "benchmark/domains"),
+        validation_workers=exp.get("validation_workers"),
+        stage_queue_size=exp.get("stage_queue_size"),
+        scheduler=exp.get("scheduler", "asyncio"),
+        precompute_prompts=exp.get("precompute_prompts", False),
+        artifact_backend=exp.get("artifact_backend", "files"),
+        select=exp.get("select"),
     )
     llm = LlmConfig(
         provider=llm_cfg.get("provider", "openrouter"),
@@ -61,6 +89,20 @@ def to_experiment_config(cfg: Dict) -> (ExperimentConfig, LlmConfig):
         model_max_tokens=llm_cfg.get("model_max_tokens", {}) or {},
         model_max_output_tokens=llm_cfg.get("model_max_output_tokens", {}) or {},
         domain_max_output_tokens=llm_cfg.get("domain_max_output_tokens", {}) or {},
+        base_url=llm_cfg.get("base_url"),
+        temperature=llm_cfg.get("temperature", 0.7),
+        # unquoted YAML `off` loads as False
+        cache_mode=cache_cfg.get("mode") or "off",
+        cache_path=cache_cfg.get("path", ".cache/llm_responses.sqlite"),
+        cache_ttl_seconds=cache_cfg.get("ttl_seconds"),
+        cache_max_entries=cache_cfg.get("max_entries"),
+        rate_limits=llm_cfg.get("rate_limits", {}) or {},
+        max_retries=retry_cfg.get("max_retries", 5),
+        retry_backoff_base=retry_cfg.get("backoff_base", 1.0),
+        retry_backoff_max=retry_cfg.get("backoff_max", 60.0),
+        stream=stream_cfg.get("enabled", False),
+        stream_abort_on_format_error=stream_cfg.get("abort_on_format_error", True),
+        stream_max_preamble_chars=stream_cfg.get("max_preamble_chars", 2000),
     )
     return exp_cfg, llm
 
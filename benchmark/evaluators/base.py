@@ -1,10 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 class BaseEvaluator:
     """Abstract base evaluator."""
 
-    def evaluate(self, asp_result: Dict, parse_result: Dict, **kwargs) -> Dict:
+    def evaluate(self, asp_result: Dict, parse_result: Dict, reference: Optional[Dict] = None, **kwargs) -> Dict:
         satisfiable = asp_result.get("satisfiable", False)
         nonexec: List[Any] = asp_result.get("nonexec_feedback", []) or []
         actions = parse_result.get("actions", []) if parse_result else []
@@ -18,6 +18,12 @@ class BaseEvaluator:
             "nonexecuted_actions": len(nonexecuted),
             "plan_length": len(actions),
         }
+        if reference:
+            # how many actions a valid plan spends beyond the shortest one
+            shortest = reference["plan_length"]
+            base["reference_plan_length"] = shortest
+            base["optimality_gap"] = len(actions) - shortest if satisfiable else None
+            base["optimality_ratio"] = len(actions) / shortest if satisfiable and shortest else None
         extra = self.extra_metrics(asp_result, parse_result, **kwargs)
         base.update(extra or {})
         return base
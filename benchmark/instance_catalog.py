@@ -0,0 +1,307 @@
+"""
+Instance catalog and selector language.
+
+`load_catalog(domains_root, domain)` returns one metadata entry per instance directory under
+`<domains_root>/<domain>/instances/<group>/<instance>`: group, index (the trailing number of
+the directory name), grid size and obstacle/key counts, number of characters, counts of
+`place`/`connection` facts and a sha256 per file. The catalog is cached under
+`.cache/instance_catalog/` with the (mtime, size) of every instance file; an instance is
+rescanned when one of its files changed, was added or was removed (`rebuild=True` rescans
+everything).
+
+`select_instances(entries, selector)` filters and samples entries with a whitespace-separated
+selector such as `grid=12x12,14x14 per=5 seed=0`:
+
+- `field=v1,v2` / `field!=v1,v2` match any / none of the values (`*`/`?` globs for text fields)
+- `field>N`, `field>=N`, `field<N`, `field<=N` compare numeric fields
+- `by=field[,field]` sets the strata for `per`/`first` (default: `group`)
+- `per=N` draws N random instances per stratum, `first=N` takes the N lowest indices
+- `sample=N` draws N instances from what is left, `seed=S` seeds the draws (default 0)
+
+Draws use one RNG per stratum seeded from `seed` and the stratum, so a selection is the same
+across machines and does not change when other strata are added or filtered out.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+from benchmark.io.file_cache import fingerprint, read_json, write_json
+
+CATALOG_DIR = Path(".cache") / "instance_catalog"
+CATALOG_VERSION = 1
+
+NUMERIC_FIELDS = ("index", "width", "height", "obstacles", "keys", "characters", "places", "connections", "facts")
+TEXT_FIELDS = ("domain", "group", "name", "path", "grid", "sha256")
+DIRECTIVES = ("by", "per", "first", "sample", "seed")
+TERM_PATTERN = re.compile(r"^(\w+)\s*(>=|<=|!=|=|>|<)\s*(.+)$")
+
+FACT_PATTERNS = {
+    "places": re.compile(r"^\s*place\(", re.M),
+    "connections": re.compile(r"^\s*connection\(", re.M),
+    "facts": re.compile(r"^\s*\w+\(.*\)\s*\.\s*$", re.M),
+}
+CHARACTER_PATTERN = re.compile(r"^\s*character\(\s*([^,)\s]+)", re.M)
+
+
+def natural_key(text: str) -> Tuple:
+    """Sort `grid_4x4` before `grid_10x10` and `instance_2` before `instance_10`."""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", text))
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def describe_instance(domains_root: Path, domain: str, instance_dir: Path) -> Dict:
+    """Catalog entry of one instance directory."""
+    group = instance_dir.parent.name
+    index = re.search(r"(\d+)$", instance_dir.name)
+    files = sorted(p for p in instance_dir.iterdir() if p.is_file())
+    hashes = {p.name: file_sha256(p) for p in files}
+    program = "\n".join(p.read_text(errors="replace") for p in files if p.suffix == ".lp")
+
+    entry: Dict = {
+        "domain": domain,
+        "group": group,
+        "name": instance_dir.name,
+        "path": instance_dir.relative_to(domains_root).as_posix(),
+        "index": int(index.group(1)) if index else None,
+        "width": None,
+        "height": None,
+        "grid": None,
+        "obstacles": None,
+        "keys": None,
+        "characters": len(set(CHARACTER_PATTERN.findall(program))),
+        **{key: len(pattern.findall(program)) for key, pattern in FACT_PATTERNS.items()},
+    }
+
+    matrix = instance_dir / "matrix.txt"
+    if matrix.exists():
+        rows = [line.strip() for line in matrix.read_text().splitlines() if line.strip()]
+        entry["height"] = len(rows)
+        entry["width"] = max(len(row) for row in rows) if rows else 0
+        entry["obstacles"] = sum(row.count("1") for row in rows)
+    size = re.search(r"(\d+)x(\d+)", group)
+    if size and entry["width"] is None:
+        entry["width"], entry["height"] = int(size.group(1)), int(size.group(2))
+    obstacles = re.search(r"(\d+)obstacle", group)
+    if obstacles and entry["obstacles"] is None:
+        entry["obstacles"] = int(obstacles.group(1))
+    keys = re.search(r"(\d+)key", group)
+    if keys:
+        entry["keys"] = int(keys.group(1))
+    if entry["width"] is not None:
+        entry["grid"] = f"{entry['width']}x{entry['height']}"
+
+    entry["files"] = hashes
+    combined = "\n".join(f"{name} {digest}" for name, digest in hashes.items())
+    entry["sha256"] = hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    return entry
+
+
+def list_groups(instance_root: Path) -> Dict[str, List[str]]:
+    """`{group: [instance dir names]}`, both in natural order; an instance dir has an `instance.lp`."""
+    groups: Dict[str, List[str]] = {}
+    if not instance_root.exists():
+        return groups
+    for group_dir in sorted((p for p in instance_root.iterdir() if p.is_dir()), key=lambda p: natural_key(p.name)):
+        names = [p.name for p in group_dir.iterdir() if (p / "instance.lp").is_file()]
+        if names:
+            groups[group_dir.name] = sorted(names, key=natural_key)
+    return groups
+
+
+def catalog_path(domains_root: Path, domain: str) -> Path:
+    root = hashlib.sha1(str(domains_root.resolve()).encode("utf-8")).hexdigest()[:12]
+    return CATALOG_DIR / f"{domain}_{root}.json"
+
+
+def read_catalog(path: Path) -> Dict:
+    data = read_json(path) or {}
+    return data if data.get("version") == CATALOG_VERSION else {}
+
+
+def write_catalog(path: Path, data: Dict) -> None:
+    write_json(path, data)
+
+
+def instance_stamps(instance_dir: Path) -> List:
+    """`[name, mtime_ns, size]` of every file of an instance directory."""
+    files = sorted(p for p in instance_dir.iterdir() if p.is_file())
+    return [[path.name, mtime, size] for (_, mtime, size), path in zip(fingerprint(files), files)]
+
+
+def load_catalog(domains_root: Path, domain: str, rebuild: bool = False) -> List[Dict]:
+    """Catalog entries of a domain in (group, index) order; see the module docstring."""
+    domains_root = Path(domains_root)
+    instance_root = domains_root / domain / "instances"
+    path = catalog_path(domains_root, domain)
+    stored = read_catalog(path).get("groups", {})
+    cached = {} if rebuild else stored
+
+    groups: Dict[str, Dict] = {}
+    changed = rebuild
+    for group, names in list_groups(instance_root).items():
+        hit = cached.get(group, {})
+        known = {e["name"]: e for e in hit.get("entries", [])}
+        known_stamps = hit.get("stamps", {})
+        # precomputed data (reference plans) stays valid while the instance files are unchanged
+        previous = {e["name"]: e for e in stored.get(group, {}).get("entries", [])}
+        entries, stamps = [], {}
+        for name in names:
+            instance_dir = instance_root / group / name
+            # stamped before the scan, so an edit during it is picked up by the next load
+            stamps[name] = instance_stamps(instance_dir)
+            entry = known.get(name)
+            if entry is None or known_stamps.get(name) != stamps[name]:
+                entry = describe_instance(domains_root, domain, instance_dir)
+                old = previous.get(name)
+                if old is not None and old["sha256"] == entry["sha256"] and "reference" in old:
+                    entry["reference"] = old["reference"]
+                changed = True
+            entries.append(entry)
+        changed = changed or hit.get("instances") != names
+        groups[group] = {"instances": names, "stamps": stamps, "entries": entries}
+    if changed or set(cached) != set(groups):
+        write_catalog(path, {"version": CATALOG_VERSION, "domain": domain, "groups": groups})
+    return [entry for group in groups.values() for entry in group["entries"]]
+
+
+def update_catalog(domains_root: Path, domain: str, updates: Dict[str, Dict]) -> None:
+    """Merge `{path: {key: value}}` into the cached entries of a domain, e.g. reference plans."""
+    domains_root = Path(domains_root)
+    load_catalog(domains_root, domain)
+    path = catalog_path(domains_root, domain)
+    data = read_catalog(path)
+    for group in data.get("groups", {}).values():
+        for entry in group["entries"]:
+            if entry["path"] in updates:
+                entry.update(updates[entry["path"]])
+    write_catalog(path, data)
+
+
+def parse_selector(selector: Union[str, Sequence[str], None]) -> Tuple[List[Tuple[str, str, List[str]]], Dict]:
+    """Split a selector into `(field, op, values)` filters and a dict of directives."""
+    if selector is None:
+        return [], {}
+    text = selector if isinstance(selector, str) else " ".join(str(term) for term in selector)
+    filters: List[Tuple[str, str, List[str]]] = []
+    directives: Dict = {}
+    for term in text.split():
+        m = TERM_PATTERN.match(term)
+        if not m:
+            raise ValueError(f"Bad selector term {term!r}: expected field=value, field>=N, per=N, ...")
+        key, op, value = m.groups()
+        if key in DIRECTIVES:
+            if op != "=":
+                raise ValueError(f"Selector directive {key!r} takes '=', got {term!r}")
+            directives[key] = value.split(",") if key == "by" else int(value)
+            continue
+        if key not in NUMERIC_FIELDS and key not in TEXT_FIELDS:
+            known = ", ".join(NUMERIC_FIELDS + TEXT_FIELDS + DIRECTIVES)
+            raise ValueError(f"Unknown selector field {key!r} (known: {known})")
+        if op in ("<", "<=", ">", ">=") and key not in NUMERIC_FIELDS:
+            raise ValueError(f"Selector field {key!r} is not numeric: {term!r}")
+        values = value.split(",")
+        if key in NUMERIC_FIELDS:
+            try:
+                [float(v) for v in values]
+            except ValueError:
+                raise ValueError(f"Selector field {key!r} needs numbers: {term!r}") from None
+        filters.append((key, op, values))
+    for key in directives.get("by", []):
+        if key not in NUMERIC_FIELDS and key not in TEXT_FIELDS:
+            raise ValueError(f"Unknown selector field {key!r} in by=")
+    return filters, directives
+
+
+def matches(entry: Dict, field: str, op: str, values: List[str]) -> bool:
+    actual = entry.get(field)
+    if field in NUMERIC_FIELDS:
+        if actual is None:
+            return False
+        numbers = [float(v) for v in values]
+        if op == "=":
+            return actual in numbers
+        if op == "!=":
+            return actual not in numbers
+        limit = numbers[0]
+        return {"<": actual < limit, "<=": actual <= limit, ">": actual > limit, ">=": actual >= limit}[op]
+    hit = actual is not None and any(fnmatch.fnmatchcase(str(actual), v) for v in values)
+    return hit if op == "=" else not hit
+
+
+def select_instances(entries: List[Dict], selector: Union[str, Sequence[str], None]) -> List[Dict]:
+    """Entries picked by `selector` (see the module docstring), in catalog order."""
+    filters, directives = parse_selector(selector)
+    picked = [e for e in entries if all(matches(e, *f) for f in filters)]
+    seed = directives.get("seed", 0)
+
+    if "per" in directives or "first" in directives:
+        by = directives.get("by", ["group"])
+        strata: Dict[Tuple, List[Dict]] = {}
+        for entry in picked:
+            strata.setdefault(tuple(entry.get(key) for key in by), []).append(entry)
+        picked = []
+        for stratum, members in strata.items():
+            if "first" in directives:
+                members = sorted(members, key=lambda e: (e["index"] is None, e["index"] or 0))
+                members = members[: directives["first"]]
+            if "per" in directives and len(members) > directives["per"]:
+                rng = random.Random(f"{seed}|{'|'.join(map(str, stratum))}")
+                members = rng.sample(members, directives["per"])
+            picked.extend(members)
+
+    if "sample" in directives and len(picked) > directives["sample"]:
+        picked = random.Random(f"{seed}|sample").sample(picked, directives["sample"])
+
+    order = {id(e): i for i, e in enumerate(entries)}
+    return sorted(picked, key=lambda e: order[id(e)])
+
+
+def resolve_selection(domains_root: Path, domain: str, selector, rebuild: bool = False) -> List[Path]:
+    """Instance directories picked by `selector` from the domain's catalog."""
+    entries = select_instances(load_catalog(domains_root, domain, rebuild=rebuild), selector)
+    return [Path(domains_root) / e["path"] for e in entries]
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build the instance catalog and preview a selection")
+    parser.add_argument("--domain", required=True, choices=["aladdin", "secret_agent", "western"])
+    parser.add_argument("--domains-root", default="benchmark/domains", help="Domains root directory")
+    parser.add_argument("--select", nargs="+", help="Selector terms, e.g. grid=12x12,14x14 per=5 seed=0")
+    parser.add_argument("--rebuild", action="store_true", help="Rescan every instance, ignoring the cached catalog")
+    parser.add_argument("--paths", action="store_true", help="Print the selected instance paths")
+    parser.add_argument("--json", action="store_true", help="Print the selected catalog entries as JSON lines")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_arg_parser().parse_args(argv)
+    domains_root = Path(args.domains_root)
+    entries = select_instances(load_catalog(domains_root, args.domain, rebuild=args.rebuild), args.select)
+    if args.json:
+        for entry in entries:
+            print(json.dumps(entry))
+        return
+    if args.paths:
+        for entry in entries:
+            print(domains_root / entry["path"])
+        return
+    counts: Dict[str, int] = {}
+    for entry in entries:
+        counts[entry["group"]] = counts.get(entry["group"], 0) + 1
+    for group, count in counts.items():
+        print(f"{count:6d}  {group}")
+    print(f"{len(entries):6d}  selected", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Per-stage wall/CPU spans for a run.
+
+`StageTimer.span(name)` records one span: wall time, CPU time of the calling thread plus any
+child processes reaped meanwhile (the clingo subprocess), start timestamp, pid and thread.
+Code below the runner (parser, validator) uses the module-level `span(name)`, which records
+into the timer activated on the current thread and is a no-op otherwise, so nested stages
+like `extract_json` or `extract_symbols` need no plumbing.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+_active = threading.local()
+
+
+def children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class StageTimer:
+    """
+    Spans of one run. `spans` is a list of picklable dicts, so the LLM stage's spans travel
+    to the validation worker inside the pending dict; `totals` sums wall/cpu per stage name.
+    """
+
+    def __init__(self, spans: Optional[List[Dict]] = None):
+        self.spans: List[Dict] = []
+        self.totals: Dict[str, Dict[str, Optional[float]]] = {}
+        for record in spans or []:
+            self.add(record)
+
+    def add(self, record: Dict) -> None:
+        self.spans.append(record)
+        total = self.totals.setdefault(record["name"], {"wall": 0.0, "cpu": 0.0})
+        total["wall"] += record["wall"]
+        if record["cpu"] is None or total["cpu"] is None:
+            total["cpu"] = None
+        else:
+            total["cpu"] += record["cpu"]
+
+    def record(self, name: str, start: float, wall: float) -> None:
+        """Add a span measured elsewhere (e.g. this run's share of a batched solver call)."""
+        self.add({"name": name, "start": start, "wall": wall, "cpu": None, "pid": os.getpid(), "tid": threading.get_ident()})
+
+    @contextmanager
+    def span(self, name: str, cpu: bool = True) -> Iterator[None]:
+        """Time a stage; pass `cpu=False` where the thread interleaves other work (asyncio)."""
+        start = time.time()
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time() + children_cpu() if cpu else None
+        try:
+            yield
+        finally:
+            self.add(
+                {
+                    "name": name,
+                    "start": start,
+                    "wall": time.perf_counter() - wall0,
+                    "cpu": time.thread_time() + children_cpu() - cpu0 if cpu else None,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    @contextmanager
+    def activate(self) -> Iterator["StageTimer"]:
+        """Make this the timer `span()` records into on the current thread."""
+        previous = getattr(_active, "timer", None)
+        _active.timer = self
+        try:
+            yield self
+        finally:
+            _active.timer = previous
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timer = getattr(_active, "timer", None)
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
@@ -3,6 +3,33 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 
+from benchmark.io.blob_store import BLOBS_DIRNAME, get_blob_store
+from benchmark.io.event_log import get_log_writer
+from benchmark.io.support_files_copier import SupportFilesCopier
+
+ARTIFACT_BACKENDS = ("files", "parquet")
+STORE_DIRNAME = "store"
+
+
+def store_root(output_dir: Path, run_id: str) -> Path:
+    """Columnar store of a run (`parquet` backend): one per sweep, next to its ledger.jsonl."""
+    return Path(output_dir) / str(run_id).split("/")[0] / STORE_DIRNAME
+
+
+def result_dir(output_dir: Path, result: Dict, backend: str = "files") -> Path:
+    """Artifact dir of a result, rebuilt from its run_id and metadata (mirrors `ArtifactWriter.ensure_dir`)."""
+    if backend == "parquet":
+        return store_root(output_dir, result.get("run_id"))
+    meta = result.get("metadata") or {}
+    return (
+        Path(output_dir)
+        / str(result.get("run_id"))
+        / str(meta.get("domain"))
+        / str(meta.get("asp_version"))
+        / str(meta.get("model", "")).replace("/", "_")
+        / str(meta.get("instance"))
+    )
+
 
 class ArtifactWriter:
     """
@@ -28,6 +55,10 @@ class ArtifactWriter:
         os.makedirs(dest_dir, exist_ok=True)
         return dest_dir
 
+    def constraints_path(self, run_id: str) -> Optional[Path]:
+        """Where the plan constraints are written for clingo (None: a temp file)."""
+        return self.ensure_dir(run_id) / f"{self.domain}_NarrPlan.lp"
+
     def write(
         self,
         run_id: str,
@@ -59,13 +90,44 @@ class ArtifactWriter:
             (dest_dir / "PROMPT_ONLY").write_text("Prompt-only run (no LLM/ASP call)")
         return dest_dir
 
+    def copy_support_files(
+        self,
+        run_id: str,
+        clingo_input_files: list,
+        domain_root_dir: Path,
+        instance_root_dir: Path,
+        response_file_dir: Optional[Path],
+    ) -> None:
+        # support files are linked from a content-addressed store shared by the whole output_dir
+        blob_store = get_blob_store(Path(self.output_dir) / BLOBS_DIRNAME)
+        SupportFilesCopier(blob_store).copy_support_files(
+            dest_dir=self.ensure_dir(run_id),
+            clingo_input_files=clingo_input_files,
+            domain_root_dir=domain_root_dir,
+            instance_root_dir=instance_root_dir,
+            response_file_dir=response_file_dir,
+        )
+
     def append_log(self, run_id: str, result: Dict):
         log_path = self.output_dir / "benchmark.log"
         timing = result.get("llm_timing", {}) or {}
-        with open(log_path, "a") as f:
-            f.write(
-                f"{run_id} domain={self.domain} asp={self.asp_version} model={self.model} "
-                f"instance={self.instance_name} stage={result.get('stage')} success={result.get('success')} "
-                f"elapsed={timing.get('elapsed')} prompt_tokens={timing.get('prompt_tokens')} "
-                f"completion_tokens={timing.get('completion_tokens')}\n"
-            )
+        get_log_writer().write(
+            log_path,
+            f"{run_id} domain={self.domain} asp={self.asp_version} model={self.model} "
+            f"instance={self.instance_name} stage={result.get('stage')} success={result.get('success')} "
+            f"elapsed={timing.get('elapsed')} prompt_tokens={timing.get('prompt_tokens')} "
+            f"completion_tokens={timing.get('completion_tokens')}",
+        )
+
+
+def get_artifact_writer(
+    backend: str, output_dir: Path, domain: str, asp_version: str, model: str, instance_name: str
+) -> ArtifactWriter:
+    if backend == "files":
+        return ArtifactWriter(output_dir, domain, asp_version, model, instance_name)
+    if backend == "parquet":
+        # imported lazily so the default backend does not load pyarrow in every worker
+        from benchmark.io.columnar_store import ColumnarArtifactWriter
+
+        return ColumnarArtifactWriter(output_dir, domain, asp_version, model, instance_name)
+    raise ValueError(f"Unknown artifact backend {backend!r}; expected one of {ARTIFACT_BACKENDS}")
@@ -0,0 +1,129 @@
+"""
+Content-addressed store for run support files.
+
+Each distinct file is stored once, read-only, under `<output_dir>/blobs/<sha256[:2]>/<sha256>`
+and placed into run directories as a reflink, hard link or relative symlink (plain copy as
+the last resort). Identical domain/instance files therefore cost one copy per results tree,
+not one per run. Source hashes are memoized by (mtime, size), so placing a file that was
+already stored does not re-read it.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BLOBS_DIRNAME = "blobs"
+LINK_METHODS = ("reflink", "hardlink", "symlink", "copy")
+# linux/fs.h FICLONE: share the source's extents copy-on-write (btrfs, xfs, ...)
+FICLONE = 0x40049409
+# errors meaning a method can never work for this store (as opposed to e.g. EMLINK on one file)
+UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EPERM, errno.ENOSYS, errno.EINVAL, errno.ENOTTY}
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def reflink(src: Path, dest: Path) -> None:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - not available on Windows
+        raise OSError(errno.ENOSYS, "reflinks need fcntl")
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dest.unlink(missing_ok=True)
+            raise
+
+
+class BlobStore:
+    """Stores files by content hash and links them into run directories."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.lock = threading.Lock()
+        self.digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self.methods: List[str] = list(LINK_METHODS)
+
+    def digest(self, src: Path) -> str:
+        st = src.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = str(src.resolve())
+        with self.lock:
+            cached = self.digests.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        digest = file_sha256(src)
+        with self.lock:
+            self.digests[key] = (stamp, digest)
+        return digest
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, src: Path) -> Tuple[str, Path]:
+        """Store `src` unless its content is already present; returns (sha256, blob path)."""
+        digest = self.digest(src)
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.copyfile(src, tmp)
+            # read-only, since hard links share the inode with every run dir
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, blob)
+        return digest, blob
+
+    def link(self, blob: Path, dest: Path) -> str:
+        """Place `blob` at `dest` with the first method that works; returns the method used."""
+        if dest.is_symlink() or dest.exists():
+            dest.unlink()
+        for method in list(self.methods):
+            try:
+                if method == "reflink":
+                    reflink(blob, dest)
+                elif method == "hardlink":
+                    os.link(blob, dest)
+                elif method == "symlink":
+                    os.symlink(os.path.relpath(blob, dest.parent), dest)
+                else:
+                    shutil.copyfile(blob, dest)
+                return method
+            except OSError as e:
+                if method != "copy" and e.errno in UNSUPPORTED_ERRNOS:
+                    with self.lock:
+                        if method in self.methods:
+                            self.methods.remove(method)
+                if method == "copy":
+                    raise
+        raise OSError(f"could not place {blob} at {dest}")
+
+    def place(self, src: Path, dest: Path) -> Tuple[str, str]:
+        """Store `src` and link it at `dest`; returns (sha256, link method)."""
+        digest, blob = self.put(src)
+        return digest, self.link(blob, dest)
+
+
+_stores: Dict[str, BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(root: Path) -> BlobStore:
+    """Process-wide store per root, so hash memos and link-method fallbacks are shared."""
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = BlobStore(Path(root))
+            _stores[key] = store
+        return store
@@ -0,0 +1,339 @@
+"""
+Columnar results backend (`artifact_backend: parquet`).
+
+Instead of a directory of small files per run, every run of a sweep becomes one row of a
+Parquet dataset under `<output_dir>/<run_id base>/store/`:
+
+- `runs/`: one row per run with its metadata, stage, timings and `result_json` (the full
+  result dict, large texts replaced by `{"$blob": <sha256>}` references and the parser's
+  symbol lists by `{"$json_blob": <sha256>}` references to their JSON)
+- `blobs/`: prompts, raw LLM output, clingo stdout, constraints and support files, one row
+  per distinct SHA-256
+- `support/`: one row per (run, support file) naming the blob that holds its content
+
+Rows are buffered per process and written as new part files every `FLUSH_ROWS` runs and at
+process exit, so concurrent validation workers never write to the same file.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from benchmark.io.artifact_writer import ArtifactWriter, store_root
+from benchmark.io.support_files_copier import SupportFilesCopier
+
+FLUSH_ROWS = 64
+BLOB_REF = "$blob"
+# a blob holding JSON, resolved to the decoded value
+JSON_BLOB_REF = "$json_blob"
+# per-instance symbol lists of `parse`, identical across the runs of an instance
+PARSE_SYMBOL_KEYS = ("valid_characters", "valid_places", "valid_objects")
+
+RUN_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.string()),
+        ("written_at", pa.float64()),
+        ("domain", pa.string()),
+        ("asp_version", pa.string()),
+        ("model", pa.string()),
+        ("instance", pa.string()),
+        ("stage", pa.string()),
+        ("success", pa.bool_()),
+        ("offline", pa.bool_()),
+        ("satisfiable", pa.bool_()),
+        ("error", pa.string()),
+        ("llm_elapsed", pa.float64()),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("prompt_sha256", pa.string()),
+        ("llm_raw_sha256", pa.string()),
+        ("clingo_stdout_sha256", pa.string()),
+        ("constraints_sha256", pa.string()),
+        ("result_json", pa.large_string()),
+    ]
+)
+BLOB_SCHEMA = pa.schema([("sha256", pa.string()), ("size", pa.int64()), ("text", pa.large_string())])
+SUPPORT_SCHEMA = pa.schema(
+    [("run_id", pa.string()), ("dest", pa.string()), ("source", pa.string()), ("sha256", pa.string())]
+)
+SCHEMAS = {"runs": RUN_SCHEMA, "blobs": BLOB_SCHEMA, "support": SUPPORT_SCHEMA}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def as_int(value) -> Optional[int]:
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def as_float(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class ColumnarStore:
+    """Buffered, append-only writer for one store root; thread-safe, one instance per process."""
+
+    def __init__(self, root: Path, flush_rows: int = FLUSH_ROWS):
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+        self.lock = threading.Lock()
+        self.runs: List[Dict] = []
+        self.support: List[Dict] = []
+        self.pending_blobs: Dict[str, str] = {}
+        self.known_blobs: Optional[Set[str]] = None
+        self.parts = 0
+
+    def put_blob(self, text: Optional[str]) -> Optional[str]:
+        """Queue `text` unless its hash is already stored; returns the hash."""
+        if text is None:
+            return None
+        digest = content_hash(text)
+        with self.lock:
+            if self.known_blobs is None:
+                # blobs written by earlier sweeps or processes; a race only costs a duplicate row
+                self.known_blobs = set(load_table(self.root, "blobs", columns=["sha256"]).column("sha256").to_pylist())
+            if digest not in self.known_blobs:
+                self.known_blobs.add(digest)
+                self.pending_blobs[digest] = text
+        return digest
+
+    def append(self, run: Dict, support: Iterable[Dict] = ()) -> None:
+        with self.lock:
+            if run:
+                self.runs.append(run)
+            self.support.extend(support)
+            if len(self.runs) >= self.flush_rows:
+                self.flush_locked()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self) -> None:
+        # blobs first, so a visible run never references a blob that is not on disk yet
+        blobs = [{"sha256": k, "size": len(v), "text": v} for k, v in self.pending_blobs.items()]
+        for name, rows in (("blobs", blobs), ("support", self.support), ("runs", self.runs)):
+            if rows:
+                self.write_part(name, rows)
+        self.pending_blobs, self.support, self.runs = {}, [], []
+
+    def write_part(self, name: str, rows: List[Dict]) -> None:
+        table = pa.Table.from_pylist(rows, schema=SCHEMAS[name])
+        part_dir = self.root / name
+        part_dir.mkdir(parents=True, exist_ok=True)
+        part = f"part-{os.getpid()}-{uuid.uuid4().hex[:8]}-{self.parts:05d}.parquet"
+        self.parts += 1
+        # dot-prefixed temp files are skipped by dataset discovery until the rename
+        tmp = part_dir / f".{part}.tmp"
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, part_dir / part)
+
+
+_stores: Dict[str, ColumnarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_columnar_store(root: Path) -> ColumnarStore:
+    """Process-wide store per root, flushed by `close_columnar_stores` or at interpreter exit."""
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if not _stores:
+                atexit.register(close_columnar_stores)
+            store = ColumnarStore(Path(root))
+            _stores[key] = store
+        return store
+
+
+def close_columnar_stores() -> None:
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+def load_table(root: Path, name: str, columns: Optional[List[str]] = None) -> pa.Table:
+    """One table (`runs`, `blobs` or `support`) of a store; empty if nothing was written yet."""
+    path = Path(root) / name
+    schema = SCHEMAS[name]
+    if not path.exists() or not any(path.glob("*.parquet")):
+        empty = pa.Table.from_pylist([], schema=schema)
+        return empty.select(columns) if columns else empty
+    return pq.read_table(path, columns=columns, schema=schema)
+
+
+def load_blobs(root: Path, digests: Iterable[str]) -> Dict[str, str]:
+    wanted = pa.array(sorted(set(d for d in digests if d)), type=pa.string())
+    if not len(wanted) or not (Path(root) / "blobs").exists():
+        return {}
+    table = pq.read_table(Path(root) / "blobs", filters=pc.field("sha256").isin(wanted), schema=BLOB_SCHEMA)
+    return dict(zip(table.column("sha256").to_pylist(), table.column("text").to_pylist()))
+
+
+def blob_ref(value) -> Optional[str]:
+    """The key of a `{"$blob": ...}` / `{"$json_blob": ...}` reference, if `value` is one."""
+    if len(value) == 1:
+        ref = next(iter(value))
+        if ref in (BLOB_REF, JSON_BLOB_REF):
+            return ref
+    return None
+
+
+def blob_refs(value, found: Set[str]) -> None:
+    if isinstance(value, dict):
+        ref = blob_ref(value)
+        if ref:
+            found.add(value[ref])
+            return
+        for v in value.values():
+            blob_refs(v, found)
+    elif isinstance(value, list):
+        for v in value:
+            blob_refs(v, found)
+
+
+def resolve_blobs(value, blobs: Dict[str, str]):
+    if isinstance(value, dict):
+        ref = blob_ref(value)
+        if ref == BLOB_REF:
+            return blobs.get(value[ref])
+        if ref == JSON_BLOB_REF:
+            text = blobs.get(value[ref])
+            return json.loads(text) if text is not None else None
+        return {k: resolve_blobs(v, blobs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_blobs(v, blobs) for v in value]
+    return value
+
+
+def read_results(root: Path, resolve: bool = True) -> Dict[str, Dict]:
+    """Latest result dict per run_id in a store, with blob references resolved to their text."""
+    table = load_table(root, "runs", columns=["run_id", "written_at", "result_json"])
+    latest: Dict[str, tuple] = {}
+    for run_id, written_at, result_json in zip(*(table.column(c).to_pylist() for c in table.column_names)):
+        if run_id not in latest or written_at >= latest[run_id][0]:
+            latest[run_id] = (written_at, result_json)
+    results = {run_id: json.loads(result_json) for run_id, (_, result_json) in latest.items()}
+    if resolve:
+        refs: Set[str] = set()
+        blob_refs(results, refs)
+        blobs = load_blobs(root, refs)
+        results = {run_id: resolve_blobs(result, blobs) for run_id, result in results.items()}
+    return results
+
+
+_loaded: Dict[str, Dict[str, Dict]] = {}
+
+
+def read_result(root: Path, run_id: str) -> Optional[Dict]:
+    """One stored result; the store is read once per process (used when resuming a sweep)."""
+    key = str(Path(root).resolve())
+    if key not in _loaded:
+        _loaded[key] = read_results(root)
+    return _loaded[key].get(run_id)
+
+
+class ColumnarArtifactWriter(ArtifactWriter):
+    """`ArtifactWriter` that appends runs to the sweep's columnar store instead of writing files."""
+
+    def store(self, run_id: str) -> ColumnarStore:
+        return get_columnar_store(store_root(self.output_dir, run_id))
+
+    def ensure_dir(self, run_id: str) -> Path:
+        return store_root(self.output_dir, run_id)
+
+    def constraints_path(self, run_id: str) -> Optional[Path]:
+        # clingo reads the constraints from a temp file; the text itself is stored as a blob
+        return None
+
+    def write(
+        self,
+        run_id: str,
+        result: Dict,
+        prompt: Optional[str],
+        llm_raw: Optional[str],
+        parse: Optional[Dict],
+        asp: Optional[Dict],
+        raw_clingo: Optional[str] = None,
+        constraints: Optional[str] = None,
+    ) -> Path:
+        store = self.store(run_id)
+        stored = dict(result)
+        hashes = {}
+        for key, text in (("prompt", prompt), ("llm_raw", llm_raw), ("clingo_stdout", raw_clingo)):
+            text = text if text is not None else result.get(key)
+            hashes[key] = store.put_blob(text if isinstance(text, str) else None)
+            if key in stored and hashes[key] is not None:
+                stored[key] = {BLOB_REF: hashes[key]}
+        if isinstance(stored.get("asp"), dict) and isinstance(stored["asp"].get("stdout"), str):
+            stored["asp"] = {**stored["asp"], "stdout": {BLOB_REF: store.put_blob(stored["asp"]["stdout"])}}
+        if isinstance(stored.get("llm_timing"), dict) and isinstance(stored["llm_timing"].get("content"), str):
+            stored["llm_timing"] = {
+                **stored["llm_timing"],
+                "content": {BLOB_REF: store.put_blob(stored["llm_timing"]["content"])},
+            }
+        if isinstance(stored.get("parse"), dict):
+            parsed = dict(stored["parse"])
+            if isinstance(parsed.get("raw_output"), str):
+                parsed["raw_output"] = {BLOB_REF: store.put_blob(parsed["raw_output"])}
+            for key in PARSE_SYMBOL_KEYS:
+                if isinstance(parsed.get(key), list):
+                    parsed[key] = {JSON_BLOB_REF: store.put_blob(json.dumps(parsed[key]))}
+            stored["parse"] = parsed
+        meta = result.get("metadata") or {}
+        timing = result.get("llm_timing") or {}
+        row = {
+            "run_id": run_id,
+            "written_at": time.time(),
+            "domain": self.domain,
+            "asp_version": self.asp_version,
+            "model": meta.get("model", self.model),
+            "instance": self.instance_name,
+            "stage": result.get("stage"),
+            "success": result.get("success"),
+            "offline": result.get("offline"),
+            "satisfiable": (result.get("asp") or {}).get("satisfiable"),
+            "error": result.get("error") if isinstance(result.get("error"), str) else None,
+            "llm_elapsed": as_float(timing.get("elapsed")),
+            "prompt_tokens": as_int(timing.get("prompt_tokens")),
+            "completion_tokens": as_int(timing.get("completion_tokens")),
+            "prompt_sha256": hashes["prompt"],
+            "llm_raw_sha256": hashes["llm_raw"],
+            "clingo_stdout_sha256": hashes["clingo_stdout"],
+            "constraints_sha256": store.put_blob(constraints),
+            "result_json": json.dumps(stored, default=str),
+        }
+        store.append(row)
+        return store.root
+
+    def copy_support_files(
+        self,
+        run_id: str,
+        clingo_input_files: list,
+        domain_root_dir: Path,
+        instance_root_dir: Path,
+        response_file_dir: Optional[Path],
+    ) -> None:
+        store = self.store(run_id)
+        rows = []
+        for src, dest in SupportFilesCopier().support_files(
+            clingo_input_files, domain_root_dir, instance_root_dir, response_file_dir
+        ):
+            try:
+                text = src.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            rows.append({"run_id": run_id, "dest": dest, "source": str(src.resolve()), "sha256": store.put_blob(text)})
+        store.append({}, rows)
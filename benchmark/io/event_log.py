@@ -0,0 +1,116 @@
+"""
+Batched log writer and structured event stream.
+
+Runs do not open `benchmark.log` themselves. They enqueue lines for one background writer
+thread per process. The thread keeps each file open with O_APPEND and writes whatever has
+queued up as a single `write()` per file, at least every `FLUSH_INTERVAL` seconds. Lines
+from concurrent threads or validation processes therefore never interleave.
+
+`emit_event` appends one JSON object per pipeline stage transition to
+`<output_dir>/events.jsonl`: `run_start`, `llm_end`, `validate_start`, `parse_end`,
+`asp_end` and `run_end`. Each event carries `ts`, `pid`, `run_id` and the run's
+domain/model/instance.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+EVENTS_FILENAME = "events.jsonl"
+FLUSH_INTERVAL = 0.5
+MAX_BATCH = 512
+
+
+class BatchedLogWriter:
+    """Single background thread appending queued lines to their files in batches."""
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, max_batch: int = MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.fds: Dict[str, int] = {}
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="benchmark-log-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, path: Path, line: str) -> None:
+        self.queue.put((str(path), line if line.endswith("\n") else line + "\n"))
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk."""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self) -> None:
+        pending: List = []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if isinstance(item, tuple) and item:
+                pending.append(item)
+                if len(pending) < self.max_batch and time.monotonic() - last_flush < self.flush_interval:
+                    continue
+            self.write_batch(pending)
+            pending = []
+            last_flush = time.monotonic()
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                for fd in self.fds.values():
+                    os.close(fd)
+                self.fds = {}
+                return
+
+    def write_batch(self, batch: List) -> None:
+        by_path: Dict[str, List[str]] = {}
+        for path, line in batch:
+            by_path.setdefault(path, []).append(line)
+        for path, lines in by_path.items():
+            try:
+                fd = self.fds.get(path)
+                if fd is None:
+                    Path(path).parent.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    self.fds[path] = fd
+                data = "".join(lines).encode("utf-8")
+                while data:
+                    data = data[os.write(fd, data) :]
+            except OSError:
+                # logging must never fail a run
+                pass
+
+
+_writer: Optional[BatchedLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> BatchedLogWriter:
+    """Process-wide writer, drained and closed at interpreter exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.closed:
+            _writer = BatchedLogWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def emit_event(output_dir: Path, event: str, **fields) -> None:
+    record = {"ts": time.time(), "event": event, "pid": os.getpid(), **fields}
+    get_log_writer().write(Path(output_dir) / EVENTS_FILENAME, json.dumps(record, default=str))
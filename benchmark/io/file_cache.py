@@ -0,0 +1,49 @@
+"""
+Helpers shared by the JSON caches under `.cache/` (symbol index, prompts, instance catalog,
+reference programs).
+
+A cache entry is keyed by `fingerprint` of its source files, i.e. their (mtime_ns, size),
+and is rebuilt when any of them changes. Entries are written to a temporary file and renamed
+into place, so concurrent processes and threads never read a partial file; a cache that
+cannot be written (read-only checkout) is only rebuilt per process.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List
+
+
+def fingerprint(paths: Iterable[Path]) -> List:
+    """`[path, mtime_ns, size]` per file; a missing file gets `None` stamps."""
+    stamps = []
+    for path in paths:
+        try:
+            st = path.stat()
+            stamps.append([str(path), st.st_mtime_ns, st.st_size])
+        except OSError:
+            stamps.append([str(path), None, None])
+    return stamps
+
+
+def read_json(path: Path) -> Any:
+    """The JSON content of `path`, or None if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Atomically replace `path` with `data` as JSON; write errors are ignored."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -1,25 +1,31 @@
 import json
 import shutil
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+from benchmark.io.blob_store import BlobStore
 
 
 class SupportFilesCopier:
-    """Copies clingo inputs and instance extras into the run directory."""
+    """
+    Copies clingo inputs and instance extras into the run directory.
 
-    def copy_support_files(
+    With a `BlobStore`, each file is stored once by content hash and linked into the run
+    directory instead of copied; collect.json then records the hash and link method.
+    """
+
+    def __init__(self, blob_store: Optional[BlobStore] = None):
+        self.blob_store = blob_store
+
+    def support_files(
         self,
-        dest_dir: Path,
         clingo_input_files: list,
         domain_root_dir: Path,
         instance_root_dir: Path,
         response_file_dir: Path | None,
-    ) -> None:
-        domain_dir = dest_dir / "domain_constraints"
-        domain_dir.mkdir(parents=True, exist_ok=True)
-        instance_dir = dest_dir / "instance_constraints"
-        instance_dir.mkdir(parents=True, exist_ok=True)
-
-        collected = []
+    ) -> List[Tuple[Path, str]]:
+        """(source, destination relative to the run directory) of every support file of a run."""
+        files = []
 
         def is_instance_path(path: Path) -> bool:
             resolved = path.resolve()
@@ -34,50 +40,53 @@ class SupportFilesCopier:
                 return True
 
         for filePath in clingo_input_files:
-            try:
-                src = Path(filePath)
-                dest_name = src.name
-                target_dir = instance_dir if is_instance_path(src) else domain_dir
-                if dest_name == "init.lp" and not is_instance_path(src):
-                    dest_name = "base_init.lp"
-                dest_path = target_dir / dest_name
-                shutil.copy(src, dest_path)
-                collected.append({"source": str(src.resolve()), "dest": str(dest_path.resolve())})
-            except Exception:
-                pass
+            src = Path(filePath)
+            dest_name = src.name
+            target_dir = "instance_constraints" if is_instance_path(src) else "domain_constraints"
+            if dest_name == "init.lp" and not is_instance_path(src):
+                dest_name = "base_init.lp"
+            files.append((src, f"{target_dir}/{dest_name}"))
 
         for name in ["matrix.txt", "loyalty.txt", "intro.txt"]:
             p = instance_root_dir / name
             if p.exists():
-                try:
-                    dest_path = dest_dir / name
-                    shutil.copy(p, dest_path)
-                    collected.append({"source": str(p.resolve()), "dest": str(dest_path.resolve())})
-                except Exception:
-                    pass
+                files.append((p, name))
 
         if response_file_dir:
             response_instance_constraints = response_file_dir / "instance_constraints"
             if response_instance_constraints.exists() and response_instance_constraints.is_dir():
                 for src in response_instance_constraints.iterdir():
-                    try:
-                        dest_name = src.name
-                        if dest_name == "init.lp":
-                            dest_name = "base_init.lp"
-                            dest_path = domain_dir / dest_name
-                        else:
-                            dest_path = instance_dir / dest_name
-                        shutil.copy(src, dest_path)
-                        collected.append({"source": str(src.resolve()), "dest": str(dest_path.resolve())})
-                    except Exception:
-                        pass
+                    if src.name == "init.lp":
+                        files.append((src, "domain_constraints/base_init.lp"))
+                    else:
+                        files.append((src, f"instance_constraints/{src.name}"))
             for txt in response_file_dir.glob("*.txt"):
-                try:
-                    dest_path = dest_dir / txt.name
-                    shutil.copy(txt, dest_path)
-                    collected.append({"source": str(txt.resolve()), "dest": str(dest_path.resolve())})
-                except Exception:
-                    pass
+                files.append((txt, txt.name))
+        return files
+
+    def copy_support_files(
+        self,
+        dest_dir: Path,
+        clingo_input_files: list,
+        domain_root_dir: Path,
+        instance_root_dir: Path,
+        response_file_dir: Path | None,
+    ) -> None:
+        (dest_dir / "domain_constraints").mkdir(parents=True, exist_ok=True)
+        (dest_dir / "instance_constraints").mkdir(parents=True, exist_ok=True)
+
+        collected = []
+        for src, dest in self.support_files(clingo_input_files, domain_root_dir, instance_root_dir, response_file_dir):
+            try:
+                dest_path = dest_dir / dest
+                entry = {"source": str(src.resolve()), "dest": str(dest_path.absolute())}
+                if self.blob_store is not None:
+                    entry["sha256"], entry["link"] = self.blob_store.place(src, dest_path)
+                else:
+                    shutil.copy(src, dest_path)
+                collected.append(entry)
+            except Exception:
+                pass
 
         collectPath = dest_dir / "collect.json"
         try:
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# stages after which a task is retried on --resume (the LLM call or validation crashed)
+FAILED_STAGES = ("llm", "error")
+
+
+def task_key(seq: int, model: str, instance: Path) -> str:
+    return f"{seq}|{model}|{instance}"
+
+
+class TaskLedger:
+    """
+    Append-only JSONL record of a sweep's task outcomes, one file per run_id.
+
+    Each finished `(seq, model, instance)` task appends one line with its state (`done` or
+    `failed`) and where its result was persisted (artifact dir or columnar store); the last line for a task wins. Lines
+    are flushed and fsynced so a killed sweep can be resumed from the ledger.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # terminate a line torn by a crash so the next record starts on its own line
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def entries(self) -> Dict[str, Dict]:
+        """Latest record per task key; a torn trailing line from a crash is ignored."""
+        latest: Dict[str, Dict] = {}
+        if not self.path.exists():
+            return latest
+        for line in self.path.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if "key" in entry:
+                latest[entry["key"]] = entry
+        return latest
+
+    def completed(self) -> Dict[str, Dict]:
+        return {k: e for k, e in self.entries().items() if e.get("state") == "done"}
+
+    def append(self, entry: Dict) -> None:
+        line = json.dumps({**entry, "ts": time.time()}, default=str) + "\n"
+        with self.lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_sweep(self, invocation: Dict, resumed: bool) -> None:
+        self.append({"event": "resume" if resumed else "start", "invocation": invocation})
+
+    def record(
+        self,
+        seq: int,
+        model: str,
+        instance: Path,
+        result: Dict,
+        result_dir: Optional[Path],
+        backend: str = "files",
+    ) -> None:
+        self.append(
+            {
+                "key": task_key(seq, model, instance),
+                "seq": seq,
+                "model": model,
+                "instance": str(instance),
+                "state": "failed" if result.get("stage") in FAILED_STAGES else "done",
+                "stage": result.get("stage"),
+                "success": result.get("success"),
+                "run_id": result.get("run_id"),
+                "result_dir": str(result_dir) if result_dir else None,
+                "backend": backend,
+            }
+        )
+
+    def load_result(self, entry: Dict) -> Optional[Dict]:
+        """Reload the persisted result of a completed task (None if it is gone)."""
+        result_dir = entry.get("result_dir")
+        if not result_dir:
+            return None
+        if entry.get("backend") == "parquet":
+            from benchmark.io.columnar_store import read_result
+
+            return read_result(Path(result_dir), entry.get("run_id"))
+        try:
+            return json.loads((Path(result_dir) / "result.json").read_text())
+        except (OSError, ValueError):
+            return None
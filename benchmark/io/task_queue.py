@@ -0,0 +1,277 @@
+"""
+SQLite work queue of a distributed sweep (`--coordinator` / `--worker`).
+
+The coordinator inserts the sweep's `(seq, model, instance)` tasks together with its own
+command line; worker processes, on this host or on others sharing the filesystem, claim them
+one at a time. A claim is a lease: each worker's heartbeat thread extends the leases of the
+tasks it is running, for at most `TASK_TIMEOUT_SECONDS` per task, and a task whose lease ran
+out (its worker died, hung or overran the task timeout) can be claimed again, up to
+`MAX_ATTEMPTS` times. A finished task records where its result was persisted and gets
+the next `finish_order`, so the coordinator can follow completions incrementally.
+
+The database keeps SQLite's rollback journal instead of WAL, which needs shared memory and
+does not work across hosts; the shared filesystem must support POSIX locks (e.g. NFSv4).
+Leases compare wall-clock times, so the hosts' clocks must be synchronized.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from benchmark.io.task_ledger import FAILED_STAGES
+
+QUEUE_FILENAME = "queue.sqlite"
+LEASE_SECONDS = 120.0
+# a worker stops renewing the lease of a task that has been running this long
+TASK_TIMEOUT_SECONDS = 3600.0
+# a task is abandoned (recorded as failed) after its lease expired this many times
+MAX_ATTEMPTS = 3
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TaskQueue:
+    """Tasks, leases and worker heartbeats of one sweep; see the module docstring."""
+
+    def __init__(self, path: Path, create: bool = False):
+        self.path = Path(path)
+        if not create and not self.path.exists():
+            raise ValueError(f"No task queue at {self.path}")
+        self.local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " seq INTEGER PRIMARY KEY,"
+                " model TEXT NOT NULL, instance TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " worker TEXT, lease_until REAL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " stage TEXT, run_id TEXT, result_dir TEXT, backend TEXT, error TEXT,"
+                " finish_order INTEGER,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks(state)")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_finish_order ON tasks(finish_order)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS workers ("
+                " worker TEXT PRIMARY KEY,"
+                " started_at REAL NOT NULL, heartbeat_at REAL NOT NULL,"
+                " claimed INTEGER NOT NULL DEFAULT 0, finished INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            # autocommit; every write goes through `transaction`
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=DELETE")
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        # take the write lock up front, so two claims never pick the same task
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def set_meta(self, **values) -> None:
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v, default=str)) for k, v in values.items()],
+            )
+
+    def meta(self) -> Dict:
+        rows = self.connection().execute("SELECT key, value FROM meta").fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def enqueue(self, tasks: Iterable[Tuple[int, str, Path]]) -> None:
+        """Add tasks that are not queued yet and requeue failed ones; finished tasks are kept."""
+        now = time.time()
+        rows = [(seq, model, str(instance), now) for seq, model, instance in tasks]
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (seq, model, instance, state, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                rows,
+            )
+            conn.executemany(
+                "UPDATE tasks SET state = 'pending', worker = NULL, lease_until = NULL, attempts = 0,"
+                " finish_order = NULL, updated_at = ? WHERE seq = ? AND state = 'failed'",
+                [(now, seq) for seq, _, _, _ in rows],
+            )
+
+    def claim(self, worker: str, count: int, lease_seconds: float = LEASE_SECONDS) -> List[Tuple[int, str, Path]]:
+        """Lease up to `count` pending tasks (or tasks whose lease expired), lowest `seq` first."""
+        now = time.time()
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT seq, model, instance FROM tasks"
+                " WHERE state = 'pending' OR (state = 'leased' AND lease_until < ? AND attempts < ?)"
+                " ORDER BY seq LIMIT ?",
+                (now, MAX_ATTEMPTS, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,"
+                " updated_at = ? WHERE seq = ?",
+                [(worker, now + lease_seconds, now, seq) for seq, _, _ in rows],
+            )
+            conn.execute("UPDATE workers SET claimed = claimed + ? WHERE worker = ?", (len(rows), worker))
+        return [(seq, model, Path(instance)) for seq, model, instance in rows]
+
+    def register_worker(self, worker: str) -> None:
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker, started_at, heartbeat_at) VALUES (?, ?, ?)",
+                (worker, now, now),
+            )
+
+    def heartbeat(self, worker: str, seqs: Iterable[int], lease_seconds: float = LEASE_SECONDS) -> None:
+        """Extend the leases `worker` holds on the tasks `seqs` and mark the worker alive."""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE tasks SET lease_until = ? WHERE seq = ? AND worker = ? AND state = 'leased'",
+                [(now + lease_seconds, seq, worker) for seq in seqs],
+            )
+            conn.execute("UPDATE workers SET heartbeat_at = ? WHERE worker = ?", (now, worker))
+
+    def complete(
+        self, seq: int, worker: str, result: Dict, result_dir: Optional[Path], backend: str = "files"
+    ) -> bool:
+        """Record a finished task; False if its lease was lost to another worker meanwhile."""
+        stage = result.get("stage")
+        with self.transaction() as conn:
+            order = conn.execute("SELECT COALESCE(MAX(finish_order), 0) + 1 FROM tasks").fetchone()[0]
+            updated = conn.execute(
+                "UPDATE tasks SET state = ?, stage = ?, run_id = ?, result_dir = ?, backend = ?, error = ?,"
+                " finish_order = ?, lease_until = NULL, updated_at = ?"
+                " WHERE seq = ? AND worker = ? AND state = 'leased'",
+                (
+                    "failed" if stage in FAILED_STAGES else "done",
+                    stage,
+                    result.get("run_id"),
+                    str(result_dir) if result_dir else None,
+                    backend,
+                    result.get("error"),
+                    order,
+                    time.time(),
+                    seq,
+                    worker,
+                ),
+            ).rowcount
+            conn.execute("UPDATE workers SET finished = finished + ? WHERE worker = ?", (updated, worker))
+        return bool(updated)
+
+    def release(self, worker: str) -> None:
+        """Hand the tasks `worker` still holds back to the queue (on shutdown or cancellation)."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET state = 'pending', worker = NULL, lease_until = NULL,"
+                " attempts = MAX(attempts - 1, 0), updated_at = ? WHERE worker = ? AND state = 'leased'",
+                (time.time(), worker),
+            )
+
+    def abandon_expired(self) -> int:
+        """Mark tasks whose lease expired `MAX_ATTEMPTS` times as failed; returns how many."""
+        now = time.time()
+        with self.transaction() as conn:
+            expired = conn.execute(
+                "SELECT seq, worker FROM tasks WHERE state = 'leased' AND lease_until < ? AND attempts >= ? ORDER BY seq",
+                (now, MAX_ATTEMPTS),
+            ).fetchall()
+            order = conn.execute("SELECT COALESCE(MAX(finish_order), 0) FROM tasks").fetchone()[0]
+            conn.executemany(
+                "UPDATE tasks SET state = 'failed', stage = 'error', error = ?, finish_order = ?,"
+                " lease_until = NULL, updated_at = ? WHERE seq = ?",
+                [
+                    (f"lease expired {MAX_ATTEMPTS} times (last worker {worker})", order + i, now, seq)
+                    for i, (seq, worker) in enumerate(expired, start=1)
+                ],
+            )
+        return len(expired)
+
+    def finished(self, after: int = 0) -> List[Dict]:
+        """Finished tasks with `finish_order > after`, in completion order."""
+        conn = self.connection()
+        cursor = conn.execute("SELECT * FROM tasks WHERE finish_order > ? ORDER BY finish_order", (after,))
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self.connection().execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return dict(rows)
+
+    def unfinished(self) -> int:
+        counts = self.counts()
+        return counts.get("pending", 0) + counts.get("leased", 0)
+
+
+class Heartbeat:
+    """
+    Background thread renewing a worker's leases every quarter lease. Only tasks announced
+    with `started` and not yet `finished` are renewed, and only for `task_timeout` seconds:
+    the lease of a task that is stuck (or was never run) expires, so another worker retries it.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        worker: str,
+        lease_seconds: float = LEASE_SECONDS,
+        task_timeout: float = TASK_TIMEOUT_SECONDS,
+    ):
+        self.queue = queue
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.task_timeout = task_timeout
+        # seq -> when it started running
+        self.running: Dict[int, float] = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="queue-heartbeat", daemon=True)
+
+    def started(self, seq: int) -> None:
+        with self.lock:
+            self.running[seq] = time.monotonic()
+
+    def finished(self, seq: int) -> None:
+        with self.lock:
+            self.running.pop(seq, None)
+
+    def live_tasks(self) -> List[int]:
+        now = time.monotonic()
+        with self.lock:
+            return [seq for seq, started in self.running.items() if now - started < self.task_timeout]
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.lease_seconds / 4):
+            try:
+                self.queue.heartbeat(self.worker, self.live_tasks(), self.lease_seconds)
+            except sqlite3.Error:
+                # a busy or briefly unreachable queue; the next beat retries before the lease runs out
+                pass
+
+    def __enter__(self) -> "Heartbeat":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stopped.set()
+        self.thread.join()
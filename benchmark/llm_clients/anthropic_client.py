@@ -11,3 +11,6 @@ class AnthropicClient:
 
     def generate(self, prompt: str) -> Dict[str, Any]:
         return {"success": False, "error": "Anthropic client not implemented", "content": ""}
+
+    async def agenerate(self, prompt: str) -> Dict[str, Any]:
+        return self.generate(prompt)
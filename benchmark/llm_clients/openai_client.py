@@ -4,6 +4,10 @@ import time
 
 import openai
 
+from benchmark.llm_clients.rate_limiter import failure_info
+from benchmark.llm_clients.sessions import get_async_openai_client, get_openai_client
+from benchmark.llm_clients.streaming import DeltaCallback, StreamCollector
+
 
 class OpenAIClient:
     """
@@ -27,30 +31,108 @@ class OpenAIClient:
         key = api_key or os.getenv("OPENAI_API_KEY", "")
         if not key:
             raise ValueError("OPENAI_API_KEY not set")
-        # configure client
-        self.client = openai.OpenAI(api_key=key, base_url=base_url) if base_url else openai.OpenAI(api_key=key)
+        self.api_key = key
+        self.base_url = base_url
+        # SDK clients (and their connection pools) are shared across client instances
+        self.client = get_openai_client(key, base_url)
+
+    def request_kwargs(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        kwargs = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            **({"temperature": self.temperature} if self.temperature is not None else {}),
+            "max_completion_tokens": self.max_completion_tokens,
+            "stream": stream,
+        }
+        if stream:
+            kwargs["stream_options"] = {"include_usage": True}
+        return kwargs
+
+    @staticmethod
+    def collect_chunk(collector: StreamCollector, chunk) -> bool:
+        if chunk.usage is not None:
+            collector.usage = {
+                "prompt_tokens": chunk.usage.prompt_tokens,
+                "completion_tokens": chunk.usage.completion_tokens,
+            }
+        if not chunk.choices:
+            return True
+        choice = chunk.choices[0]
+        collector.finish_reason = choice.finish_reason or collector.finish_reason
+        return collector.add(choice.delta.content if choice.delta else None)
+
+    def success_result(self, resp, elapsed: float) -> Dict[str, Any]:
+        choice = resp.choices[0]
+        content = choice.message.content if hasattr(choice, "message") else choice["message"]["content"]
+        usage = resp.usage
+        return {
+            "success": True,
+            "content": content,
+            "completion_tokens": usage.completion_tokens if usage else None,
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "elapsed": elapsed,
+            "raw_response": resp.model_dump() if hasattr(resp, "model_dump") else resp,
+        }
+
+    def failure_result(self, e: Exception, elapsed: float) -> Dict[str, Any]:
+        response = getattr(e, "response", None)
+        return {
+            "success": False,
+            "error": str(e),
+            "content": "",
+            "elapsed": elapsed,
+            **failure_info(
+                getattr(e, "status_code", None),
+                response.headers if response is not None else None,
+                connection_error=isinstance(e, openai.APIConnectionError),
+            ),
+        }
 
     def generate(self, prompt: str) -> Dict[str, Any]:
         start = time.time()
         try:
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                **({"temperature": self.temperature} if self.temperature is not None else {}),
-                max_completion_tokens=self.max_completion_tokens,
-                stream=False,
-            )
-            elapsed = time.time() - start
-            choice = resp.choices[0]
-            content = choice.message.content if hasattr(choice, "message") else choice["message"]["content"]
-            usage = resp.usage
-            return {
-                "success": True,
-                "content": content,
-                "completion_tokens": usage.completion_tokens if usage else None,
-                "prompt_tokens": usage.prompt_tokens if usage else None,
-                "elapsed": elapsed,
-                "raw_response": resp.model_dump() if hasattr(resp, "model_dump") else resp,
-            }
+            resp = self.client.chat.completions.create(**self.request_kwargs(prompt))
+            return self.success_result(resp, time.time() - start)
+        except Exception as e:
+            return self.failure_result(e, time.time() - start)
+
+    async def agenerate(self, prompt: str) -> Dict[str, Any]:
+        """Async variant of `generate` on the shared per-loop AsyncOpenAI client."""
+        start = time.time()
+        try:
+            client = get_async_openai_client(self.api_key, self.base_url)
+            resp = await client.chat.completions.create(**self.request_kwargs(prompt))
+            return self.success_result(resp, time.time() - start)
+        except Exception as e:
+            return self.failure_result(e, time.time() - start)
+
+    def generate_stream(self, prompt: str, on_delta: Optional[DeltaCallback] = None) -> Dict[str, Any]:
+        """Streaming `generate`; `on_delta` sees each text delta and may abort by returning False."""
+        collector = StreamCollector(on_delta)
+        try:
+            stream = self.client.chat.completions.create(**self.request_kwargs(prompt, stream=True))
+            try:
+                for chunk in stream:
+                    if not self.collect_chunk(collector, chunk):
+                        break
+            finally:
+                stream.close()
+            return collector.result()
+        except Exception as e:
+            return self.failure_result(e, time.time() - collector.start)
+
+    async def agenerate_stream(self, prompt: str, on_delta: Optional[DeltaCallback] = None) -> Dict[str, Any]:
+        """Async variant of `generate_stream`."""
+        collector = StreamCollector(on_delta)
+        try:
+            client = get_async_openai_client(self.api_key, self.base_url)
+            stream = await client.chat.completions.create(**self.request_kwargs(prompt, stream=True))
+            try:
+                async for chunk in stream:
+                    if not self.collect_chunk(collector, chunk):
+                        break
+            finally:
+                await stream.close()
+            return collector.result()
         except Exception as e:
-            return {"success": False, "error": str(e), "content": "", "elapsed": time.time() - start}
+            return self.failure_result(e, time.time() - collector.start)
@@ -1,9 +1,14 @@
 import os
 import time
-from typing import Dict
+from typing import Dict, Optional
 
+import httpx
 import requests
 
+from benchmark.llm_clients.rate_limiter import failure_info
+from benchmark.llm_clients.sessions import REQUEST_TIMEOUT, get_async_http_client, get_session
+from benchmark.llm_clients.streaming import SSE_DONE, DeltaCallback, StreamCollector, sse_data
+
 
 class OpenRouterClient:
     """
@@ -17,59 +22,161 @@ class OpenRouterClient:
         temperature: float = 0.7,
         max_tokens: int | None = None,
         max_output_tokens: int | None = None,
+        base_url: str | None = None,
     ):
         self.model = model
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY", "")
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.max_output_tokens = max_output_tokens
-        self.endpoint = "https://openrouter.ai/api/v1/chat/completions"
+        base_url = base_url or os.getenv("OPENROUTER_BASE_URL") or "https://openrouter.ai/api/v1"
+        self.endpoint = f"{base_url.rstrip('/')}/chat/completions"
 
-    def generate(self, prompt: str) -> Dict:
-        if not self.api_key:
-            return {"success": False, "error": "OPENROUTER_API_KEY not set", "content": ""}
-        headers = {
+    def headers(self) -> Dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+
+    def payload(self, prompt: str, stream: bool = False) -> Dict:
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": self.temperature,
-            "stream": False,
+            "stream": stream,
         }
+        if stream:
+            # ask for token counts in the final chunk
+            payload["usage"] = {"include": True}
+            payload["stream_options"] = {"include_usage": True}
         if self.max_tokens is not None:
             payload["max_tokens"] = self.max_tokens
         if self.max_output_tokens is not None:
             payload["max_output_tokens"] = self.max_output_tokens
-        start = time.time()
+        return payload
+
+    def success_result(self, data: Dict, text: str, elapsed: float) -> Dict:
+        usage = data.get("usage", {})
         try:
-            resp = requests.post(self.endpoint, headers=headers, json=payload, timeout=120)
-            resp.raise_for_status()
-            data = resp.json()
-            elapsed = time.time() - start
-            content = ""
-            usage = data.get("usage", {})
+            content = data["choices"][0]["message"]["content"]
+        except Exception:
+            # fallback: store full response text for debugging
+            content = text
+        return {
+            "success": True,
+            "content": content,
+            "completion_tokens": usage.get("completion_tokens"),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "elapsed": elapsed,
+            "raw_response": data,
+        }
+
+    def failure_result(self, e: Exception, resp, elapsed: float) -> Dict:
+        err_text = ""
+        status_code, headers = None, None
+        if resp is not None:
+            status_code, headers = resp.status_code, resp.headers
             try:
-                content = data["choices"][0]["message"]["content"]
+                err_text = resp.text
             except Exception:
-                # fallback: store full response text for debugging
-                content = resp.text
-            return {
-                "success": True,
-                "content": content,
-                "completion_tokens": usage.get("completion_tokens"),
-                "prompt_tokens": usage.get("prompt_tokens"),
-                "elapsed": elapsed,
-                "raw_response": data,
-            }
+                err_text = ""
+        connection_error = isinstance(e, (requests.ConnectionError, requests.Timeout, httpx.TransportError))
+        return {
+            "success": False,
+            "error": str(e),
+            "elapsed": elapsed,
+            "content": err_text,
+            **failure_info(status_code, headers, connection_error=connection_error),
+        }
+
+    @staticmethod
+    def collect_event(collector: StreamCollector, line: str) -> bool:
+        """Handle one SSE line; returns False when the stream is finished or aborted."""
+        event = sse_data(line)
+        if event is SSE_DONE:
+            return False
+        if not isinstance(event, dict):
+            return True
+        if event.get("usage"):
+            collector.usage = event["usage"]
+        choices = event.get("choices") or []
+        if not choices:
+            return True
+        collector.finish_reason = choices[0].get("finish_reason") or collector.finish_reason
+        return collector.add((choices[0].get("delta") or {}).get("content"))
+
+    def generate(self, prompt: str) -> Dict:
+        if not self.api_key:
+            return {"success": False, "error": "OPENROUTER_API_KEY not set", "content": ""}
+        start = time.time()
+        resp = None
+        try:
+            resp = get_session("openrouter").post(
+                self.endpoint, headers=self.headers(), json=self.payload(prompt), timeout=REQUEST_TIMEOUT
+            )
+            resp.raise_for_status()
+            return self.success_result(resp.json(), resp.text, time.time() - start)
         except Exception as e:
             # Capture response text if available for debugging
-            elapsed = time.time() - start
-            err_text = ""
-            if "resp" in locals():
-                try:
-                    err_text = resp.text
-                except Exception:
-                    err_text = ""
-            return {"success": False, "error": str(e), "elapsed": elapsed, "content": err_text}
+            return self.failure_result(e, resp, time.time() - start)
+
+    async def agenerate(self, prompt: str) -> Dict:
+        """Async variant of `generate` on the shared per-loop HTTP client."""
+        if not self.api_key:
+            return {"success": False, "error": "OPENROUTER_API_KEY not set", "content": ""}
+        start = time.time()
+        resp = None
+        try:
+            resp = await get_async_http_client("openrouter").post(
+                self.endpoint, headers=self.headers(), json=self.payload(prompt)
+            )
+            resp.raise_for_status()
+            return self.success_result(resp.json(), resp.text, time.time() - start)
+        except Exception as e:
+            return self.failure_result(e, resp, time.time() - start)
+
+    def generate_stream(self, prompt: str, on_delta: Optional[DeltaCallback] = None) -> Dict:
+        """Streaming `generate`; `on_delta` sees each text delta and may abort by returning False."""
+        if not self.api_key:
+            return {"success": False, "error": "OPENROUTER_API_KEY not set", "content": ""}
+        collector = StreamCollector(on_delta)
+        resp = None
+        try:
+            resp = get_session("openrouter").post(
+                self.endpoint,
+                headers=self.headers(),
+                json=self.payload(prompt, stream=True),
+                timeout=REQUEST_TIMEOUT,
+                stream=True,
+            )
+            resp.raise_for_status()
+            with resp:
+                # SSE is UTF-8; without a charset in Content-Type requests would decode ISO-8859-1
+                resp.encoding = "utf-8"
+                for line in resp.iter_lines(decode_unicode=True):
+                    if line and not self.collect_event(collector, line):
+                        break
+            return collector.result()
+        except Exception as e:
+            return self.failure_result(e, resp, time.time() - collector.start)
+
+    async def agenerate_stream(self, prompt: str, on_delta: Optional[DeltaCallback] = None) -> Dict:
+        """Async variant of `generate_stream`."""
+        if not self.api_key:
+            return {"success": False, "error": "OPENROUTER_API_KEY not set", "content": ""}
+        collector = StreamCollector(on_delta)
+        resp = None
+        try:
+            request = get_async_http_client("openrouter").stream(
+                "POST", self.endpoint, headers=self.headers(), json=self.payload(prompt, stream=True)
+            )
+            async with request as resp:
+                if resp.is_error:
+                    await resp.aread()
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if line and not self.collect_event(collector, line):
+                        break
+            return collector.result()
+        except Exception as e:
+            return self.failure_result(e, resp, time.time() - collector.start)
@@ -0,0 +1,291 @@
+"""
+Client-side rate limiting, retries and adaptive concurrency for LLM calls.
+
+One `ProviderLimiter` exists per (provider, model) in a process. It combines token buckets
+for requests/min and tokens/min, jittered exponential backoff for retriable failures (429,
+5xx, connection errors) and an AIMD controller that halves the in-flight limit on a 429 and
+grows it by one per window of successes.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_OUTPUT_TOKENS = 1024
+# bucket capacity in seconds of refill; providers enforce per-minute limits over shorter windows
+BURST_SECONDS = 10
+
+
+def is_retriable_status(status_code: Optional[int]) -> bool:
+    return status_code == 429 or (status_code is not None and 500 <= status_code < 600)
+
+
+def parse_retry_after(value) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def failure_info(status_code: Optional[int], headers=None, connection_error: bool = False) -> Dict:
+    """Fields added to a client's failure result so the limiter can decide whether to retry."""
+    return {
+        "status_code": status_code,
+        "retriable": connection_error or is_retriable_status(status_code),
+        "retry_after": parse_retry_after((headers or {}).get("retry-after")),
+    }
+
+
+def estimate_tokens(prompt: str, max_output_tokens: Optional[int]) -> int:
+    # providers count prompt + requested completion against the tokens/min budget
+    return len(prompt) // 4 + (max_output_tokens or DEFAULT_OUTPUT_TOKENS)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate * BURST_SECONDS)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` now (the level may go negative) and return how long to wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def refund(self, amount: float) -> None:
+        with self.lock:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class AimdController:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight requests.
+
+    Starts at `initial` (unbounded when None). A throttle sets the limit to `decrease` times
+    the current in-flight count (at least `minimum`); each success adds `1 / limit`, so the
+    limit grows by one per window of successful requests, up to `maximum`. Throttles from
+    requests started before the last decrease belong to the same burst and are ignored.
+    """
+
+    def __init__(
+        self,
+        initial: Optional[float] = None,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        decrease: float = 0.5,
+    ):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.in_flight = 0
+        self.last_decrease = float("-inf")
+        self.cond = threading.Condition()
+        self.async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def has_slot(self) -> bool:
+        return self.limit is None or self.in_flight < int(self.limit)
+
+    def acquire(self) -> None:
+        with self.cond:
+            while not self.has_slot():
+                self.cond.wait()
+            self.in_flight += 1
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.cond:
+                if self.has_slot():
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self.async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self) -> None:
+        with self.cond:
+            self.in_flight -= 1
+            self.wake()
+
+    def wake(self) -> None:
+        # called with self.cond held; async waiters re-check the limit when resumed
+        self.cond.notify_all()
+        waiters, self.async_waiters = self.async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(lambda w=waiter: w.done() or w.set_result(None))
+
+    def on_success(self) -> None:
+        with self.cond:
+            if self.limit is None:
+                return
+            self.limit += 1.0 / max(1.0, self.limit)
+            if self.maximum is not None:
+                self.limit = min(self.limit, float(self.maximum))
+            self.wake()
+
+    def on_throttle(self, started: float) -> None:
+        with self.cond:
+            if started < self.last_decrease:
+                return
+            self.last_decrease = time.monotonic()
+            current = self.limit if self.limit is not None else self.in_flight
+            self.limit = max(float(self.minimum), min(current, self.in_flight) * self.decrease)
+
+
+class ProviderLimiter:
+    """Rate limits, retry policy and concurrency control for one provider/model."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        adaptive_concurrency: bool = True,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AimdController(initial=max_concurrency, maximum=max_concurrency) if (
+            adaptive_concurrency or max_concurrency
+        ) else None
+        self.adaptive = adaptive_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def admission_delay(self, estimated_tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(estimated_tokens))
+        return delay
+
+    def settle_tokens(self, estimated_tokens: int, result: Dict) -> None:
+        """Give back the part of the token estimate the provider did not actually bill."""
+        if self.tokens is None:
+            return
+        used = (result.get("prompt_tokens") or 0) + (result.get("completion_tokens") or 0)
+        if used and used < estimated_tokens:
+            self.tokens.refund(estimated_tokens - used)
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2**attempt))
+        # full jitter spreads retries of concurrent requests that failed together
+        delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def on_outcome(self, result: Dict, started: float) -> None:
+        if self.concurrency is None or not self.adaptive:
+            return
+        if result.get("success"):
+            self.concurrency.on_success()
+        elif result.get("status_code") == 429:
+            self.concurrency.on_throttle(started)
+
+    def should_retry(self, result: Dict, attempt: int) -> bool:
+        return not result.get("success") and result.get("retriable", False) and attempt < self.max_retries
+
+    def call(self, fn: Callable[[], Dict], estimated_tokens: int) -> Dict:
+        waited = 0.0
+        attempt = 0
+        while True:
+            delay = self.admission_delay(estimated_tokens)
+            if delay:
+                time.sleep(delay)
+                waited += delay
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+            started = time.monotonic()
+            try:
+                result = fn()
+                # while the slot is still held, so a 429 sees the in-flight count it competed with
+                self.on_outcome(result, started)
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+            self.settle_tokens(estimated_tokens, result)
+            if not self.should_retry(result, attempt):
+                return self.annotate(result, attempt, waited)
+            delay = self.backoff(attempt, result.get("retry_after"))
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Dict]], estimated_tokens: int) -> Dict:
+        waited = 0.0
+        attempt = 0
+        while True:
+            delay = self.admission_delay(estimated_tokens)
+            if delay:
+                await asyncio.sleep(delay)
+                waited += delay
+            if self.concurrency is not None:
+                await self.concurrency.aacquire()
+            started = time.monotonic()
+            try:
+                result = await fn()
+                # while the slot is still held, so a 429 sees the in-flight count it competed with
+                self.on_outcome(result, started)
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+            self.settle_tokens(estimated_tokens, result)
+            if not self.should_retry(result, attempt):
+                return self.annotate(result, attempt, waited)
+            delay = self.backoff(attempt, result.get("retry_after"))
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    @staticmethod
+    def annotate(result: Dict, attempt: int, waited: float) -> Dict:
+        result["attempts"] = attempt + 1
+        result["rate_limit_wait"] = waited
+        return result
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def resolve_rate_limits(rate_limits: Dict[str, Dict], provider: str, model: str) -> Dict[str, Any]:
+    """Merge `default` < `<provider>` < `<provider>/<model>` entries of `llm.rate_limits`."""
+    merged: Dict[str, Any] = {}
+    for key in ("default", provider, f"{provider}/{model}"):
+        merged.update({k: v for k, v in (rate_limits.get(key) or {}).items() if v is not None})
+    return merged
+
+
+def get_limiter(provider: str, model: str, llm_cfg=None) -> ProviderLimiter:
+    """Process-wide limiter per (provider, model), built from `llm_cfg` on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get((provider, model))
+        if limiter is None:
+            limits = resolve_rate_limits(llm_cfg.rate_limits if llm_cfg else {}, provider, model)
+            limiter = ProviderLimiter(
+                requests_per_minute=limits.get("requests_per_minute"),
+                tokens_per_minute=limits.get("tokens_per_minute"),
+                max_concurrency=limits.get("max_concurrency"),
+                adaptive_concurrency=limits.get("adaptive_concurrency", True),
+                max_retries=llm_cfg.max_retries if llm_cfg else 5,
+                backoff_base=llm_cfg.retry_backoff_base if llm_cfg else 1.0,
+                backoff_max=llm_cfg.retry_backoff_max if llm_cfg else 60.0,
+            )
+            _limiters[(provider, model)] = limiter
+        return limiter
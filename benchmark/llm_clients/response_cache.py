@@ -0,0 +1,145 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_MODES = ("off", "read", "write", "readwrite")
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def response_cache_key(
+    prompt_sha256: str,
+    provider: str,
+    model: str,
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    max_output_tokens: Optional[int],
+    sample_index: int = 0,
+) -> str:
+    """
+    Content address of an LLM call: the prompt's hash plus everything that affects decoding.
+
+    `sample_index` distinguishes repeated runs of the same prompt, so `runs_per_instance`
+    replays N distinct samples instead of one response N times.
+    """
+    material = {
+        "prompt_sha256": prompt_sha256,
+        "provider": provider,
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "max_output_tokens": max_output_tokens,
+        "sample_index": sample_index,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent SQLite store of successful LLM responses.
+
+    Entries expire after `ttl_seconds` (if set); when more than `max_entries` are stored the
+    least recently used ones are evicted. Hit/miss/write counters are kept per process.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " provider TEXT, model TEXT,"
+                " result TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self.connection() as conn:
+            row = conn.execute("SELECT result, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and row[1] < now - self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        with self.lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, result: Dict, provider: str, model: str) -> None:
+        now = time.time()
+        payload = json.dumps(result, default=str)
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, result, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, payload, now, now),
+            )
+            if self.max_entries is not None:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        with self.lock:
+            self.writes += 1
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(
+    path: Path, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None
+) -> ResponseCache:
+    """Process-wide cache per path, so counters aggregate across ExperimentRunner instances."""
+    key = str(Path(path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResponseCache(Path(path), ttl_seconds=ttl_seconds, max_entries=max_entries)
+            _caches[key] = cache
+        return cache
+
+
+def all_cache_stats() -> Dict[str, Dict]:
+    with _caches_lock:
+        return {path: cache.stats() for path, cache in _caches.items()}
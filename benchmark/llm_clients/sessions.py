@@ -0,0 +1,93 @@
+"""
+Process-wide HTTP sessions shared by all LLM clients.
+
+A new client object is created per ExperimentRunner, but connections are pooled here so
+every call to a provider reuses the same TLS connections. Async clients are bound to the
+event loop that created them and are cached per loop.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = 64
+REQUEST_TIMEOUT = 120
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_openai_clients: Dict[Tuple, openai.OpenAI] = {}
+_async_clients: Dict[Tuple, object] = {}
+
+
+def get_session(provider: str) -> requests.Session:
+    """Shared `requests` session (one connection pool per provider)."""
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+        return session
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None) -> openai.OpenAI:
+    """Shared synchronous OpenAI SDK client per (api_key, base_url)."""
+    key = (api_key, base_url)
+    with _lock:
+        client = _openai_clients.get(key)
+        if client is None:
+            # retries are handled by the rate limiter, not the SDK
+            kwargs = {"api_key": api_key, "max_retries": 0}
+            if base_url:
+                kwargs["base_url"] = base_url
+            client = openai.OpenAI(**kwargs)
+            _openai_clients[key] = client
+        return client
+
+
+def _limits() -> httpx.Limits:
+    # concurrency is bounded by the scheduler, so don't cap connections here
+    return httpx.Limits(max_connections=None, max_keepalive_connections=POOL_SIZE)
+
+
+def get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Shared `httpx.AsyncClient` for `provider` on the running event loop."""
+    key = (id(asyncio.get_running_loop()), "http", provider)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(limits=_limits(), timeout=REQUEST_TIMEOUT)
+            _async_clients[key] = client
+        return client
+
+
+def get_async_openai_client(api_key: str, base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+    """Shared `openai.AsyncOpenAI` client per (api_key, base_url) on the running event loop."""
+    key = (id(asyncio.get_running_loop()), "openai", api_key, base_url)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(limits=_limits(), timeout=REQUEST_TIMEOUT)
+            kwargs = {"api_key": api_key, "http_client": http_client, "max_retries": 0}
+            if base_url:
+                kwargs["base_url"] = base_url
+            client = openai.AsyncOpenAI(**kwargs)
+            _async_clients[key] = client
+        return client
+
+
+async def aclose_async_clients() -> None:
+    """Close the async clients of the running loop; call before the loop shuts down."""
+    loop_id = id(asyncio.get_running_loop())
+    with _lock:
+        keys = [k for k in _async_clients if k[0] == loop_id]
+        clients = [_async_clients.pop(k) for k in keys]
+    for client in clients:
+        await (client.aclose() if isinstance(client, httpx.AsyncClient) else client.close())
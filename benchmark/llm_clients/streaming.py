@@ -0,0 +1,67 @@
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+# callback receiving each streamed text delta; returning False aborts the stream
+DeltaCallback = Callable[[str], bool]
+
+SSE_DONE = object()
+
+
+def sse_data(line: str):
+    """Decode one server-sent-events line: a JSON payload, `SSE_DONE`, or None for anything else."""
+    if not line.startswith("data:"):
+        return None
+    payload = line[len("data:") :].strip()
+    if payload == "[DONE]":
+        return SSE_DONE
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+class StreamCollector:
+    """Accumulates streamed deltas, forwards them to `on_delta` and times the stream."""
+
+    def __init__(self, on_delta: Optional[DeltaCallback] = None):
+        self.on_delta = on_delta
+        self.start = time.time()
+        self.first_token_at: Optional[float] = None
+        self.parts: List[str] = []
+        self.chunks = 0
+        self.aborted = False
+        self.usage: Dict = {}
+        self.finish_reason: Optional[str] = None
+
+    def add(self, delta: Optional[str]) -> bool:
+        """Record a delta; returns False once the consumer asked to stop."""
+        if not delta:
+            return True
+        if self.first_token_at is None:
+            self.first_token_at = time.time()
+        self.parts.append(delta)
+        self.chunks += 1
+        if self.on_delta is not None and not self.on_delta(delta):
+            self.aborted = True
+            return False
+        return True
+
+    def result(self) -> Dict:
+        end = time.time()
+        completion_tokens = self.usage.get("completion_tokens")
+        generating = end - self.first_token_at if self.first_token_at is not None else None
+        # without usage (e.g. aborted streams) each content chunk approximates one token
+        tokens = completion_tokens if completion_tokens is not None else self.chunks
+        return {
+            "success": True,
+            "content": "".join(self.parts),
+            "completion_tokens": completion_tokens,
+            "prompt_tokens": self.usage.get("prompt_tokens"),
+            "elapsed": end - self.start,
+            "time_to_first_token": self.first_token_at - self.start if self.first_token_at is not None else None,
+            "tokens_per_sec": tokens / generating if generating else None,
+            "stream_chunks": self.chunks,
+            "aborted": self.aborted,
+            "raw_response": {"streamed": True, "usage": self.usage, "finish_reason": self.finish_reason},
+        }
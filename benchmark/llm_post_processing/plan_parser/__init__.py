@@ -1,3 +1,4 @@
 from .get_plan_parser import get_plan_parser
+from .stream_parser import StreamingPlanMonitor
 
-__all__ = ["get_plan_parser"]
+__all__ = ["get_plan_parser", "StreamingPlanMonitor"]
@@ -1,11 +1,15 @@
+import copy
 import json
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 
 from benchmark.asp.action_utils import ActionMapper
+from benchmark.instrumentation import span
 from benchmark.llm_post_processing.constraint_builder import get_constraint_builder
 
+from .symbol_index import get_symbol_index
+
 
 class BasePlanParser:
     def __init__(self, domain: str, domain_dir: Path, instance_dir: Path):
@@ -21,30 +25,11 @@ class BasePlanParser:
         self.load_symbols()
 
     def load_symbols(self):
-        def extract_atoms(path: Path, predicate: str) -> Set[str]:
-            atoms: Set[str] = set()
-            if not path.exists():
-                return atoms
-            pattern = re.compile(rf"{predicate}\(\s*([^)]+?)\s*\)\s*\.")
-            for line in path.read_text().splitlines():
-                if ":-" in line:
-                    continue
-                m = pattern.search(line)
-                if m:
-                    for chunk in m.group(1).split(";"):
-                        atoms.add(chunk.strip())
-            return atoms
-
-        constraints_dir = self.domain_dir / "constraints"
-        for path in [
-            constraints_dir / "domain.lp",
-            self.instance_dir / "instance.lp",
-            self.instance_dir / "init.lp",
-            self.instance_dir / "instance_init.lp",
-        ]:
-            self.valid_characters |= extract_atoms(path, "character")
-            self.valid_places |= extract_atoms(path, "place") or extract_atoms(path, "location")
-            self.valid_objects |= extract_atoms(path, "object")
+        # shared per-instance index: scanned once, then served from memory or its sidecar
+        self.symbols = get_symbol_index(self.domain_dir, self.instance_dir)
+        self.valid_characters |= self.symbols["characters"]
+        self.valid_places |= self.symbols["places"]
+        self.valid_objects |= self.symbols["objects"]
         # allow domain-specific alias setup
         self.aliases.update(self.build_aliases())
 
@@ -102,7 +87,16 @@ class BasePlanParser:
         result["actions"] = actions
         return result
 
+    def check_streamed_action(self, item) -> Optional[str]:
+        """Validate one action as it arrives from a stream; returns an error message or None."""
+        validation = self.validate_action(copy.deepcopy(item))
+        return None if validation is True else validation["message"]
+
     def extract_json(self, text: str) -> str:
+        with span("extract_json"):
+            return self.find_json(text)
+
+    def find_json(self, text: str) -> str:
         try:
             json.loads(text)
             return text
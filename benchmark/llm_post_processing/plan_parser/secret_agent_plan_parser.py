@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 from pathlib import Path
@@ -47,6 +48,10 @@ class SecretAgentPlanParser(BasePlanParser):
         result["actions"] = actions
         return result
 
+    def check_streamed_action(self, item):
+        ok, _, error = self.parse_action(copy.deepcopy(item))
+        return None if ok else error
+
     def parse_action_id(self, value):
         if isinstance(value, int):
             mapping = {1: "move", 2: "move_through_guards", 3: "pickup", 4: "kill"}
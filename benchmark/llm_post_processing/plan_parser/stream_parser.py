@@ -0,0 +1,115 @@
+import json
+from typing import Dict, List, Optional
+
+from .base_plan_parser import BasePlanParser
+
+
+class JsonArrayScanner:
+    """
+    Incremental scanner over streamed LLM text.
+
+    Skips any preamble up to the first `[`, then returns the raw text of each top-level array
+    element as soon as it closes. Text after the closing `]` is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.closed = False
+        self.preamble_chars = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.element: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        elements: List[str] = []
+        for ch in text:
+            if self.closed:
+                break
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+                else:
+                    self.preamble_chars += 1
+                continue
+            if self.in_string:
+                self.element.append(ch)
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+            if ch == '"':
+                self.in_string = True
+            elif ch in "[{":
+                self.depth += 1
+            elif ch in "]}":
+                if self.depth == 0 and ch == "]":
+                    self.flush(elements)
+                    self.closed = True
+                    continue
+                self.depth -= 1
+                if self.depth == 0:
+                    self.element.append(ch)
+                    self.flush(elements)
+                    continue
+            elif ch == "," and self.depth == 0:
+                self.flush(elements)
+                continue
+            self.element.append(ch)
+        return elements
+
+    def flush(self, elements: List[str]) -> None:
+        text = "".join(self.element).strip()
+        self.element = []
+        if text:
+            elements.append(text)
+
+
+class StreamingPlanMonitor:
+    """
+    Feeds streamed text through a `JsonArrayScanner` and checks each closed action with the
+    domain parser, so a response that breaks the output format can be cut short.
+
+    `feed(delta)` returns False once the stream should be aborted (only when
+    `abort_on_format_error` is set); the full response is still parsed normally afterwards.
+    """
+
+    def __init__(self, parser: BasePlanParser, abort_on_format_error: bool = True, max_preamble_chars: int = 2000):
+        self.parser = parser
+        self.abort_on_format_error = abort_on_format_error
+        self.max_preamble_chars = max_preamble_chars
+        self.scanner = JsonArrayScanner()
+        self.actions = 0
+        self.error: Optional[str] = None
+
+    def feed(self, delta: str) -> bool:
+        if self.error is None:
+            for element in self.scanner.feed(delta):
+                self.check(element)
+                if self.error is not None:
+                    break
+            if not self.scanner.started and self.scanner.preamble_chars > self.max_preamble_chars:
+                self.error = f"no JSON array within the first {self.max_preamble_chars} characters"
+        return self.error is None or not self.abort_on_format_error
+
+    def check(self, element: str) -> None:
+        try:
+            item = json.loads(element)
+        except ValueError as e:
+            self.error = f"Action {self.actions}: invalid JSON ({e})"
+            return
+        error = self.parser.check_streamed_action(item)
+        if error:
+            self.error = f"Action {self.actions}: {error}"
+            return
+        self.actions += 1
+
+    def summary(self) -> Dict:
+        return {
+            "streamed_actions": self.actions,
+            "array_closed": self.scanner.closed,
+            "format_error": self.error,
+        }
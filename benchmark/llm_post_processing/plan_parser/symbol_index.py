@@ -0,0 +1,124 @@
+"""
+Per-instance symbol index shared by the plan parsers.
+
+The index (characters, places, objects, roles, map places) is extracted once
+per (domain_dir, instance_dir) and kept in memory for the life of the process. It is also
+persisted as a small JSON sidecar under `.cache/symbol_index/`, so new processes skip the
+scan. Both copies are keyed by the (mtime, size) of every source file and rebuilt when
+any of them changes.
+"""
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from benchmark.io.file_cache import fingerprint, read_json, write_json
+
+INDEX_VERSION = 2
+SIDECAR_DIR = Path(".cache") / "symbol_index"
+
+_index: Dict[Tuple[str, str], Tuple[List, Dict[str, FrozenSet]]] = {}
+_index_lock = threading.Lock()
+
+ROLE_PATTERN = re.compile(r"role\(\s*([^\s,()]+)")
+MAP_LOCATION_PATTERN = re.compile(r"location\s+([A-Za-z0-9_]+)")
+
+
+def atom_pattern(predicate: str) -> re.Pattern:
+    return re.compile(rf"{predicate}\(\s*([^)]+?)\s*\)\s*\.")
+
+
+ATOM_PATTERNS = {p: atom_pattern(p) for p in ("character", "place", "location", "object")}
+
+
+def source_files(domain_dir: Path, instance_dir: Path) -> List[Path]:
+    return [
+        domain_dir / "constraints" / "domain.lp",
+        instance_dir / "instance.lp",
+        instance_dir / "init.lp",
+        instance_dir / "instance_init.lp",
+        domain_dir / "prompts" / "2map.txt",
+    ]
+
+
+def extract_atoms(lines: List[str], predicate: str) -> set:
+    """Arguments of `predicate/1` facts (one per line; `;`-pools split, rules skipped)."""
+    atoms = set()
+    pattern = ATOM_PATTERNS[predicate]
+    for line in lines:
+        if ":-" in line:
+            continue
+        m = pattern.search(line)
+        if m:
+            for chunk in m.group(1).split(";"):
+                atoms.add(chunk.strip())
+    return atoms
+
+
+def build_symbol_index(domain_dir: Path, instance_dir: Path) -> Dict[str, List]:
+    """Scan the domain and instance files once and return every symbol class the parsers use."""
+    characters, places, objects, roles, map_places = set(), set(), set(), set(), set()
+    domain_lp, instance_lp, init_lp, instance_init_lp, map_txt = source_files(domain_dir, instance_dir)
+    for path in (domain_lp, instance_lp, init_lp, instance_init_lp):
+        if not path.exists():
+            continue
+        lines = path.read_text().splitlines()
+        characters |= extract_atoms(lines, "character")
+        places |= extract_atoms(lines, "place") or extract_atoms(lines, "location")
+        objects |= extract_atoms(lines, "object")
+        if path == instance_lp:
+            for line in lines:
+                m = ROLE_PATTERN.search(line)
+                if m:
+                    roles.add(m.group(1).strip())
+    if map_txt.exists():
+        for line in map_txt.read_text().splitlines():
+            map_places.update(m.group(1) for m in MAP_LOCATION_PATTERN.finditer(line))
+    return {
+        "characters": sorted(characters),
+        "places": sorted(places),
+        "objects": sorted(objects),
+        "roles": sorted(roles),
+        "map_places": sorted(map_places),
+    }
+
+
+def sidecar_path(domain_dir: Path, instance_dir: Path) -> Path:
+    key = f"{domain_dir.resolve()}|{instance_dir.resolve()}"
+    return SIDECAR_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def read_sidecar(path: Path, stamps: List) -> Optional[Dict[str, List]]:
+    data = read_json(path) or {}
+    if data.get("version") != INDEX_VERSION or data.get("sources") != stamps:
+        return None
+    return data.get("symbols")
+
+
+def write_sidecar(path: Path, stamps: List, symbols: Dict[str, List]) -> None:
+    write_json(path, {"version": INDEX_VERSION, "sources": stamps, "symbols": symbols})
+
+
+def freeze(symbols: Dict[str, List]) -> Dict[str, FrozenSet]:
+    return {k: frozenset(v) for k, v in symbols.items()}
+
+
+def get_symbol_index(domain_dir: Path, instance_dir: Path) -> Dict[str, FrozenSet]:
+    """Symbol index for an instance: in-memory hit, else sidecar, else a fresh scan."""
+    key = (str(domain_dir), str(instance_dir))
+    stamps = fingerprint(source_files(domain_dir, instance_dir))
+    with _index_lock:
+        cached = _index.get(key)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+    sidecar = sidecar_path(domain_dir, instance_dir)
+    symbols = read_sidecar(sidecar, stamps)
+    if symbols is None:
+        symbols = build_symbol_index(domain_dir, instance_dir)
+        write_sidecar(sidecar, stamps, symbols)
+    frozen = freeze(symbols)
+    with _index_lock:
+        _index[key] = (stamps, frozen)
+    return frozen
@@ -12,31 +12,8 @@ class WesternPlanParser(BasePlanParser):
 
     def load_symbols(self):
         super().load_symbols()
-        # additionally parse map locations from domains-based western prompts if available
-        try:
-            map_path = self.domain_dir / "prompts" / "2map.txt"
-            if map_path.exists():
-                import re
-
-                locs = set()
-                for line in map_path.read_text().splitlines():
-                    for m in re.finditer(r"location\s+([A-Za-z0-9_]+)", line):
-                        locs.add(m.group(1))
-                self.valid_places |= locs
-        except Exception:
-            pass
-        # also pull characters explicitly declared in instance.lp via character/1
-        inst_path = self.instance_dir / "instance.lp"
-        if inst_path.exists():
-            try:
-                pattern = re.compile(r"character\(\s*([^)]+?)\s*\)\s*\.")
-                for line in inst_path.read_text().splitlines():
-                    m = pattern.search(line)
-                    if m:
-                        for chunk in m.group(1).split(";"):
-                            self.valid_characters.add(chunk.strip())
-            except Exception:
-                pass
+        # additionally accept map locations from domains-based western prompts if available
+        self.valid_places |= self.symbols["map_places"]
 
     def fill_params(self, aid: int, params: List[str], subj: str) -> List[str]:
         out = params[:]
@@ -1,3 +1,4 @@
 from .prompt_builder import get_prompt_builder
+from .prompt_cache import get_prompt, precompute_prompts
 
-__all__ = ["get_prompt_builder"]
+__all__ = ["get_prompt_builder", "get_prompt", "precompute_prompts"]
@@ -1,10 +1,17 @@
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from benchmark.prompt_builders.base_prompt_builder import BasePromptBuilder
 
 
 class AladdinPromptBuilder(BasePromptBuilder):
+    def source_files(self, base_dir: Path, instance_dir: Optional[Path] = None) -> List[Path]:
+        if instance_dir:
+            loyalty_path = instance_dir / "loyalty.txt"
+        else:
+            loyalty_path = base_dir / self.domain / self.asp_version / "prompts" / "loyalty.txt"
+        return super().source_files(base_dir, instance_dir) + [loyalty_path]
+
     def build_prompt(self, base_dir: Path, instance_dir: Optional[Path] = None) -> str:
         loyalty_text = ""
         if instance_dir:
@@ -1,14 +1,24 @@
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 class BasePromptBuilder:
     """Simple prompt builder with domain-specific augmentation hooks."""
 
+    # bump when a builder's output changes for the same inputs, to invalidate cached prompts
+    VERSION = 1
+
     def __init__(self, domain: str, asp_version: str = "original"):
         self.domain = domain
         self.asp_version = asp_version
 
+    def source_files(self, base_dir: Path, instance_dir: Optional[Path] = None) -> List[Path]:
+        """Files `build_prompt` may read; used to invalidate memoized prompts."""
+        return [
+            base_dir / self.domain / self.asp_version / "prompts" / "prompt.txt",
+            base_dir / self.domain / "base" / "prompts" / "prompt.txt",
+        ]
+
     def build_prompt(self, base_dir: Path, instance_dir: Optional[Path] = None) -> str:
         prompt_path = base_dir / self.domain / self.asp_version / "prompts" / "prompt.txt"
         if prompt_path.exists():
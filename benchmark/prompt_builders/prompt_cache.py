@@ -0,0 +1,86 @@
+"""
+Memoized prompt construction.
+
+A prompt depends only on (domain, asp_version, instance, builder version) and the files the
+builder reads, so it is built once and shared by every model and run of an instance. Prompts
+are kept in memory and persisted under `.cache/prompts/`; both copies are invalidated when
+any source file's (mtime, size) changes. `prompt_sha256` is the prompt's content hash and is
+reused as the prompt part of the LLM response cache key.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from benchmark.io.file_cache import fingerprint, read_json, write_json
+from benchmark.prompt_builders.base_prompt_builder import BasePromptBuilder
+from benchmark.prompt_builders.prompt_builder import get_prompt_builder
+
+PROMPT_CACHE_DIR = Path(".cache") / "prompts"
+
+_prompts: Dict[str, Tuple[List, str, str]] = {}
+_prompts_lock = threading.Lock()
+
+
+def prompt_cache_key(builder: BasePromptBuilder, instance_dir: Optional[Path]) -> str:
+    instance = str(instance_dir.resolve()) if instance_dir else ""
+    material = f"{builder.domain}|{builder.asp_version}|{instance}|{type(builder).__name__}|{builder.VERSION}"
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+
+def read_cached(path: Path, stamps: List) -> Optional[Tuple[str, str]]:
+    data = read_json(path) or {}
+    if data.get("sources") != stamps:
+        return None
+    return data["prompt"], data["prompt_sha256"]
+
+
+def get_prompt(builder: BasePromptBuilder, base_dir: Path, instance_dir: Optional[Path]) -> Tuple[str, str]:
+    """Return `(prompt, prompt_sha256)`, building the prompt only on a cache miss."""
+    key = prompt_cache_key(builder, instance_dir)
+    stamps = fingerprint(builder.source_files(base_dir, instance_dir))
+    with _prompts_lock:
+        cached = _prompts.get(key)
+    if cached is not None and cached[0] == stamps:
+        return cached[1], cached[2]
+    path = PROMPT_CACHE_DIR / f"{key}.json"
+    hit = read_cached(path, stamps)
+    if hit is None:
+        prompt = builder.build_prompt(base_dir, instance_dir)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        write_json(path, {"sources": stamps, "prompt": prompt, "prompt_sha256": digest})
+        hit = (prompt, digest)
+    with _prompts_lock:
+        _prompts[key] = (stamps, *hit)
+    return hit
+
+
+def precompute_one(spec: Tuple[str, str, Path, Optional[Path]]) -> Tuple[Tuple, str, str]:
+    domain, asp_version, base_dir, instance_dir = spec
+    return spec, *get_prompt(get_prompt_builder(domain, asp_version), base_dir, instance_dir)
+
+
+def precompute_prompts(specs: Iterable[Tuple[str, str, Path, Optional[Path]]], workers: Optional[int] = None) -> int:
+    """
+    Materialize the prompts for `(domain, asp_version, base_dir, instance_dir)` specs up front
+    on a process pool, then load them into this process's cache. Returns the number built.
+    """
+    unique = list(dict.fromkeys(specs))
+    if not unique:
+        return 0
+    workers = max(1, min(len(unique), workers or os.cpu_count() or 1))
+    if workers == 1:
+        results = [precompute_one(spec) for spec in unique]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(precompute_one, unique, chunksize=max(1, len(unique) // (workers * 4))))
+    for (domain, asp_version, base_dir, instance_dir), prompt, digest in results:
+        builder = get_prompt_builder(domain, asp_version)
+        stamps = fingerprint(builder.source_files(base_dir, instance_dir))
+        with _prompts_lock:
+            _prompts[prompt_cache_key(builder, instance_dir)] = (stamps, prompt, digest)
+    return len(results)
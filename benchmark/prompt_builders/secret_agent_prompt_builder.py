@@ -11,6 +11,9 @@ class SecretAgentPromptBuilder(BasePromptBuilder):
     - No fallback: missing matrix.txt will raise an error.
     """
 
+    def source_files(self, base_dir: Path, instance_dir: Optional[Path] = None) -> List[Path]:
+        return [instance_dir / "matrix.txt"] if instance_dir else []
+
     def build_prompt(self, base_dir: Path, instance_dir: Optional[Path] = None) -> str:
         if not instance_dir:
             raise ValueError("SecretAgentPromptBuilder requires an instance_dir with matrix.txt")
@@ -5,6 +5,13 @@ from benchmark.prompt_builders.base_prompt_builder import BasePromptBuilder
 
 
 class WesternPromptBuilder(BasePromptBuilder):
+    PROMPT_FILES = ["intro.txt", "2map.txt", "3term_definitions.txt", "4instructions.txt", "prompt.txt"]
+
+    def source_files(self, base_dir: Path, instance_dir: Optional[Path] = None) -> List[Path]:
+        prompt_dir = base_dir / "western" / self.asp_version / "prompts"
+        files = [prompt_dir / name for name in self.PROMPT_FILES]
+        return ([instance_dir / "intro.txt"] if instance_dir else []) + files
+
     def build_prompt(self, base_dir: Path, instance_dir: Optional[Path] = None) -> str:
         """
         Western prompt assembly (domains-based):
@@ -18,7 +25,7 @@ class WesternPromptBuilder(BasePromptBuilder):
             if intro_path.exists():
                 parts.append(intro_path.read_text().strip())
         prompt_dir = base_dir / "western" / self.asp_version / "prompts"
-        for name in ["intro.txt", "2map.txt", "3term_definitions.txt", "4instructions.txt", "prompt.txt"]:
+        for name in self.PROMPT_FILES:
             p = prompt_dir / name
             if p.exists():
                 parts.append(p.read_text().strip())
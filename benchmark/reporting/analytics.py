@@ -0,0 +1,422 @@
+"""
+Results analytics over whole results trees.
+
+`load_runs(path)` turns a results tree (files or parquet backend, any number of sweeps) or a
+`--output` JSON into a DataFrame with one flat row per run. Rows of `result.json` files are
+kept in `<results>/runs_index.parquet`, keyed by each file's (mtime, size), so re-analysing
+a tree only parses runs that are new or were rewritten; parsing itself runs on a process
+pool. Everything after loading is grouped pandas/numpy work:
+
+- `success_rates`: runs, completed and satisfiable counts with Wilson confidence intervals
+- `distributions`: p50/p95/p99 and mean of latency and token columns
+- `cost_estimates`: token cost from per-model prices (`reporting.prices` in the config)
+- `render_charts`: PNG charts, rendered with the headless Agg backend
+
+    python -m benchmark.reporting.analytics results --by domain model size --out report
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmark.io.artifact_writer import STORE_DIRNAME
+from benchmark.reporting.summary import STAGE_PERCENTILES
+
+INDEX_FILENAME = "runs_index.parquet"
+LEDGER_FILENAME = "ledger.jsonl"
+DEFAULT_GROUP_BY = ("domain", "model", "size")
+DISTRIBUTION_COLUMNS = (
+    "llm_elapsed",
+    "prompt_tokens",
+    "completion_tokens",
+    "asp_wall_time",
+    "solve_time",
+    "total_wall",
+    "optimality_gap",
+)
+# stages whose wall time gets its own `wall_<stage>` column
+TIMED_STAGES = ("prompt", "llm", "parse", "constraints", "clingo", "evaluate", "write")
+# secret_agent random_grid_16x16_64obstacle_1key -> 16x16, aladdin_instances_5_5 -> 5_5, western_instances_10 -> 10
+SIZE_PATTERN = r"(?:_grid_(\d+x\d+)_|_instances_([\d_]+)$)"
+
+
+def run_row(result: Dict) -> Dict:
+    """One flat row of a result dict; missing values are None."""
+    meta = result.get("metadata") or {}
+    timing = result.get("llm_timing") or {}
+    asp = result.get("asp") or {}
+    stats = asp.get("solver_stats") or {}
+    evaluation = result.get("evaluation") or {}
+    instance = str(meta.get("instance") or "")
+    run_id = str(result.get("run_id") or "")
+    row = {
+        "run_id": run_id,
+        "sweep": run_id.split("/")[0],
+        "domain": meta.get("domain"),
+        "asp_version": meta.get("asp_version"),
+        "model": meta.get("model"),
+        "instance": instance,
+        "instance_group": instance.split("/")[0],
+        "sample_index": meta.get("sample_index"),
+        "stage": result.get("stage"),
+        "success": bool(result.get("success")),
+        "satisfiable": asp.get("satisfiable"),
+        "offline": result.get("offline"),
+        "limit_exceeded": asp.get("limit_exceeded"),
+        "llm_elapsed": timing.get("elapsed"),
+        "prompt_tokens": timing.get("prompt_tokens"),
+        "completion_tokens": timing.get("completion_tokens"),
+        "cache_hit": timing.get("cache_hit"),
+        "asp_wall_time": stats.get("wall_time"),
+        "solve_time": stats.get("solve_time"),
+        "ground_time": stats.get("ground_time"),
+        "plan_length": evaluation.get("plan_length"),
+        "causal_sound": evaluation.get("causal_sound"),
+        "reference_plan_length": evaluation.get("reference_plan_length"),
+        "optimality_gap": evaluation.get("optimality_gap"),
+    }
+    timings = result.get("stage_timings") or {}
+    for stage in TIMED_STAGES:
+        row[f"wall_{stage}"] = (timings.get(stage) or {}).get("wall")
+    walls = [t.get("wall") for t in timings.values() if isinstance(t, dict) and t.get("wall") is not None]
+    row["total_wall"] = sum(walls) if walls else None
+    return row
+
+
+def file_row(path: str) -> Optional[Dict]:
+    try:
+        return run_row(json.loads(Path(path).read_text()))
+    except (OSError, ValueError):
+        return None
+
+
+def json_row(text: str) -> Dict:
+    return run_row(json.loads(text))
+
+
+def parallel_map(fn, items: List, workers: Optional[int] = None) -> List:
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items) // 500 or 1))
+    if workers == 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(fn, items, chunksize=max(1, len(items) // (workers * 8))))
+
+
+def walk_result_files(root: Path) -> List[str]:
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if "result.json" in filenames:
+            found.append(os.path.join(dirpath, "result.json"))
+            # a run dir: only support files below
+            dirnames[:] = []
+        else:
+            # columnar stores and the blob store hold no result.json files
+            dirnames[:] = [d for d in dirnames if d not in (STORE_DIRNAME, "blobs")]
+    return found
+
+
+def ledger_result_files(sweep_dir: Path) -> Optional[List[str]]:
+    """
+    `result.json` paths of a sweep from its ledger, without listing any run dir. Ledger dirs
+    are rebased onto `sweep_dir` (they are relative to the sweep's cwd). None if unusable.
+    """
+    found = set()
+    try:
+        lines = (sweep_dir / LEDGER_FILENAME).read_text().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if "key" not in entry or entry.get("backend", "files") != "files" or not entry.get("result_dir"):
+            continue
+        parts = Path(entry["result_dir"]).parts
+        if sweep_dir.name not in parts:
+            return None
+        rest = parts[parts.index(sweep_dir.name) + 1 :]
+        found.add(str(sweep_dir.joinpath(*rest, "result.json")))
+    return sorted(found)
+
+
+def find_result_files(root: Path) -> List[str]:
+    """Every `result.json` under `root`: from sweep ledgers where present, else by walking."""
+    found = []
+    sweeps = [root] if (root / LEDGER_FILENAME).exists() else [d for d in root.iterdir() if d.is_dir()]
+    if not sweeps and root.is_dir():
+        sweeps = [root]
+    for sweep in sweeps:
+        listed = ledger_result_files(sweep) if (sweep / LEDGER_FILENAME).exists() else None
+        found.extend(listed if listed is not None else walk_result_files(sweep))
+    if (root / "result.json").exists():
+        found.append(str(root / "result.json"))
+    return found
+
+
+def find_stores(root: Path) -> List[Path]:
+    if (root / "runs").is_dir() and root.name == STORE_DIRNAME:
+        return [root]
+    return [p for p in [root / STORE_DIRNAME, *root.glob(f"*/{STORE_DIRNAME}")] if (p / "runs").is_dir()]
+
+
+def load_file_runs(root: Path, workers: Optional[int] = None, use_index: bool = True) -> pd.DataFrame:
+    """Rows of the `result.json` files under `root`, reusing `runs_index.parquet` where unchanged."""
+    paths = find_result_files(root)
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    index_path = root / INDEX_FILENAME
+    cached = pd.DataFrame()
+    if use_index and index_path.exists():
+        try:
+            cached = pd.read_parquet(index_path)
+        except Exception:
+            cached = pd.DataFrame()
+    if not set(run_row({})) <= set(cached.columns):
+        # written before a column was added to run_row
+        cached = pd.DataFrame()
+    if not cached.empty:
+        current = pd.DataFrame(
+            [(p, m, s) for p, (m, s) in stamps.items()], columns=["path", "mtime_ns", "size_bytes"]
+        )
+        cached = cached.merge(current, on=["path", "mtime_ns", "size_bytes"], how="inner")
+    todo = sorted(set(stamps) - set(cached["path"]) if not cached.empty else stamps)
+    fresh = []
+    for path, row in zip(todo, parallel_map(file_row, todo, workers)):
+        if row is not None:
+            fresh.append({**row, "path": path, "mtime_ns": stamps[path][0], "size_bytes": stamps[path][1]})
+    frames = [f for f in (cached, pd.DataFrame(fresh)) if not f.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if use_index and fresh and not df.empty:
+        tmp = index_path.with_name(f".{INDEX_FILENAME}.{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, index_path)
+        except OSError:
+            pass
+    return df
+
+
+def load_store_runs(store: Path, workers: Optional[int] = None) -> pd.DataFrame:
+    from benchmark.io.columnar_store import load_table
+
+    table = load_table(store, "runs", columns=["run_id", "written_at", "result_json"])
+    runs = table.to_pandas()
+    if runs.empty:
+        return pd.DataFrame()
+    # latest row per run (a resumed or revalidated run may have been written twice)
+    runs = runs.sort_values("written_at").drop_duplicates("run_id", keep="last")
+    rows = parallel_map(json_row, runs["result_json"].tolist(), workers)
+    df = pd.DataFrame(rows)
+    df["path"] = str(store)
+    return df
+
+
+def load_runs(path: Path, workers: Optional[int] = None, use_index: bool = True) -> pd.DataFrame:
+    """
+    One row per run from a results tree (any mix of sweeps and artifact backends) or a
+    `--output` JSON file, with derived `size` and `sat` columns.
+    """
+    path = Path(path)
+    if path.is_file():
+        data = json.loads(path.read_text())
+        results = data.get("runs", []) if isinstance(data, dict) else data
+        df = pd.DataFrame([run_row(r) for r in results])
+    else:
+        frames = [load_file_runs(path, workers, use_index)]
+        frames += [load_store_runs(store, workers) for store in find_stores(path)]
+        frames = [f for f in frames if not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame([run_row({})]).iloc[:0]
+    return add_derived_columns(df)
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        df["size"] = pd.Series(dtype="object")
+        df["sat"] = pd.Series(dtype="bool")
+        return df
+    sizes = df["instance_group"].astype(str).str.extract(SIZE_PATTERN)
+    df["size"] = sizes[0].fillna(sizes[1])
+    df["sat"] = (df["stage"] == "complete") & (df["satisfiable"] == True)  # noqa: E712 (object column)
+    for column in DISTRIBUTION_COLUMNS + ("ground_time", "plan_length", "reference_plan_length") + tuple(f"wall_{s}" for s in TIMED_STAGES):
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+def wilson_interval(successes: np.ndarray, trials: np.ndarray, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval of binomial proportions, vectorized over groups."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    n = np.asarray(trials, dtype=float)
+    p = np.divide(successes, n, out=np.zeros_like(n), where=n > 0)
+    denom = 1 + z**2 / np.where(n > 0, n, 1)
+    center = (p + z**2 / (2 * np.where(n > 0, n, 1))) / denom
+    half = z * np.sqrt(p * (1 - p) / np.where(n > 0, n, 1) + z**2 / (4 * np.where(n > 0, n, 1) ** 2)) / denom
+    low = np.where(n > 0, center - half, np.nan)
+    high = np.where(n > 0, center + half, np.nan)
+    return np.clip(low, 0, 1), np.clip(high, 0, 1)
+
+
+def success_rates(df: pd.DataFrame, by: Sequence[str] = DEFAULT_GROUP_BY, confidence: float = 0.95) -> pd.DataFrame:
+    """Per group: runs, completed, sat, success_rate (= sat / runs) and its confidence interval."""
+    grouped = df.assign(completed=df["stage"] == "complete").groupby(list(by), dropna=False)
+    rates = grouped.agg(runs=("run_id", "size"), completed=("completed", "sum"), sat=("sat", "sum")).reset_index()
+    rates["success_rate"] = rates["sat"] / rates["runs"]
+    rates["ci_low"], rates["ci_high"] = wilson_interval(rates["sat"].to_numpy(), rates["runs"].to_numpy(), confidence)
+    return rates
+
+
+def distributions(
+    df: pd.DataFrame, by: Sequence[str] = DEFAULT_GROUP_BY, columns: Iterable[str] = DISTRIBUTION_COLUMNS
+) -> pd.DataFrame:
+    """Long table of per-group percentiles and mean for each latency/token column."""
+    columns = [c for c in columns if c in df and df[c].notna().any()]
+    if not columns:
+        return pd.DataFrame()
+    grouped = df.groupby(list(by), dropna=False)[columns]
+    quantiles = grouped.quantile([q / 100 for q in STAGE_PERCENTILES])
+    quantiles = quantiles.rename(index={q / 100: f"p{q}" for q in STAGE_PERCENTILES}, level=-1)
+    quantiles.index = quantiles.index.set_names("stat", level=-1)
+    means = grouped.mean()
+    means["stat"] = "mean"
+    means = means.set_index("stat", append=True)
+    table = pd.concat([quantiles, means]).sort_index()
+    table.columns.name = "metric"
+    return table.stack(future_stack=True).rename("value").reset_index()
+
+
+def cost_estimates(df: pd.DataFrame, prices: Dict[str, Dict], by: Sequence[str] = ("model",)) -> pd.DataFrame:
+    """
+    Estimated LLM cost per group from token counts. `prices` maps a model to
+    `{"prompt": USD per 1M tokens, "completion": USD per 1M tokens}`; models without a price
+    get NaN. Cached responses (`cache_hit`) cost nothing.
+    """
+    price = pd.DataFrame.from_dict(prices or {}, orient="index").reindex(columns=["prompt", "completion"])
+    price.index.name = "model"
+    billed = df.assign(
+        prompt_tokens=df["prompt_tokens"].fillna(0).where(df["cache_hit"] != True, 0),  # noqa: E712
+        completion_tokens=df["completion_tokens"].fillna(0).where(df["cache_hit"] != True, 0),  # noqa: E712
+    ).join(price, on="model")
+    billed["cost_usd"] = (
+        billed["prompt_tokens"] * billed["prompt"] + billed["completion_tokens"] * billed["completion"]
+    ) / 1e6
+    grouped = billed.groupby(list(by), dropna=False)
+    costs = grouped.agg(
+        runs=("run_id", "size"),
+        sat=("sat", "sum"),
+        prompt_tokens=("prompt_tokens", "sum"),
+        completion_tokens=("completion_tokens", "sum"),
+        cost_usd=("cost_usd", lambda s: s.sum(min_count=1)),
+    ).reset_index()
+    costs[["prompt_tokens", "completion_tokens"]] = costs[["prompt_tokens", "completion_tokens"]].astype("int64")
+    costs["cost_per_run"] = costs["cost_usd"] / costs["runs"]
+    costs["cost_per_sat"] = costs["cost_usd"] / costs["sat"].where(costs["sat"] > 0)
+    return costs
+
+
+def group_label(frame: pd.DataFrame, by: Sequence[str]) -> pd.Series:
+    return frame[list(by)].astype(str).agg(" / ".join, axis=1)
+
+
+def render_charts(df: pd.DataFrame, rates: pd.DataFrame, by: Sequence[str], out_dir: Path) -> List[Path]:
+    """Success rates with CIs and latency/token histograms as PNGs; no display needed."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    if not rates.empty:
+        labels = group_label(rates, by)
+        fig, ax = plt.subplots(figsize=(8, max(2.5, 0.3 * len(rates) + 1)))
+        y = np.arange(len(rates))
+        err = np.vstack([rates["success_rate"] - rates["ci_low"], rates["ci_high"] - rates["success_rate"]])
+        ax.barh(y, rates["success_rate"], xerr=err, capsize=3, color="tab:blue", alpha=0.8)
+        ax.set_yticks(y, labels)
+        ax.set_xlim(0, 1)
+        ax.set_xlabel("success rate (satisfiable / runs)")
+        ax.invert_yaxis()
+        fig.tight_layout()
+        written.append(out_dir / "success_rates.png")
+        fig.savefig(written[-1], dpi=120)
+        plt.close(fig)
+
+    columns = [c for c in ("llm_elapsed", "completion_tokens", "asp_wall_time") if c in df and df[c].notna().any()]
+    if columns:
+        fig, axes = plt.subplots(1, len(columns), figsize=(5 * len(columns), 3.5), squeeze=False)
+        for ax, column in zip(axes[0], columns):
+            # shared bin edges, so the per-model histograms line up
+            bins = np.histogram_bin_edges(df[column].dropna(), bins=40)
+            for model, values in df.groupby("model")[column]:
+                values = values.dropna()
+                if len(values):
+                    ax.hist(values, bins=bins, alpha=0.5, label=str(model))
+            ax.set_xlabel(column)
+            ax.set_ylabel("runs")
+        axes[0][0].legend(fontsize="small")
+        fig.tight_layout()
+        written.append(out_dir / "distributions.png")
+        fig.savefig(written[-1], dpi=120)
+        plt.close(fig)
+    return written
+
+
+def load_prices(config_path: Optional[Path]) -> Dict[str, Dict]:
+    from benchmark.config.config_loader import load_combined_config
+
+    cfg = load_combined_config(Path("config.default.yaml"), config_path)
+    return (cfg.get("reporting") or {}).get("prices") or {}
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Success rates, distributions and costs of a results tree")
+    parser.add_argument("results", help="Results tree (any backend) or a --output JSON file")
+    parser.add_argument("--by", nargs="+", default=list(DEFAULT_GROUP_BY), help="Group-by columns")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--config", help="Config YAML with reporting.prices (USD per 1M tokens per model)")
+    parser.add_argument("--out", help="Write CSV tables and PNG charts to this directory")
+    parser.add_argument("--workers", type=int, help="Processes for parsing result files (default: CPU count)")
+    parser.add_argument("--no-index", action="store_true", help="Do not read or write runs_index.parquet")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_arg_parser().parse_args(argv)
+    df = load_runs(Path(args.results), workers=args.workers, use_index=not args.no_index)
+    if df.empty:
+        print(f"No runs found under {args.results}", file=sys.stderr)
+        return
+    rates = success_rates(df, args.by, args.confidence)
+    dists = distributions(df, args.by)
+    costs = cost_estimates(df, load_prices(Path(args.config) if args.config else None), args.by)
+    with pd.option_context("display.width", 200, "display.max_rows", 200):
+        print(rates.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        print()
+        print(costs.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    if args.out:
+        out_dir = Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        rates.to_csv(out_dir / "success_rates.csv", index=False)
+        dists.to_csv(out_dir / "distributions.csv", index=False)
+        costs.to_csv(out_dir / "costs.csv", index=False)
+        charts = render_charts(df, rates, args.by, out_dir)
+        print(f"Wrote 3 tables and {len(charts)} charts to {out_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
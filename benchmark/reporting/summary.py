@@ -1,26 +1,200 @@
-def summarize_results(results):
-    total = len(results)
-    completed = sum(1 for r in results if r.get("stage") == "complete")
-    satisfiable = sum(
-        1
-        for r in results
-        if r.get("stage") == "complete" and r.get("asp", {}).get("satisfiable", False)
-    )
-    timing_vals = [r.get("llm_timing", {}) for r in results if r.get("llm_timing")]
-    prompt_tokens = [t.get("prompt_tokens") for t in timing_vals if t.get("prompt_tokens") is not None]
-    completion_tokens = [t.get("completion_tokens") for t in timing_vals if t.get("completion_tokens") is not None]
-    elapsed = [t.get("elapsed") for t in timing_vals if t.get("elapsed") is not None]
-
-    def average(values):
-        return sum(values) / len(values) if values else 0.0
-
-    return {
-        "total_runs": total,
-        "completed_runs": completed,
-        "sat_runs": satisfiable,
-        "success_rate": satisfiable / total if total else 0.0,
-        "avg_prompt_tokens": average(prompt_tokens),
-        "avg_completion_tokens": average(completion_tokens),
-        "avg_elapsed": average(elapsed),
-    }
+"""
+Sweep summary statistics.
+
+`SummaryAggregator` is updated one result at a time and keeps constant memory: counters,
+running sums and a `StreamingQuantiles` per latency series. A sweep feeds it as runs finish,
+so full results never have to be kept around; `summarize_results(results)` is the same
+computation over a list.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STAGE_PERCENTILES = (50, 95, 99)
+# samples kept exactly before a series switches to log-spaced buckets
+EXACT_SAMPLES = 2048
+# relative bucket width of the fallback histogram (quantile error below 1%)
+BUCKET_GROWTH = 1.01
+SLOWEST_SOLVES = 5
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a non-empty list (same as numpy's default)."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class StreamingQuantiles:
+    """
+    Quantiles of a stream of non-negative values in bounded memory. The first
+    `EXACT_SAMPLES` values are kept, so small sweeps get exact percentiles; after that all
+    values go into log-spaced buckets, whose count is bounded by the value range rather than
+    the number of samples, and a quantile is the geometric middle of its bucket.
+    """
+
+    def __init__(self, exact_limit: int = EXACT_SAMPLES):
+        self.exact_limit = exact_limit
+        self.samples: Optional[List[float]] = []
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.samples is not None:
+            self.samples.append(value)
+            if len(self.samples) > self.exact_limit:
+                for v in self.samples:
+                    self.bucket_add(v)
+                self.samples = None
+        else:
+            self.bucket_add(value)
+
+    def bucket_add(self, value: float) -> None:
+        # values <= 0 share one bucket below every positive one
+        key = math.floor(math.log(value, BUCKET_GROWTH)) if value > 0 else -(10**9)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        if self.samples is not None:
+            return percentile(self.samples, q)
+        rank = (self.count - 1) * q / 100.0
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                if key == -(10**9):
+                    return max(self.min, 0.0)
+                middle = BUCKET_GROWTH ** (key + 0.5)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+    def stats(self) -> Dict[str, float]:
+        stats = {f"p{q}": self.quantile(q) for q in STAGE_PERCENTILES}
+        stats["mean"] = self.total / self.count
+        return stats
+
+
+class SummaryAggregator:
+    """Running sweep summary; `add` each result as it finishes, `summary()` at any time."""
+
+    def __init__(self):
+        self.total = 0
+        self.stages: Dict[str, int] = {}
+        self.sat = 0
+        self.token_sums = {"prompt_tokens": [0, 0], "completion_tokens": [0, 0], "elapsed": [0.0, 0]}
+        self.stage_runs: Dict[str, int] = {}
+        self.stage_series: Dict[Tuple[str, str], StreamingQuantiles] = {}
+        self.solver_runs = 0
+        self.solver_series: Dict[str, StreamingQuantiles] = {}
+        self.slowest: List[Tuple[float, int, Dict]] = []
+        self.sequence = itertools.count()
+
+    def add(self, r: Dict) -> None:
+        self.total += 1
+        stage = r.get("stage")
+        self.stages[stage] = self.stages.get(stage, 0) + 1
+        if stage == "complete" and (r.get("asp") or {}).get("satisfiable", False):
+            self.sat += 1
 
+        timing = r.get("llm_timing") or {}
+        for key, sums in self.token_sums.items():
+            if timing.get(key) is not None:
+                sums[0] += timing[key]
+                sums[1] += 1
+
+        for name, totals in (r.get("stage_timings") or {}).items():
+            if totals.get("wall") is not None:
+                self.stage_runs[name] = self.stage_runs.get(name, 0) + 1
+            for kind in ("wall", "cpu"):
+                if totals.get(kind) is not None:
+                    self.series(self.stage_series, (name, kind)).add(totals[kind])
+
+        stats = (r.get("asp") or {}).get("solver_stats") or {}
+        if stats.get("total_time") is not None:
+            self.solver_runs += 1
+            for key in ("total_time", "ground_time", "solve_time"):
+                if stats.get(key) is not None:
+                    self.series(self.solver_series, key).add(stats[key])
+            entry = {
+                "instance": (r.get("metadata") or {}).get("instance"),
+                **{k: stats.get(k) for k in ("total_time", "atoms", "rules", "choices", "conflicts")},
+            }
+            # among equal times the latest run is evicted first, like a stable sort of the results
+            item = (stats["total_time"], -next(self.sequence), entry)
+            if len(self.slowest) < SLOWEST_SOLVES:
+                heapq.heappush(self.slowest, item)
+            elif item[0] > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, item)
+
+    @staticmethod
+    def series(table: Dict, key) -> StreamingQuantiles:
+        if key not in table:
+            table[key] = StreamingQuantiles()
+        return table[key]
+
+    def stage_latency(self) -> Dict:
+        latency: Dict = {}
+        for (name, kind), series in self.stage_series.items():
+            latency.setdefault(name, {"runs": self.stage_runs.get(name, 0)})[kind] = series.stats()
+        return latency
+
+    def solver_summary(self) -> Dict:
+        if not self.solver_runs:
+            return {}
+        summary: Dict = {"runs": self.solver_runs}
+        for key in ("total_time", "ground_time", "solve_time"):
+            if key in self.solver_series:
+                summary[key] = self.solver_series[key].stats()
+        summary["slowest"] = [entry for _, _, entry in sorted(self.slowest, key=lambda item: (-item[0], -item[1]))]
+        return summary
+
+    def summary(self) -> Dict:
+        def average(key):
+            total, count = self.token_sums[key]
+            return total / count if count else 0.0
+
+        return {
+            "total_runs": self.total,
+            "completed_runs": self.stages.get("complete", 0),
+            "sat_runs": self.sat,
+            "asp_timeout_runs": self.stages.get("asp_timeout", 0),
+            "asp_memory_runs": self.stages.get("asp_memory", 0),
+            "success_rate": self.sat / self.total if self.total else 0.0,
+            "avg_prompt_tokens": average("prompt_tokens"),
+            "avg_completion_tokens": average("completion_tokens"),
+            "avg_elapsed": average("elapsed"),
+            "stage_latency": self.stage_latency(),
+            "solver": self.solver_summary(),
+        }
+
+
+def aggregate(results: Iterable[Dict]) -> SummaryAggregator:
+    aggregator = SummaryAggregator()
+    for r in results:
+        aggregator.add(r)
+    return aggregator
+
+
+def stage_latency(results):
+    """p50/p95/p99 and mean of each stage's wall and CPU seconds across runs."""
+    return aggregate(results).stage_latency()
+
+
+def solver_summary(results):
+    """Clingo time percentiles and the instances that were most expensive to check."""
+    return aggregate(results).solver_summary()
+
+
+def summarize_results(results):
+    return aggregate(results).summary()
@@ -0,0 +1,158 @@
+"""
+Constant-memory handling of a sweep's finished results.
+
+Results are persisted by the runner as they finish, so the sweep itself keeps none of them:
+`SweepOutput.add` folds each result into a `SummaryAggregator` and, only if `--output` or
+`--trace` were requested, appends it (or its trace events) to a spool file next to that
+output. `summary.json` in the sweep directory is rewritten at most every
+`SUMMARY_FLUSH_SECONDS`, so a running sweep can be watched. `close` writes the final
+summary and assembles `--output` / `--trace` from the spools, one run at a time.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from benchmark.reporting.summary import SummaryAggregator
+from benchmark.reporting.trace import run_trace_events
+
+SUMMARY_FILENAME = "summary.json"
+SUMMARY_FLUSH_SECONDS = 5.0
+RUNS = object()
+
+
+def write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def nested_json(value, level: int) -> str:
+    """`value` as `json.dumps(..., indent=2)` renders it `level` levels deep."""
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * level)
+
+
+def read_spool(path: Path) -> Iterator[Dict]:
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def write_output_json(path: Path, sections: List[Tuple[str, object]], runs_spool: Path) -> None:
+    """
+    Write `{key: value, ...}` with the same layout as `json.dumps(..., indent=2)`, where the
+    value `RUNS` is the list of spooled runs, streamed from `runs_spool`.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as out:
+        out.write("{")
+        for i, (key, value) in enumerate(sections):
+            out.write(("," if i else "") + f"\n  {json.dumps(key)}: ")
+            if value is not RUNS:
+                out.write(nested_json(value, 1))
+                continue
+            out.write("[")
+            first = True
+            for run in read_spool(runs_spool):
+                out.write(("\n    " if first else ",\n    ") + nested_json(run, 2))
+                first = False
+            out.write("]" if first else "\n  ]")
+        out.write("\n}")
+    os.replace(tmp, path)
+
+
+class SweepOutput:
+    """Aggregates a sweep's results as they finish; see the module docstring."""
+
+    def __init__(
+        self,
+        summary_path: Optional[Path],
+        output_path: Optional[Path] = None,
+        trace_path: Optional[Path] = None,
+        flush_interval: float = SUMMARY_FLUSH_SECONDS,
+    ):
+        self.summary_path = Path(summary_path) if summary_path else None
+        self.output_path = Path(output_path) if output_path else None
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.flush_interval = flush_interval
+        self.aggregator = SummaryAggregator()
+        self.started = time.time()
+        self.last_flush = 0.0
+        self.trace_events = 0
+        self.runs_spool = self.spool_path(self.output_path)
+        self.trace_spool = self.spool_path(self.trace_path)
+        self.runs_file = self.open_spool(self.runs_spool)
+        self.trace_file = self.open_spool(self.trace_spool)
+
+    @staticmethod
+    def spool_path(path: Optional[Path]) -> Optional[Path]:
+        return path.with_name(f".{path.name}.{os.getpid()}.spool") if path else None
+
+    @staticmethod
+    def open_spool(path: Optional[Path]):
+        if path is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, "w")
+
+    @property
+    def count(self) -> int:
+        return self.aggregator.total
+
+    def add(self, result: Dict) -> None:
+        self.aggregator.add(result)
+        if self.runs_file is not None:
+            self.runs_file.write(json.dumps(result, default=str) + "\n")
+        if self.trace_file is not None:
+            events = run_trace_events(result)
+            self.trace_file.write("".join(json.dumps(e) + "\n" for e in events))
+            self.trace_events += len(events)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.write_summary()
+
+    def summary(self) -> Dict:
+        return self.aggregator.summary()
+
+    def write_summary(self, final: bool = False) -> None:
+        self.last_flush = time.monotonic()
+        if self.summary_path is None:
+            return
+        record = {"updated_at": time.time(), "started_at": self.started, "final": final, "summary": self.summary()}
+        try:
+            write_atomic(self.summary_path, json.dumps(record, indent=2))
+        except OSError:
+            # the live summary is informational; never fail the sweep over it
+            pass
+
+    def close(self, invocation: Dict, extra: Optional[Dict] = None) -> Dict:
+        """Write the final summary, `--output` and `--trace`; returns the summary."""
+        summary = self.summary()
+        self.write_summary(final=True)
+        self.close_spools()
+        if self.output_path is not None:
+            sections = [("summary", summary), ("runs", RUNS), ("invocation", invocation)]
+            sections += list((extra or {}).items())
+            write_output_json(self.output_path, sections, self.runs_spool)
+        if self.trace_path is not None:
+            with open(self.trace_path, "w") as out, open(self.trace_spool) as spool:
+                out.write('{"traceEvents": [')
+                for i, line in enumerate(spool):
+                    out.write((", " if i else "") + line.rstrip("\n"))
+                out.write('], "displayTimeUnit": "ms"}')
+        self.discard()
+        return summary
+
+    def close_spools(self) -> None:
+        for f in (self.runs_file, self.trace_file):
+            if f is not None and not f.closed:
+                f.close()
+
+    def discard(self) -> None:
+        """Remove the spool files (after `close`, or when the sweep is cancelled)."""
+        self.close_spools()
+        for spool in (self.runs_spool, self.trace_spool):
+            if spool is not None:
+                spool.unlink(missing_ok=True)
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+from typing import Dict, List
+
+
+def run_trace_events(r: Dict) -> List[Dict]:
+    """Complete ("X") events of one run's spans, on the process/thread that ran each stage."""
+    meta = r.get("metadata") or {}
+    return [
+        {
+            "name": s["name"],
+            "cat": "stage",
+            "ph": "X",
+            "ts": s["start"] * 1e6,
+            "dur": s["wall"] * 1e6,
+            "pid": s["pid"],
+            "tid": s["tid"],
+            "args": {
+                "run_id": r.get("run_id"),
+                "model": meta.get("model"),
+                "instance": meta.get("instance"),
+                "cpu": s.get("cpu"),
+            },
+        }
+        for s in r.get("spans") or []
+    ]
+
+
+def chrome_trace(results: List[Dict]) -> Dict:
+    """
+    Chrome trace-event JSON (chrome://tracing, Perfetto) of every run's stage spans: one
+    complete ("X") event per span on its process/thread, with the run and CPU time as args.
+    """
+    events = [event for r in results for event in run_trace_events(r)]
+    events.sort(key=lambda e: e["ts"])
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(results: List[Dict], path: Path) -> int:
+    trace = chrome_trace(results)
+    Path(path).write_text(json.dumps(trace))
+    return len(trace["traceEvents"])
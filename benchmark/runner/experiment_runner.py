@@ -1,17 +1,72 @@
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import json
+import time
 
+from benchmark.asp.reference_plans import get_reference
 from benchmark.asp.validator import ASPValidator
-from benchmark.llm_post_processing.plan_parser import get_plan_parser
+from benchmark.llm_post_processing.plan_parser import StreamingPlanMonitor, get_plan_parser
 from benchmark.prompt_builders.prompt_builder import get_prompt_builder
+from benchmark.prompt_builders.prompt_cache import get_prompt
 from benchmark.config.config_utils import load_api_key
-from benchmark.io.artifact_writer import ArtifactWriter
+from benchmark.io.artifact_writer import get_artifact_writer
+from benchmark.io.event_log import emit_event
 from benchmark.config.config_loader import ExperimentConfig, LlmConfig
 from benchmark.domain_registry import get_adapter
-from benchmark.io.support_files_copier import SupportFilesCopier
+from benchmark.instrumentation import StageTimer
+from benchmark.llm_clients.rate_limiter import estimate_tokens, get_limiter
+from benchmark.llm_clients.response_cache import get_response_cache, prompt_hash, response_cache_key
+
+# result stage of a run whose clingo check hit a solver limit (`asp.limit_exceeded`)
+LIMIT_STAGES = {"time": "asp_timeout", "memory": "asp_memory"}
+
+
+def validate_responses(runners: List["ExperimentRunner"], pendings: List[Dict]) -> List[Dict]:
+    """
+    Validation stage for several runs of the same (domain, asp_version, instance): each
+    response is parsed and turned into constraints as in `validate_response`, then all plans
+    are checked by one `ASPValidator.validate_many` call, so the instance is grounded once.
+    Returns the results in order.
+    """
+    results: List[Optional[Dict]] = [None] * len(runners)
+    plans: List[Tuple[int, Dict]] = []
+    for i, (runner, pending) in enumerate(zip(runners, pendings)):
+        runner.timer = StageTimer(pending.get("spans"))
+        with runner.timer.activate():
+            plan = runner.prepare_plan(pending)
+        if "result" in plan:
+            results[i] = plan["result"]
+        else:
+            plans.append((i, plan))
+    if not plans:
+        return results
+
+    validator = runners[plans[0][0]].validator
+    asp_started = time.time()
+    try:
+        checked = validator.validate_many(
+            [
+                {"maxstep": p["maxstep"], "constraints_text": p["constraints_text"], "constraints_path": p["constraints_path"]}
+                for _, p in plans
+            ]
+        )
+    except Exception as e:
+        for i, plan in plans:
+            with runners[i].timer.activate():
+                results[i] = runners[i].plan_error(plan, e)
+        return results
+    for (i, plan), asp_result, raw_clingo in zip(plans, checked, validator.last_stdouts):
+        runner = runners[i]
+        # the batch is one solver call; each run is charged the time of its own check
+        runner.timer.record("clingo", asp_started, (asp_result.get("solver_stats") or {}).get("wall_time") or 0.0)
+        with runner.timer.activate():
+            try:
+                results[i] = runner.finish_plan(plan, asp_result, raw_clingo, asp_started)
+            except Exception as e:
+                results[i] = runner.plan_error(plan, e)
+    return results
 
 
 class ExperimentRunner:
@@ -39,6 +94,18 @@ class ExperimentRunner:
         llm_cfg: Optional[LlmConfig] = None,
         response_file_dir: Optional[Path] = None,
         instance_label_override: Optional[str] = None,
+        use_clingo_api: bool = False,
+        first_model_only: bool = False,
+        asp_timeout: Optional[float] = None,
+        asp_memory_mb: Optional[int] = None,
+        tight_maxstep: bool = False,
+        incremental: bool = False,
+        ground_cache_dir: Optional[str] = None,
+        cache_mode: Optional[str] = None,
+        sample_index: int = 0,
+        revalidated_from: Optional[Dict] = None,
+        stream: Optional[bool] = None,
+        artifact_backend: Optional[str] = None,
     ):
         self.base_dir = base_dir
         self.domains_root = domains_root
@@ -49,6 +116,7 @@ class ExperimentRunner:
         self.provider = provider
         self.clingo_path = clingo_path
         self.maxstep = maxstep
+        self.tight_maxstep = tight_maxstep
         self.config_path = config_path
         self.output_dir = output_dir
         self.run_id_override = run_id_override
@@ -57,6 +125,11 @@ class ExperimentRunner:
         self.exp_cfg = exp_cfg
         self.llm_cfg = llm_cfg
         self.response_file_dir = response_file_dir
+        self.temperature = llm_cfg.temperature if llm_cfg else 0.7
+        self.cache_mode = cache_mode or (llm_cfg.cache_mode if llm_cfg else "off")
+        self.sample_index = sample_index
+        self.revalidated_from = revalidated_from
+        self.stream = stream if stream is not None else bool(llm_cfg and llm_cfg.stream)
         # choose instance label: prefer override (e.g., response file subpath); otherwise infer
         if instance_label_override:
             self.instance_label = instance_label_override
@@ -67,7 +140,9 @@ class ExperimentRunner:
             self.instance_label = instance_dir.name
 
         domain_dir = domains_root / domain / asp_version
-        self.writer = ArtifactWriter(
+        self.artifact_backend = artifact_backend or (exp_cfg.artifact_backend if exp_cfg else "files")
+        self.writer = get_artifact_writer(
+            self.artifact_backend,
             output_dir,
             domain,
             asp_version,
@@ -75,43 +150,254 @@ class ExperimentRunner:
             self.instance_label,
         )
         self.prompt_gen = get_prompt_builder(domain, asp_version)
+        self.prompt_sha256: Optional[str] = None
+        self.timer = StageTimer()
         self.parser = get_plan_parser(domain, domain_dir, instance_dir)
-        self.validator = ASPValidator(domain, domain_dir, instance_dir, clingo_path=clingo_path)
+        self.validator = ASPValidator(
+            domain,
+            domain_dir,
+            instance_dir,
+            clingo_path=clingo_path,
+            use_clingo_api=use_clingo_api,
+            first_model_only=first_model_only,
+            timeout_seconds=asp_timeout,
+            memory_limit_mb=asp_memory_mb,
+            incremental=incremental,
+            ground_cache_dir=ground_cache_dir,
+        )
         try:
             self.evaluator = get_adapter(domain).evaluator_factory()
         except Exception:
             self.evaluator = None
 
     def run(self, response_text: Optional[str] = None, run_seq: int = 0) -> Dict:
-        offline = response_text is not None
-        prompt = self.prompt_gen.build_prompt(self.domains_root, self.instance_dir)
+        pending = self.generate(response_text=response_text, run_seq=run_seq)
+        if "result" in pending:
+            return pending["result"]
+        return self.validate_response(pending)
+
+    def generate(self, response_text: Optional[str] = None, run_seq: int = 0) -> Dict:
+        """
+        LLM stage: build the prompt and obtain the response (online call or replayed text).
+
+        Returns the inputs for `validate_response`, or a dict holding the final `result`
+        when the LLM call failed.
+        """
+        run_id, prompt = self.start_run(run_seq, offline=response_text is not None)
+        if response_text is not None:
+            return self.llm_outcome(run_id, prompt, response_text=response_text)
+        cache_key, llm_result = self.cached_response(prompt)
+        if llm_result is None:
+            api_key = load_api_key(self.config_path, provider=self.provider)
+            client = self.make_client(api_key)
+            with self.timer.span("llm"):
+                llm_result = self.limiter().call(lambda: self.call_llm(client, prompt), self.estimated_tokens(prompt))
+            self.store_response(cache_key, llm_result)
+        return self.llm_outcome(run_id, prompt, llm_result=llm_result)
+
+    async def agenerate(self, response_text: Optional[str] = None, run_seq: int = 0) -> Dict:
+        """Coroutine variant of `generate` for the asyncio scheduler."""
+        run_id, prompt = self.start_run(run_seq, offline=response_text is not None)
+        if response_text is not None:
+            return self.llm_outcome(run_id, prompt, response_text=response_text)
+        cache_key, llm_result = self.cached_response(prompt)
+        if llm_result is None:
+            api_key = load_api_key(self.config_path, provider=self.provider)
+            client = self.make_client(api_key)
+            # other runs share this thread while the request is awaited, so only wall time is meaningful
+            with self.timer.span("llm", cpu=False):
+                llm_result = await self.limiter().acall(
+                    lambda: self.acall_llm(client, prompt), self.estimated_tokens(prompt)
+                )
+            self.store_response(cache_key, llm_result)
+        return self.llm_outcome(run_id, prompt, llm_result=llm_result)
+
+    def start_run(self, run_seq: int, offline: bool):
+        self.timer = StageTimer()
+        with self.timer.span("prompt"):
+            # memoized per (domain, asp_version, instance, builder version); shared across runs and models
+            prompt, self.prompt_sha256 = get_prompt(self.prompt_gen, self.domains_root, self.instance_dir)
         base_id = self.run_id_override or datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%d_%H-%M-%S_%Z")
         if offline:
             base_id = f"{base_id}_response_file"
         run_id = f"{base_id}/run_{run_seq:04d}"
-        if response_text is None:
-            api_key = load_api_key(self.config_path, provider=self.provider)
-            client = self.make_client(api_key)
-            llm_result = client.generate(prompt)
-            if not llm_result.get("success"):
-                result = {
-                    "stage": "llm",
-                    "success": False,
-                    "error": llm_result.get("error"),
-                    "run_id": run_id,
-                    "metadata": self.metadata(),
-                    "llm_timing": llm_result,
-                    "llm_raw": llm_result.get("content", "") or llm_result.get("error", ""),
-                }
-                self.persist_result(result, run_id, prompt, llm_raw=None, parse=None, asp=None)
-                self.copy_support_files(run_id)
-                return result
+        self.emit("run_start", run_id, offline=offline)
+        return run_id, prompt
+
+    def emit(self, event: str, run_id: str, **fields) -> None:
+        """Append a stage-transition event for this run to `<output_dir>/events.jsonl`."""
+        emit_event(
+            self.output_dir,
+            event,
+            run_id=run_id,
+            domain=self.domain,
+            asp_version=self.asp_version,
+            model=self.model,
+            instance=self.instance_label,
+            **fields,
+        )
+
+    def streams(self, client) -> bool:
+        return self.stream and hasattr(client, "generate_stream")
+
+    def stream_monitor(self) -> StreamingPlanMonitor:
+        return StreamingPlanMonitor(
+            self.parser,
+            abort_on_format_error=self.llm_cfg.stream_abort_on_format_error if self.llm_cfg else True,
+            max_preamble_chars=self.llm_cfg.stream_max_preamble_chars if self.llm_cfg else 2000,
+        )
+
+    def call_llm(self, client, prompt: str) -> Dict:
+        """One LLM attempt; with streaming, actions are checked as they arrive."""
+        if not self.streams(client):
+            return client.generate(prompt)
+        monitor = self.stream_monitor()
+        llm_result = client.generate_stream(prompt, monitor.feed)
+        if llm_result.get("success"):
+            llm_result["stream"] = monitor.summary()
+        return llm_result
+
+    async def acall_llm(self, client, prompt: str) -> Dict:
+        if not self.streams(client):
+            return await client.agenerate(prompt)
+        monitor = self.stream_monitor()
+        llm_result = await client.agenerate_stream(prompt, monitor.feed)
+        if llm_result.get("success"):
+            llm_result["stream"] = monitor.summary()
+        return llm_result
+
+    def limiter(self):
+        return get_limiter(self.provider, self.model, self.llm_cfg)
+
+    def estimated_tokens(self, prompt: str) -> int:
+        return estimate_tokens(prompt, self.max_output_tokens or self.max_tokens)
+
+    def response_cache(self):
+        if self.cache_mode == "off" or self.llm_cfg is None:
+            return None
+        return get_response_cache(
+            Path(self.llm_cfg.cache_path),
+            ttl_seconds=self.llm_cfg.cache_ttl_seconds,
+            max_entries=self.llm_cfg.cache_max_entries,
+        )
+
+    def cached_response(self, prompt: str):
+        """Return `(cache_key, llm_result)`; `llm_result` is None unless the cache is read and hit."""
+        cache = self.response_cache()
+        if cache is None:
+            return None, None
+        key = response_cache_key(
+            self.prompt_sha256 or prompt_hash(prompt),
+            self.provider,
+            self.model,
+            self.temperature,
+            self.max_tokens,
+            self.max_output_tokens,
+            sample_index=self.sample_index,
+        )
+        if self.cache_mode not in ("read", "readwrite"):
+            return key, None
+        hit = cache.get(key)
+        if hit is not None:
+            hit["cache_hit"] = True
+        return key, hit
+
+    def store_response(self, cache_key: Optional[str], llm_result: Dict) -> None:
+        # only complete, successful responses are cached; failures and aborted streams are retried
+        if cache_key is None or self.cache_mode not in ("write", "readwrite") or not llm_result.get("success"):
+            return
+        if llm_result.get("aborted"):
+            return
+        self.response_cache().put(cache_key, llm_result, self.provider, self.model)
+
+    def llm_outcome(
+        self,
+        run_id: str,
+        prompt: str,
+        llm_result: Optional[Dict] = None,
+        response_text: Optional[str] = None,
+    ) -> Dict:
+        offline = llm_result is None
+        if not offline:
+            self.emit(
+                "llm_end",
+                run_id,
+                success=llm_result.get("success"),
+                elapsed=llm_result.get("elapsed"),
+                prompt_tokens=llm_result.get("prompt_tokens"),
+                completion_tokens=llm_result.get("completion_tokens"),
+                cache_hit=llm_result.get("cache_hit", False),
+                attempts=llm_result.get("attempts"),
+                rate_limit_wait=llm_result.get("rate_limit_wait"),
+                time_to_first_token=llm_result.get("time_to_first_token"),
+            )
+        if offline:
+            timing = {"elapsed": None, "prompt_tokens": None, "completion_tokens": None}
+        elif not llm_result.get("success"):
+            result = {
+                "stage": "llm",
+                "success": False,
+                "error": llm_result.get("error"),
+                "run_id": run_id,
+                "metadata": self.metadata(),
+                "llm_timing": llm_result,
+                "llm_raw": llm_result.get("content", "") or llm_result.get("error", ""),
+            }
+            self.persist_result(result, run_id, prompt, llm_raw=None, parse=None, asp=None)
+            self.copy_support_files(run_id)
+            return {"result": result}
+        else:
             response_text = llm_result["content"]
             timing = llm_result
-        else:
-            timing = {"elapsed": None, "prompt_tokens": None, "completion_tokens": None}
+        return {
+            "run_id": run_id,
+            "prompt": prompt,
+            "response_text": response_text,
+            "timing": timing,
+            "offline": offline,
+            "spans": self.timer.spans,
+        }
+
+    def validate_response(self, pending: Dict) -> Dict:
+        """Validation stage: parse -> build constraints -> clingo -> evaluate -> persist."""
+        # continue the LLM stage's spans (they may come from another process)
+        self.timer = StageTimer(pending.get("spans"))
+        with self.timer.activate():
+            return self.validate_pending(pending)
+
+    def validate_pending(self, pending: Dict) -> Dict:
+        plan = self.prepare_plan(pending)
+        if "result" in plan:
+            return plan["result"]
+        try:
+            asp_started = time.time()
+            with self.timer.span("clingo"):
+                asp_result = self.validator.validate_plan(
+                    plan["actions"],
+                    maxstep=plan["maxstep"],
+                    constraints_text=plan["constraints_text"],
+                    constraints_path=plan["constraints_path"],
+                )
+            raw_clingo = self.validator.last_stdout if hasattr(self.validator, "last_stdout") else None
+            return self.finish_plan(plan, asp_result, raw_clingo, asp_started)
+        except Exception as e:
+            return self.plan_error(plan, e)
 
-        parse_result = self.parser.parse(response_text)
+    def prepare_plan(self, pending: Dict) -> Dict:
+        """
+        Parse the response and build its ASP constraints. Returns the plan to check, or a
+        dict holding the final `result` when parsing or building the constraints failed.
+        """
+        run_id = pending["run_id"]
+        prompt = pending["prompt"]
+        response_text = pending["response_text"]
+        timing = pending["timing"]
+        offline = pending["offline"]
+        self.emit("validate_start", run_id)
+
+        with self.timer.span("parse"):
+            parse_result = self.parser.parse(response_text)
+        self.emit("parse_end", run_id, success=parse_result.get("success"), actions=len(parse_result.get("actions") or []))
         if not parse_result.get("success"):
             result = {
                 "stage": "parse",
@@ -124,87 +410,131 @@ class ExperimentRunner:
             }
             self.persist_result(result, run_id, prompt, response_text, parse_result, asp=None)
             self.copy_support_files(run_id)
-            return result
+            return {"result": result}
 
-        # determine maxstep: use configured value if provided, otherwise len(actions)+1
-        effective_maxstep = self.maxstep or (len(parse_result["actions"]) + 1)
+        reference = self.reference()
+        # determine maxstep: use configured value if provided, otherwise len(actions)+1. A
+        # reference plan of n actions is found at maxstep=n, so with one the spare step (where
+        # the solver may append an action of its own) can be dropped. The reference horizon is
+        # not used as the maxstep: the goal is checked at maxstep, and the steps after a shorter
+        # plan would be left to the solver (Secret Agent keeps its choice rule), which could
+        # complete the plan. A plan shorter than the horizon fails at its own length instead.
+        if self.maxstep:
+            effective_maxstep = self.maxstep
+        elif self.tight_maxstep and reference:
+            effective_maxstep = max(len(parse_result["actions"]), 1)
+        else:
+            effective_maxstep = len(parse_result["actions"]) + 1
 
+        plan = {
+            "run_id": run_id,
+            "prompt": prompt,
+            "response_text": response_text,
+            "timing": timing,
+            "offline": offline,
+            "parse": parse_result,
+            "actions": parse_result["actions"],
+            "reference": reference,
+            "maxstep": effective_maxstep,
+        }
         try:
-            constraints_text = self.parser.build_constraints(parse_result["actions"], maxstep=effective_maxstep)
+            with self.timer.span("constraints"):
+                plan["constraints_text"] = self.parser.build_constraints(
+                    parse_result["actions"], maxstep=effective_maxstep
+                )
             # persist constraints early so we can reuse the file for clingo input
-            constraints_path = self.writer.ensure_dir(run_id) / f"{self.domain}_NarrPlan.lp"
-            constraints_path.write_text(constraints_text)
-            asp_result = self.validator.validate_plan(
-                parse_result["actions"],
-                maxstep=effective_maxstep,
-                constraints_text=constraints_text,
-                constraints_path=str(constraints_path),
-            )
+            constraints_path = self.writer.constraints_path(run_id)
+            if constraints_path is not None:
+                constraints_path.write_text(plan["constraints_text"])
+            plan["constraints_path"] = str(constraints_path) if constraints_path is not None else None
+        except Exception as e:
+            return {"result": self.plan_error(plan, e)}
+        return plan
 
-            evaluation = None
-            if self.evaluator:
+    def finish_plan(self, plan: Dict, asp_result: Dict, raw_clingo: Optional[str], asp_started: float) -> Dict:
+        """Evaluate a checked plan and persist the run's result."""
+        run_id = plan["run_id"]
+        parse_result = plan["parse"]
+        reference = plan["reference"]
+        self.emit(
+            "asp_end",
+            run_id,
+            satisfiable=asp_result.get("satisfiable"),
+            elapsed=time.time() - asp_started,
+            limit_exceeded=asp_result.get("limit_exceeded"),
+        )
+
+        # the solver hit a limit without deciding the plan: nothing to evaluate
+        limit = asp_result.get("limit_exceeded")
+        evaluation = None
+        if self.evaluator and not limit:
+            with self.timer.span("evaluate"):
                 expected_conflicts = 0
                 if self.domain == "western":
                     expected_conflicts = self.expected_conflicts()
-                    evaluation = self.evaluator.evaluate(asp_result, parse_result, expected_conflicts=expected_conflicts)
+                    evaluation = self.evaluator.evaluate(
+                        asp_result, parse_result, reference=reference, expected_conflicts=expected_conflicts
+                    )
                 else:
-                    evaluation = self.evaluator.evaluate(asp_result, parse_result)
+                    evaluation = self.evaluator.evaluate(asp_result, parse_result, reference=reference)
 
-            result = {
-                "stage": "complete",
-                "success": True,
-                "prompt": prompt,
-                "llm_timing": timing,
-                "llm_raw": response_text,
-                "parse": parse_result,
-                "asp": asp_result,
-                "clingo_stdout": self.validator.last_stdout if hasattr(self.validator, "last_stdout") else None,
-                "run_id": run_id,
-                "metadata": self.metadata(),
-                "offline": offline,
-                "evaluation": evaluation,
-            }
-            self.persist_result(
-                result,
-                run_id,
-                prompt,
-                llm_raw=response_text,
-                parse=parse_result,
-                asp=asp_result,
-                raw_clingo=self.validator.last_stdout if hasattr(self.validator, "last_stdout") else None,
-                constraints=constraints_text,
-            )
+        result = {
+            "stage": LIMIT_STAGES[limit] if limit else "complete",
+            "success": not limit,
+            "prompt": plan["prompt"],
+            "llm_timing": plan["timing"],
+            "llm_raw": plan["response_text"],
+            "parse": parse_result,
+            "asp": asp_result,
+            "clingo_stdout": raw_clingo,
+            "run_id": run_id,
+            "metadata": self.metadata(),
+            "offline": plan["offline"],
+            "evaluation": evaluation,
+        }
+        self.persist_result(
+            result,
+            run_id,
+            plan["prompt"],
+            llm_raw=plan["response_text"],
+            parse=parse_result,
+            asp=asp_result,
+            raw_clingo=raw_clingo,
+            constraints=plan["constraints_text"],
+        )
+        self.copy_support_files(run_id)
+        return result
+
+    def plan_error(self, plan: Dict, error: Exception) -> Dict:
+        run_id = plan["run_id"]
+        error_result = {
+            "stage": "error",
+            "success": False,
+            "error": str(error),
+            "run_id": run_id,
+            "metadata": self.metadata(),
+            "prompt": plan["prompt"],
+            "llm_raw": plan["response_text"],
+            "parse": plan["parse"],
+            "offline": plan["offline"],
+            "llm_timing": plan["timing"],
+        }
+        self.persist_result(
+            error_result,
+            run_id,
+            plan["prompt"],
+            llm_raw=plan["response_text"],
+            parse=plan["parse"],
+            asp=None,
+            raw_clingo=None,
+            constraints=None,
+        )
+        # still try to copy support files for debugging
+        try:
             self.copy_support_files(run_id)
-            return result
-        except Exception as e:
-            error_result = {
-                "stage": "error",
-                "success": False,
-                "error": str(e),
-                "run_id": run_id,
-                "metadata": self.metadata(),
-                "prompt": prompt,
-                "llm_raw": response_text,
-                "parse": parse_result,
-                "offline": offline,
-                "llm_timing": timing,
-            }
-            self.persist_result(
-                error_result,
-                run_id,
-                prompt,
-                llm_raw=response_text,
-                parse=parse_result,
-                asp=None,
-                raw_clingo=None,
-                constraints=None,
-            )
-            # still try to copy support files for debugging
-            try:
-                self.copy_support_files(run_id)
-            except Exception:
-                pass
-            return error_result
+        except Exception:
+            pass
+        return error_result
 
     def make_client(self, api_key: Optional[str]):
         if self.provider == "openrouter":
@@ -213,8 +543,10 @@ class ExperimentRunner:
             return OpenRouterClient(
                 self.model,
                 api_key=api_key,
+                temperature=self.temperature,
                 max_tokens=self.max_tokens,
                 max_output_tokens=self.max_output_tokens,
+                base_url=self.llm_cfg.base_url if self.llm_cfg else None,
             )
         if self.provider == "openai":
             from benchmark.llm_clients.openai_client import OpenAIClient
@@ -222,8 +554,10 @@ class ExperimentRunner:
             return OpenAIClient(
                 self.model,
                 api_key=api_key,
+                temperature=self.temperature,
                 max_tokens=self.max_tokens,
                 max_output_tokens=self.max_output_tokens,
+                base_url=self.llm_cfg.base_url if self.llm_cfg else None,
             )
         if self.provider == "anthropic":
             from benchmark.llm_clients.anthropic_client import AnthropicClient
@@ -232,17 +566,29 @@ class ExperimentRunner:
         raise ValueError(f"Unsupported provider {self.provider}")
 
     def metadata(self) -> Dict:
-        return {
+        meta = {
             "domain": self.domain,
             "asp_version": self.asp_version,
             "model": self.model,
             "instance": self.instance_label,
             "maxstep": self.maxstep,
+            "sample_index": self.sample_index,
         }
+        if self.revalidated_from:
+            meta["revalidated_from"] = self.revalidated_from
+        return meta
 
     def expected_conflicts(self) -> int:
         return 0
 
+    def reference(self) -> Optional[Dict]:
+        """Precomputed shortest plan of the instance, if any (`benchmark/asp/reference_plans.py`)."""
+        try:
+            return get_reference(self.domains_root, self.domain, self.asp_version, self.instance_dir)
+        except Exception:
+            # an unreadable catalog only costs the optimality metrics
+            return None
+
     def persist_result(
         self,
         result: Dict,
@@ -254,19 +600,26 @@ class ExperimentRunner:
         raw_clingo: Optional[str] = None,
         constraints: Optional[str] = None,
     ) -> None:
-        self.writer.write(run_id, result, prompt, llm_raw, parse, asp, raw_clingo=raw_clingo, constraints=constraints)
-        self.writer.append_log(run_id, result)
+        # live references: stages timed after this (the write itself, support files) still
+        # show up in the returned result, though not in the persisted copy
+        result["stage_timings"] = self.timer.totals
+        result["spans"] = self.timer.spans
+        with self.timer.span("write"):
+            self.writer.write(
+                run_id, result, prompt, llm_raw, parse, asp, raw_clingo=raw_clingo, constraints=constraints
+            )
+            self.writer.append_log(run_id, result)
+        self.emit("run_end", run_id, stage=result.get("stage"), success=result.get("success"))
 
     def copy_support_files(self, run_id: str) -> None:
-        dest_dir = self.writer.ensure_dir(run_id)
         domain_root_dir = (self.domains_root / self.domain / self.asp_version).resolve()
         instance_root_dir = self.instance_dir.resolve()
         clingo_input_files = self.validator.clingo_input_files()
-        copier = SupportFilesCopier()
-        copier.copy_support_files(
-            dest_dir=dest_dir,
-            clingo_input_files=clingo_input_files,
-            domain_root_dir=domain_root_dir,
-            instance_root_dir=instance_root_dir,
-            response_file_dir=self.response_file_dir,
-        )
+        with self.timer.span("support_files"):
+            self.writer.copy_support_files(
+                run_id,
+                clingo_input_files=clingo_input_files,
+                domain_root_dir=domain_root_dir,
+                instance_root_dir=instance_root_dir,
+                response_file_dir=self.response_file_dir,
+            )
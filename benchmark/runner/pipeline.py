@@ -0,0 +1,256 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from benchmark.asp.solver_limits import cancellable_task, install_worker_cancellation
+from benchmark.runner.experiment_runner import ExperimentRunner, validate_responses
+
+
+def validate_in_worker(runner_kwargs: Dict, pending: Dict) -> Dict:
+    """Process-pool entry point: rebuild the runner in the worker and finish the run there."""
+    with cancellable_task():
+        return ExperimentRunner(**runner_kwargs).validate_response(pending)
+
+
+def validate_batch_in_worker(runner_kwargs: List[Dict], pendings: List[Dict]) -> List[Dict]:
+    """Process-pool entry point for runs on one instance, checked by a single batched solver call."""
+    with cancellable_task():
+        return validate_responses([ExperimentRunner(**kwargs) for kwargs in runner_kwargs], pendings)
+
+
+# put on a pipeline's done queue by its feeder, with the number of tasks it fed
+FED = object()
+
+
+def make_validation_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn (not fork): the parent already runs LLM threads and may hold clingo state
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=install_worker_cancellation
+    )
+
+
+def cancel_validation(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop queued validations and terminate the workers instead of waiting for running ones;
+    each worker's SIGTERM handler kills its clingo children first.
+    """
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+class StagedPipeline:
+    """
+    Two-stage executor for a sweep.
+
+    Stage 1 (LLM) runs on a thread pool since it is I/O bound. Stage 2 (parse ->
+    build_constraints -> clingo -> evaluate -> persist) runs on a process pool sized to the
+    machine's cores. Each stage admits at most `workers + queue_size` items; when stage 2 is
+    saturated, finished LLM threads wait for a slot instead of piling up responses.
+
+    `llm_stage(task)` must return `(runner_kwargs, pending)` where `pending` is the output of
+    `ExperimentRunner.generate`; a pending dict with a `result` key is final and skips stage 2.
+    Stage 2 calls `validate(runner_kwargs, pending)` in a worker; with
+    `validate_batch_in_worker` a task is a batch of runs and its outcome a list of results.
+    `tasks` may be a generator: the next task is only taken once a stage-1 slot is free.
+    """
+
+    def __init__(
+        self,
+        llm_stage: Callable[[Tuple], Tuple[Dict, Dict]],
+        llm_workers: int,
+        validation_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        validate: Callable = validate_in_worker,
+    ):
+        self.llm_stage = llm_stage
+        self.validate = validate
+        self.llm_workers = max(1, llm_workers)
+        self.validation_workers = max(1, validation_workers or os.cpu_count() or 1)
+        self.llm_queue_size = queue_size if queue_size is not None else self.llm_workers
+        self.validation_queue_size = queue_size if queue_size is not None else self.validation_workers
+
+    def run(self, tasks: Iterable[Tuple]) -> Iterator[Tuple[Tuple, Dict]]:
+        """Yield `(task, result)` in completion order; re-raises the first stage error."""
+        done: "queue.Queue" = queue.Queue()
+        llm_slots = threading.BoundedSemaphore(self.llm_workers + self.llm_queue_size)
+        validation_slots = threading.BoundedSemaphore(self.validation_workers + self.validation_queue_size)
+        stop = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.llm_workers) as llm_pool, make_validation_pool(
+            self.validation_workers
+        ) as validation_pool:
+
+            def on_validated(task, future):
+                validation_slots.release()
+                error = future.exception()
+                done.put((task, error if error is not None else future.result()))
+
+            def llm_then_validate(task):
+                try:
+                    runner_kwargs, pending = self.llm_stage(task)
+                    if "result" in pending:
+                        done.put((task, pending["result"]))
+                        return
+                    validation_slots.acquire()
+                    try:
+                        future = validation_pool.submit(self.validate, runner_kwargs, pending)
+                    except BaseException:
+                        validation_slots.release()
+                        raise
+                    future.add_done_callback(lambda f: on_validated(task, f))
+                except BaseException as e:
+                    done.put((task, e))
+                finally:
+                    llm_slots.release()
+
+            def feed():
+                fed = 0
+                try:
+                    it = iter(tasks)
+                    while True:
+                        llm_slots.acquire()
+                        task = next(it, FED) if not stop.is_set() else FED
+                        if task is FED:
+                            llm_slots.release()
+                            break
+                        llm_pool.submit(llm_then_validate, task)
+                        fed += 1
+                except BaseException as e:
+                    done.put((None, e))
+                done.put((fed, FED))
+
+            feeder = threading.Thread(target=feed, name="pipeline-feeder", daemon=True)
+            feeder.start()
+            try:
+                yield from drain(done)
+            except BaseException:
+                # cancelled (Ctrl-C, SIGTERM) or failed: don't wait for running clingo checks
+                cancel_validation(validation_pool)
+                raise
+            finally:
+                stop.set()
+                feeder.join()
+
+
+class AsyncStagedPipeline:
+    """
+    Same two stages as `StagedPipeline`, but the LLM stage is a coroutine per task on one
+    event loop, so thousands of in-flight requests cost coroutines rather than threads.
+
+    At most `concurrency` tasks are in the LLM stage; a task keeps its LLM slot until it has
+    a validation slot, which bounds how many responses can wait for the process pool.
+    `llm_stage(task)` is a coroutine returning `(runner_kwargs, pending)`. As with
+    `StagedPipeline`, `tasks` may be a generator; it is advanced on the loop's default executor.
+    """
+
+    def __init__(
+        self,
+        llm_stage: Callable[[Tuple], Awaitable[Tuple[Dict, Dict]]],
+        concurrency: int,
+        validation_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self.llm_stage = llm_stage
+        self.concurrency = max(1, concurrency)
+        self.validation_workers = max(1, validation_workers or os.cpu_count() or 1)
+        self.validation_queue_size = queue_size if queue_size is not None else self.validation_workers
+
+    def run(self, tasks: Iterable[Tuple]) -> Iterator[Tuple[Tuple, Dict]]:
+        """Yield `(task, result)` in completion order; the event loop runs on a helper thread."""
+        done: "queue.Queue" = queue.Queue()
+        loop = asyncio.new_event_loop()
+        main_task = loop.create_task(self.arun(tasks, done))
+
+        def drive():
+            try:
+                loop.run_until_complete(main_task)
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=drive, name="pipeline-loop", daemon=True)
+        thread.start()
+        try:
+            yield from drain(done)
+        finally:
+            loop.call_soon_threadsafe(main_task.cancel)
+            thread.join()
+            loop.close()
+
+    async def arun(self, tasks: Iterable[Tuple], done: "queue.Queue") -> None:
+        from benchmark.llm_clients.sessions import aclose_async_clients
+
+        llm_slots = asyncio.Semaphore(self.concurrency)
+        validation_slots = asyncio.Semaphore(self.validation_workers + self.validation_queue_size)
+        loop = asyncio.get_running_loop()
+
+        async def one(task, validation_pool):
+            # the feeder took this task's LLM slot
+            try:
+                try:
+                    runner_kwargs, pending = await self.llm_stage(task)
+                    if "result" in pending:
+                        done.put((task, pending["result"]))
+                        return
+                    await validation_slots.acquire()
+                finally:
+                    llm_slots.release()
+                try:
+                    result = await loop.run_in_executor(validation_pool, validate_in_worker, runner_kwargs, pending)
+                finally:
+                    validation_slots.release()
+                done.put((task, result))
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                done.put((task, e))
+
+        with make_validation_pool(self.validation_workers) as pool:
+            running = set()
+            fed = 0
+            try:
+                it = iter(tasks)
+                while True:
+                    await llm_slots.acquire()
+                    try:
+                        # a generator may block (e.g. waiting for queued work), so not on the loop
+                        task = await loop.run_in_executor(None, next, it, FED)
+                    except Exception as e:
+                        done.put((None, e))
+                        task = FED
+                    if task is FED:
+                        llm_slots.release()
+                        break
+                    running.add(loop.create_task(one(task, pool)))
+                    running = {t for t in running if not t.done()}
+                    fed += 1
+                done.put((fed, FED))
+                await asyncio.gather(*running)
+            except BaseException:
+                for t in running:
+                    t.cancel()
+                cancel_validation(pool)
+                raise
+            finally:
+                await aclose_async_clients()
+
+
+def drain(done: "queue.Queue") -> Iterator[Tuple[Tuple, Dict]]:
+    """`(task, outcome)` pairs of a pipeline's done queue until every fed task has one."""
+    fed = None
+    received = 0
+    while fed is None or received < fed:
+        task, outcome = done.get()
+        if outcome is FED:
+            fed = task
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+        received += 1
+        yield task, outcome
@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmark.io.artifact_writer import STORE_DIRNAME
+
+NO_TIMING = {"elapsed": None, "prompt_tokens": None, "completion_tokens": None}
+
+
+def find_saved_runs(results_root: Path) -> List[Path]:
+    """Artifact dirs under `results_root` that hold an LLM response and its result.json."""
+    return sorted(p.parent for p in results_root.rglob("llm_raw.txt") if (p.parent / "result.json").exists())
+
+
+def find_saved_stores(results_root: Path) -> List[Path]:
+    """Columnar stores (`artifact_backend: parquet`) under `results_root`, including the root itself."""
+    candidates = [results_root, *results_root.rglob(STORE_DIRNAME)]
+    return sorted(p for p in candidates if p.name == STORE_DIRNAME and (p / "runs").is_dir())
+
+
+def resolve_saved_instance_dir(run_dir: Path, domains_root: Path, domain: str, instance_label: str) -> Path:
+    """Prefer the live instance under `domains_root`; fall back to the copy saved with the run."""
+    candidate = domains_root / domain / "instances" / instance_label
+    saved_copy = run_dir / "instance_constraints"
+    if not (candidate / "instance.lp").exists() and (saved_copy / "instance.lp").exists():
+        return saved_copy
+    return candidate
+
+
+def load_saved_run(run_dir: Path, domains_root: Path) -> Optional[Dict]:
+    """
+    Read one saved run for re-validation.
+
+    Returns the source metadata, the stored response/prompt/timing and the resolved instance
+    dir, or None if the run is not a complete LLM response (e.g. prompt-only).
+    """
+    try:
+        saved = json.loads((run_dir / "result.json").read_text())
+    except (OSError, ValueError):
+        return None
+    meta = saved.get("metadata") or {}
+    if not meta.get("domain") or not meta.get("instance") or saved.get("stage") == "prompt_only":
+        return None
+    prompt_path = run_dir / "prompt.txt"
+    return {
+        "run_dir": run_dir,
+        "run_id": saved.get("run_id"),
+        "metadata": meta,
+        "stage": saved.get("stage"),
+        "satisfiable": (saved.get("asp") or {}).get("satisfiable"),
+        "prompt": prompt_path.read_text() if prompt_path.exists() else saved.get("prompt", ""),
+        "response_text": (run_dir / "llm_raw.txt").read_text(),
+        "timing": saved.get("llm_timing") or dict(NO_TIMING),
+        "instance_dir": resolve_saved_instance_dir(run_dir, domains_root, meta["domain"], meta["instance"]),
+    }
+
+
+def load_stored_runs(store: Path, domains_root: Path) -> List[Dict]:
+    """
+    `load_saved_run` for every run of a columnar store (latest row per run_id). `run_dir` is
+    the store, and the instance is always the live one, since stores keep no instance copy.
+    """
+    from benchmark.io.columnar_store import load_blobs, load_table, read_results
+
+    results = read_results(store)
+    table = load_table(store, "runs", columns=["run_id", "written_at", "prompt_sha256", "llm_raw_sha256"])
+    latest: Dict[str, Tuple] = {}
+    for run_id, written_at, prompt_sha, raw_sha in zip(*(table.column(c).to_pylist() for c in table.column_names)):
+        if run_id not in latest or written_at >= latest[run_id][0]:
+            latest[run_id] = (written_at, prompt_sha, raw_sha)
+    blobs = load_blobs(store, [sha for _, prompt_sha, raw_sha in latest.values() for sha in (prompt_sha, raw_sha)])
+    saved_runs = []
+    for run_id in sorted(latest):
+        _, prompt_sha, raw_sha = latest[run_id]
+        saved = results[run_id]
+        meta = saved.get("metadata") or {}
+        if raw_sha not in blobs or not meta.get("domain") or not meta.get("instance"):
+            continue
+        if saved.get("stage") == "prompt_only":
+            continue
+        saved_runs.append(
+            {
+                "run_dir": store,
+                "run_id": run_id,
+                "metadata": meta,
+                "stage": saved.get("stage"),
+                "satisfiable": (saved.get("asp") or {}).get("satisfiable"),
+                "prompt": blobs.get(prompt_sha, ""),
+                "response_text": blobs[raw_sha],
+                "timing": saved.get("llm_timing") or dict(NO_TIMING),
+                "instance_dir": domains_root / meta["domain"] / "instances" / meta["instance"],
+            }
+        )
+    return saved_runs
+
+
+def batch_saved_runs(saved_runs: List[Dict], batch_size: int) -> List[List[Tuple[int, Dict]]]:
+    """
+    Number the saved runs from 1 and group runs on the same (domain, asp_version, instance)
+    into batches of at most `batch_size`, in order of first appearance.
+    """
+    groups: Dict[Tuple, List[Tuple[int, Dict]]] = {}
+    for i, saved in enumerate(saved_runs, start=1):
+        meta = saved["metadata"]
+        key = (meta["domain"], meta.get("asp_version"), str(saved["instance_dir"]))
+        groups.setdefault(key, []).append((i, saved))
+    size = max(1, batch_size)
+    return [runs[j : j + size] for runs in groups.values() for j in range(0, len(runs), size)]
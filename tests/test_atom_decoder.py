@@ -0,0 +1,112 @@
+import pytest
+
+from benchmark.asp.atom_decoder import decode_witness, split_arguments, string_value
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("conflict", ("conflict", [])),
+        ("act(jasmine,snakebite,2)", ("act", ["jasmine", "snakebite", "2"])),
+        (
+            "unjustified(agent_1,alive(agent_2,f),dead(x),3)",
+            ("unjustified", ["agent_1", "alive(agent_2,f)", "dead(x)", "3"]),
+        ),
+        ("f(g(h(a,b),c),d)", ("f", ["g(h(a,b),c)", "d"])),
+        ('nonexec_feedback("a, (b",act(x,y,1))', ("nonexec_feedback", ['"a, (b"', "act(x,y,1)"])),
+        ('f("say \\"hi, there\\"",b)', ("f", ['"say \\"hi, there\\""', "b"])),
+        ('f("back\\\\",b)', ("f", ['"back\\\\"', "b"])),
+    ],
+)
+def test_split_arguments(term, expected):
+    assert split_arguments(term) == expected
+
+
+@pytest.mark.parametrize("term", ["f(a,b", "f(a,(b)", 'f("a,b)', "f(a,g(b),c(d)"])
+def test_split_arguments_rejects_unbalanced_terms(term):
+    with pytest.raises(ValueError):
+        split_arguments(term)
+
+
+def test_string_value_unescapes():
+    assert string_value('"plain"') == "plain"
+    assert string_value('"a \\"b\\" c\\\\d\\n"') == 'a "b" c\\d\n'
+    with pytest.raises(ValueError):
+        string_value("unquoted")
+
+
+def test_nonexec_feedback_with_act3():
+    decoded = decode_witness(['nonexec_feedback("Snake is not here",act(jasmine,snakebite,2))'])
+    assert decoded["nonexec_feedback"] == [
+        {"message": "Snake is not here", "subject": "jasmine", "action": "snakebite", "time": 2}
+    ]
+
+
+def test_nonexec_feedback_with_intentional_act4():
+    decoded = decode_witness(['nonexec_feedback("m",act(aladdin,kill(jafar),alive(agent_1),5))'])
+    assert decoded["nonexec_feedback"] == [
+        {"message": "m", "subject": "aladdin", "action": "kill(jafar)", "intention": "alive(agent_1)", "time": 5}
+    ]
+
+
+def test_nonexec_feedback_arity_3_takes_subject_from_action():
+    decoded = decode_witness(
+        [
+            'nonexec_feedback("Destination isn\'t connected to starting location",move(secret_agent,l3_3),4)',
+            'nonexec_feedback("No key",pickup(secret_agent),7)',
+        ]
+    )
+    assert decoded["nonexec_feedback"] == [
+        {
+            "message": "Destination isn't connected to starting location",
+            "subject": "secret_agent",
+            "action": "move(l3_3)",
+            "time": 4,
+        },
+        {"message": "No key", "subject": "secret_agent", "action": "pickup", "time": 7},
+    ]
+
+
+def test_quoted_commas_parentheses_and_escapes_stay_in_the_message():
+    decoded = decode_witness(['nonexec_feedback("a, (b\\" c",act(jasmine,snakebite,2))'])
+    assert decoded["nonexec_feedback"][0]["message"] == 'a, (b" c'
+    assert decoded["nonexec_feedback"][0]["subject"] == "jasmine"
+
+
+def test_multi_argument_fluents():
+    decoded = decode_witness(
+        [
+            "unjustified(agent_1,alive(agent_2,f),dead(x),3)",
+            "open_commitment_frame(jafar,has(jafar,lamp,t))",
+            "conflict(jafar,has(jafar,lamp),aladdin,has(aladdin,lamp),act(jafar,steal(lamp),3))",
+        ]
+    )
+    assert decoded["unjustified"] == [
+        {"subject": "agent_1", "fluent": "alive(agent_2,f)", "intention": "dead(x)", "time": 3}
+    ]
+    assert decoded["open_commitment_frames"] == [{"subject": "jafar", "intention": "has(jafar,lamp,t)"}]
+    conflict = decoded["conflicts"][0]
+    assert conflict["threatened_intention"] == "has(aladdin,lamp)"
+    assert conflict["action"] == "act(jafar,steal(lamp),3)"
+    assert conflict["summary"].startswith("jafar (intends has(jafar,lamp)) threatens aladdin's")
+
+
+@pytest.mark.parametrize(
+    "atom, key",
+    [
+        ("nonexec_feedback(1,2,3)", "nonexec_feedback"),
+        ('nonexec_feedback("m",act(a,b))', "nonexec_feedback"),
+        ("nonexec_feedback(a,b,c,d)", "nonexec_feedback"),
+        ("unjustified(a,b(,c,d)", "unjustified"),
+        ("conflict", "conflicts"),
+    ],
+)
+def test_malformed_atoms_are_kept_as_strings(atom, key):
+    assert decode_witness([atom])[key] == [atom]
+
+
+def test_acts_are_kept_and_other_predicates_skipped():
+    decoded = decode_witness(["fl(at(x,l1),0)", "act(jasmine,snakebite,2)", "act(a,kill(b),alive(c),1)", "goal"])
+    assert decoded["acts"] == ["act(jasmine,snakebite,2)", "act(a,kill(b),alive(c),1)"]
+    assert decoded["nonexec_feedback"] == decoded["unjustified"] == []
+    assert set(decoded) == {"nonexec_feedback", "unjustified", "open_commitment_frames", "conflicts", "acts"}
@@ -0,0 +1,63 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmark.asp.validator import ASPValidator
+
+pytest.importorskip("clingo")
+CLINGO = shutil.which("clingo")
+pytestmark = pytest.mark.skipif(CLINGO is None, reason="needs the clingo executable")
+
+DOMAINS = Path(__file__).resolve().parents[1] / "benchmark" / "domains"
+INSTANCE = DOMAINS / "secret_agent/instances/random_grid_4x4_4obstacle_1key/random_grid_4x4_4obstacle_1key_0"
+# the reference plan of the instance
+PLAN = [
+    "act(secret_agent,move(l1_0),0)",
+    "act(secret_agent,move(l1_1),1)",
+    "act(secret_agent,move(l2_1),2)",
+    "act(secret_agent,move(l3_1),3)",
+    "act(secret_agent,pickup(gun),4)",
+    "act(secret_agent,move(l2_1),5)",
+    "act(secret_agent,move(l2_2),6)",
+    "act(secret_agent,move(l2_3),7)",
+    "act(secret_agent,move(l3_3),8)",
+    "act(secret_agent,kill(mastermind,gun),9)",
+]
+
+
+def constraints(acts):
+    return "".join(f":- not {a}.\n" for a in acts)
+
+
+def validator(api, first_model_only):
+    return ASPValidator(
+        "secret_agent",
+        DOMAINS / "secret_agent" / "base",
+        INSTANCE,
+        clingo_path=CLINGO,
+        use_clingo_api=api,
+        first_model_only=first_model_only,
+        incremental=api,
+    )
+
+
+@pytest.mark.parametrize("first_model_only", [True, False])
+@pytest.mark.parametrize(
+    "maxstep, acts",
+    [(10, PLAN), (11, PLAN[:9]), (3, PLAN[:3])],
+    ids=["plan", "solver_completes", "unsatisfiable"],
+)
+def test_incremental_stats_match_subprocess(first_model_only, maxstep, acts):
+    subprocess_validator = validator(False, first_model_only)
+    incremental_validator = validator(True, first_model_only)
+    expected = subprocess_validator.validate_plan([], maxstep=maxstep, constraints_text=constraints(acts))
+    result = incremental_validator.validate_plan([], maxstep=maxstep, constraints_text=constraints(acts))
+
+    assert result["api_strategy"] == "incremental"
+    assert result["satisfiable"] == expected["satisfiable"]
+    for key in ("models", "exhausted"):
+        assert result["solver_stats"][key] == expected["solver_stats"][key], key
+    models = json.loads(incremental_validator.last_stdout)["Models"]
+    assert models == json.loads(subprocess_validator.last_stdout)["Models"]
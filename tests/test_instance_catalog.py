@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+from benchmark import instance_catalog
+from benchmark.instance_catalog import load_catalog, parse_selector, select_instances, update_catalog
+
+
+def entry(group, index, grid=None, obstacles=None):
+    return {
+        "group": group,
+        "name": f"{group}_{index}",
+        "path": f"instances/{group}/{group}_{index}",
+        "index": index,
+        "grid": grid,
+        "obstacles": obstacles,
+    }
+
+
+ENTRIES = [
+    *(entry("grid_4x4", i, "4x4", i % 3) for i in range(10)),
+    *(entry("grid_8x8", i, "8x8", i % 5) for i in range(10)),
+    *(entry("grid_12x12", i, "12x12", 4) for i in range(10)),
+]
+
+
+def names(entries):
+    return [e["name"] for e in entries]
+
+
+def test_parse_selector_filters_and_directives():
+    filters, directives = parse_selector("grid=4x4,8x8 obstacles>=2 name!=*_3 by=grid per=5 seed=7")
+    assert filters == [("grid", "=", ["4x4", "8x8"]), ("obstacles", ">=", ["2"]), ("name", "!=", ["*_3"])]
+    assert directives == {"by": ["grid"], "per": 5, "seed": 7}
+
+
+def test_parse_selector_accepts_terms_and_none():
+    assert parse_selector(["grid=4x4", "first=2"]) == parse_selector("grid=4x4 first=2")
+    assert parse_selector(None) == ([], {})
+
+
+@pytest.mark.parametrize(
+    "selector",
+    ["grid", "colour=red", "grid>4x4", "obstacles=many", "per>=3", "by=colour per=1"],
+)
+def test_parse_selector_rejects_bad_terms(selector):
+    with pytest.raises(ValueError):
+        parse_selector(selector)
+
+
+def test_filters():
+    assert names(select_instances(ENTRIES, "grid=12x12 index<2")) == ["grid_12x12_0", "grid_12x12_1"]
+    assert names(select_instances(ENTRIES, "group=grid_4x4 obstacles=2")) == ["grid_4x4_2", "grid_4x4_5", "grid_4x4_8"]
+    assert len(select_instances(ENTRIES, "grid!=4x4,8x8")) == 10
+    assert len(select_instances(ENTRIES, "name=grid_?x?_1")) == 2
+    assert select_instances(ENTRIES, None) == ENTRIES
+
+
+def test_first_takes_lowest_indices_per_stratum_in_catalog_order():
+    picked = select_instances(ENTRIES, "first=2")
+    assert names(picked) == ["grid_4x4_0", "grid_4x4_1", "grid_8x8_0", "grid_8x8_1", "grid_12x12_0", "grid_12x12_1"]
+
+
+def test_per_is_seeded_and_stable_when_other_strata_are_filtered_out():
+    picked = select_instances(ENTRIES, "per=3 seed=1")
+    assert len(picked) == 9
+    assert picked == select_instances(ENTRIES, "per=3 seed=1")
+    assert picked != select_instances(ENTRIES, "per=3 seed=2")
+    only_8x8 = select_instances(ENTRIES, "grid=8x8 per=3 seed=1")
+    assert only_8x8 == [e for e in picked if e["grid"] == "8x8"]
+
+
+def test_by_sets_the_strata():
+    picked = select_instances(ENTRIES, "grid=8x8 by=obstacles first=1")
+    assert sorted(e["obstacles"] for e in picked) == [0, 1, 2, 3, 4]
+
+
+def test_sample_draws_from_what_is_left():
+    picked = select_instances(ENTRIES, "grid=4x4,8x8 sample=4 seed=0")
+    assert len(picked) == 4
+    assert all(e["grid"] in ("4x4", "8x8") for e in picked)
+    assert picked == select_instances(ENTRIES, "grid=4x4,8x8 sample=4 seed=0")
+
+
+@pytest.fixture
+def domains(tmp_path, monkeypatch):
+    """A domain with two 4x4 instances; the catalog cache lives in the test's tmp dir."""
+    monkeypatch.setattr(instance_catalog, "CATALOG_DIR", tmp_path / "cache")
+    group = tmp_path / "domains" / "toy" / "instances" / "grid_4x4_2obstacle"
+    for i in range(2):
+        instance = group / f"grid_4x4_2obstacle_{i}"
+        instance.mkdir(parents=True)
+        (instance / "instance.lp").write_text("character(a).\nplace(l1).\nplace(l2).\n")
+        (instance / "matrix.txt").write_text("0000\n0100\n0010\n0000\n")
+    return tmp_path / "domains"
+
+
+def rescanned(monkeypatch):
+    """Names of the instances `describe_instance` is called for from now on."""
+    names = []
+    describe = instance_catalog.describe_instance
+
+    def spy(domains_root, domain, instance_dir):
+        names.append(instance_dir.name)
+        return describe(domains_root, domain, instance_dir)
+
+    monkeypatch.setattr(instance_catalog, "describe_instance", spy)
+    return names
+
+
+def test_catalog_rescans_only_instances_whose_files_changed(domains, monkeypatch):
+    first = load_catalog(domains, "toy")
+    assert [(e["grid"], e["obstacles"], e["places"]) for e in first] == [("4x4", 2, 2), ("4x4", 2, 2)]
+    names = rescanned(monkeypatch)
+    assert load_catalog(domains, "toy") == first
+    assert names == []
+
+    instance = domains / "toy" / "instances" / "grid_4x4_2obstacle" / "grid_4x4_2obstacle_1"
+    (instance / "instance.lp").write_text("character(a).\nplace(l1).\nplace(l2).\nplace(l3).\n")
+    (instance / "matrix.txt").write_text("000000\n010000\n001000\n000100\n")
+    edited = load_catalog(domains, "toy")
+    assert names == ["grid_4x4_2obstacle_1"]
+    assert (edited[1]["places"], edited[1]["grid"], edited[1]["obstacles"]) == (3, "6x4", 3)
+    assert edited[1]["files"] != first[1]["files"] and edited[1]["sha256"] != first[1]["sha256"]
+    assert edited[0] == first[0]
+
+
+def test_catalog_notices_same_size_edits_and_new_files(domains, monkeypatch):
+    before = load_catalog(domains, "toy")[0]
+    names = rescanned(monkeypatch)
+    instance = domains / "toy" / "instances" / "grid_4x4_2obstacle" / "grid_4x4_2obstacle_0"
+    lp = instance / "instance.lp"
+    stat = lp.stat()
+    lp.write_text("character(b).\nplace(l1).\nplace(l2).\n")
+    os.utime(lp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert lp.stat().st_size == stat.st_size
+    assert load_catalog(domains, "toy")[0]["files"]["instance.lp"] != before["files"]["instance.lp"]
+    assert names == ["grid_4x4_2obstacle_0"]
+
+    names.clear()
+    (instance / "loyalty.txt").write_text("a b\n")
+    assert "loyalty.txt" in load_catalog(domains, "toy")[0]["files"]
+    assert names == ["grid_4x4_2obstacle_0"]
+
+
+def test_references_survive_rescans_of_unchanged_files(domains):
+    load_catalog(domains, "toy")
+    path = "toy/instances/grid_4x4_2obstacle/grid_4x4_2obstacle_0"
+    update_catalog(domains, "toy", {path: {"reference": {"base": {"status": "solved"}}}})
+    instance = domains / path
+    # touched but identical: rescanned, and the reference is kept
+    os.utime(instance / "instance.lp", ns=(0, 0))
+    assert load_catalog(domains, "toy")[0]["reference"] == {"base": {"status": "solved"}}
+    (instance / "instance.lp").write_text("character(c).\n")
+    assert "reference" not in load_catalog(domains, "toy")[0]
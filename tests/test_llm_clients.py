@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmark.llm_clients.openai_client import OpenAIClient
+from benchmark.llm_clients.openrouter_client import OpenRouterClient
+from benchmark.llm_clients.sessions import aclose_async_clients
+
+# non-ASCII on purpose: SSE responses carry no charset and must still decode as UTF-8
+DELTAS = ["Plan: ", "move → l1_0", ", café"]
+CONTENT = "".join(DELTAS)
+USAGE = {"prompt_tokens": 11, "completion_tokens": 7, "total_tokens": 18}
+
+
+def completion(model):
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": CONTENT}}],
+        "usage": USAGE,
+    }
+
+
+def chunks(model):
+    base = {"id": "cmpl-1", "object": "chat.completion.chunk", "created": 0, "model": model}
+    for delta in DELTAS:
+        yield {**base, "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    yield {**base, "choices": [], "usage": USAGE}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """OpenAI-style chat endpoint; the prompt `throttle` gets a 429 and `fail` a 500."""
+
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers=()):
+        out = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append({"path": self.path, "authorization": self.headers.get("Authorization"), "body": body})
+        prompt = body["messages"][0]["content"]
+        if prompt == "throttle":
+            return self.send_json(429, {"error": {"message": "rate limited"}}, [("Retry-After", "7")])
+        if prompt == "fail":
+            return self.send_json(500, {"error": {"message": "upstream failed"}})
+        if not body.get("stream"):
+            return self.send_json(200, completion(body["model"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for chunk in chunks(body["model"]):
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["openrouter", "openai"])
+def client(request, base_url):
+    Handler.requests.clear()
+    if request.param == "openrouter":
+        return OpenRouterClient("test/model", api_key="key", base_url=base_url, max_tokens=64)
+    return OpenAIClient("test-model", api_key="key", base_url=base_url, max_tokens=64)
+
+
+def run(coro):
+    """Run a client coroutine on a fresh loop, closing the loop's shared clients afterwards."""
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose_async_clients()
+
+    return asyncio.run(main())
+
+
+def generate(client, mode, prompt, on_delta=None):
+    if mode == "sync":
+        return client.generate(prompt)
+    if mode == "async":
+        return run(client.agenerate(prompt))
+    if mode == "stream":
+        return client.generate_stream(prompt, on_delta)
+    return run(client.agenerate_stream(prompt, on_delta))
+
+
+MODES = ["sync", "async", "stream", "astream"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_generate(client, mode):
+    result = generate(client, mode, "plan please")
+
+    assert result["success"], result
+    assert result["content"] == CONTENT
+    assert (result["prompt_tokens"], result["completion_tokens"]) == (11, 7)
+    request = Handler.requests[-1]
+    assert request["path"] == "/v1/chat/completions"
+    assert request["authorization"] == "Bearer key"
+    assert request["body"]["messages"] == [{"role": "user", "content": "plan please"}]
+    assert request["body"]["stream"] == (mode in ("stream", "astream"))
+    if mode in ("stream", "astream"):
+        assert result["stream_chunks"] == len(DELTAS)
+        assert result["time_to_first_token"] is not None
+        assert not result["aborted"]
+
+
+@pytest.mark.parametrize("mode", ["stream", "astream"])
+def test_stream_abort(client, mode):
+    seen = []
+    result = generate(client, mode, "plan please", on_delta=lambda delta: seen.append(delta) and False)
+
+    assert result["success"] and result["aborted"]
+    assert seen == DELTAS[:1]
+    assert result["content"] == DELTAS[0]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_throttled(client, mode):
+    result = generate(client, mode, "throttle")
+
+    assert not result["success"]
+    assert result["status_code"] == 429
+    assert result["retriable"]
+    assert result["retry_after"] == 7.0
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_server_error(client, mode):
+    result = generate(client, mode, "fail")
+
+    assert not result["success"]
+    assert result["status_code"] == 500
+    assert result["retriable"]
+    assert result["retry_after"] is None
+
+
+def test_connection_error_is_retriable():
+    # nothing listens on the discard port
+    result = OpenRouterClient("test/model", api_key="key", base_url="http://127.0.0.1:9/v1").generate("plan please")
+
+    assert not result["success"]
+    assert result["status_code"] is None
+    assert result["retriable"]
@@ -0,0 +1,182 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from benchmark.llm_clients import rate_limiter
+from benchmark.llm_clients.rate_limiter import AimdController, ProviderLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the `time` module: sleeping advances `monotonic` instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def asleep(self, seconds):
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.asleep)
+    # backoff without jitter: the full exponential delay
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    return clock
+
+
+def test_token_bucket_bursts_then_waits_for_refill(clock):
+    bucket = TokenBucket(per_minute=60)  # one per second, ten seconds of burst
+    assert bucket.capacity == 10
+    assert [bucket.reserve(1) for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    clock.now += 5
+    assert bucket.reserve(1) == 0.0
+    assert bucket.level == pytest.approx(2.0)
+
+
+def test_token_bucket_clamps_large_reservations_and_refunds(clock):
+    bucket = TokenBucket(per_minute=600, capacity=50)
+    # more than the capacity can never be saved up, so it costs one full bucket
+    assert bucket.reserve(80) == 0.0
+    assert bucket.level == 0.0
+    bucket.refund(30)
+    assert bucket.level == 30
+    bucket.refund(100)
+    assert bucket.level == 50
+
+
+def test_aimd_throttle_halves_in_flight_and_ignores_the_same_burst(clock):
+    aimd = AimdController(initial=8, maximum=8)
+    for _ in range(6):
+        aimd.acquire()
+    burst_started = clock.now
+    clock.now += 1
+    aimd.on_throttle(burst_started)
+    assert aimd.limit == 3.0
+    # requests of the burst that started before the decrease do not decrease it again
+    clock.now += 1
+    aimd.on_throttle(burst_started)
+    assert aimd.limit == 3.0
+    aimd.on_throttle(clock.now)
+    assert aimd.limit == 1.5
+    aimd.on_throttle(clock.now)
+    assert aimd.limit == 1.0  # minimum
+
+
+def test_aimd_grows_one_per_window_up_to_maximum(clock):
+    aimd = AimdController(initial=2, maximum=4)
+    aimd.on_success()
+    aimd.on_success()
+    assert aimd.limit == pytest.approx(2.9)
+    for _ in range(20):
+        aimd.on_success()
+    assert aimd.limit == 4.0
+
+
+def test_aimd_unbounded_until_the_first_throttle(clock):
+    aimd = AimdController()
+    aimd.on_success()
+    assert aimd.limit is None and aimd.has_slot()
+    for _ in range(10):
+        aimd.acquire()
+    aimd.on_throttle(clock.now)
+    assert aimd.limit == 5.0
+    assert not aimd.has_slot()
+    for _ in range(6):
+        aimd.release()
+    assert aimd.has_slot()
+
+
+def responses(*results, in_flight=lambda: None):
+    """A fake provider call returning `results` in turn; records `in_flight()` at each call."""
+    calls = []
+
+    def fn():
+        calls.append(in_flight())
+        return dict(results[len(calls) - 1])
+
+    return fn, calls
+
+
+THROTTLED = {"success": False, "status_code": 429, "retriable": True, "retry_after": 3.0}
+UNAVAILABLE = {"success": False, "status_code": 503, "retriable": True, "retry_after": None}
+BAD_REQUEST = {"success": False, "status_code": 400, "retriable": False, "retry_after": None}
+OK = {"success": True, "content": "plan", "prompt_tokens": 100, "completion_tokens": 50}
+
+
+def call(limiter, mode, fn):
+    if mode == "sync":
+        return limiter.call(fn, estimated_tokens=1000)
+
+    async def afn():
+        return fn()
+
+    return asyncio.run(limiter.acall(afn, estimated_tokens=1000))
+
+
+MODES = ["sync", "async"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_call_retries_429_and_5xx_with_backoff(clock, mode):
+    limiter = ProviderLimiter(max_concurrency=4, backoff_base=1.0, backoff_max=60.0)
+    fn, calls = responses(THROTTLED, UNAVAILABLE, OK, in_flight=lambda: limiter.concurrency.in_flight)
+    result = call(limiter, mode, fn)
+
+    assert result["success"] and result["content"] == "plan"
+    assert result["attempts"] == 3
+    # attempt 0 waits for Retry-After (3 s > 1 s backoff), attempt 1 the 2 s backoff
+    assert clock.sleeps == [3.0, 2.0]
+    assert result["rate_limit_wait"] == 5.0
+    # the slot is held during each call and released between them
+    assert calls == [1, 1, 1]
+    assert limiter.concurrency.in_flight == 0
+    # the 429 halved the limit (floor 1); the success added 1 / limit
+    assert limiter.concurrency.limit == 2.0
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_call_gives_up_after_max_retries(clock, mode):
+    limiter = ProviderLimiter(max_retries=2, adaptive_concurrency=False)
+    fn, calls = responses(THROTTLED, THROTTLED, THROTTLED, OK)
+    result = call(limiter, mode, fn)
+
+    assert not result["success"] and result["status_code"] == 429
+    assert result["attempts"] == 3 == len(calls)
+    assert clock.sleeps == [3.0, 3.0]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_call_does_not_retry_client_errors(clock, mode):
+    limiter = ProviderLimiter()
+    fn, calls = responses(BAD_REQUEST, OK)
+    result = call(limiter, mode, fn)
+
+    assert result["status_code"] == 400
+    assert result["attempts"] == 1 == len(calls)
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_call_waits_for_admission_and_refunds_unused_tokens(clock, mode):
+    limiter = ProviderLimiter(requests_per_minute=6, tokens_per_minute=6000, adaptive_concurrency=False)
+    fn, _ = responses(OK, OK)
+    call(limiter, mode, fn)  # the bucket holds a single request
+    assert clock.sleeps == []
+    # 1000 tokens were reserved and 150 billed
+    assert limiter.tokens.level == pytest.approx(850)
+    result = call(limiter, mode, fn)
+    assert clock.sleeps == [pytest.approx(10.0)]
+    assert result["rate_limit_wait"] == pytest.approx(10.0)
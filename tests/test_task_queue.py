@@ -0,0 +1,148 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from benchmark.io import task_queue
+from benchmark.io.task_queue import MAX_ATTEMPTS, Heartbeat, TaskQueue
+
+LEASE = 10.0
+TASKS = [
+    (0, "model-a", Path("instances/i_0")),
+    (1, "model-a", Path("instances/i_1")),
+    (2, "model-b", Path("instances/i_0")),
+]
+NEW_TASK = (3, "model-b", Path("instances/i_1"))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(task_queue, "time", SimpleNamespace(time=clock.time, monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = TaskQueue(tmp_path / "queue.sqlite", create=True)
+    queue.enqueue(TASKS)
+    for worker in ("w1", "w2"):
+        queue.register_worker(worker)
+    return queue
+
+
+def task(queue, seq):
+    cursor = queue.connection().execute("SELECT * FROM tasks WHERE seq = ?", (seq,))
+    return dict(zip([c[0] for c in cursor.description], cursor.fetchone()))
+
+
+def test_claims_lowest_seq_first_and_only_once(queue):
+    assert queue.claim("w1", 2, LEASE) == TASKS[:2]
+    assert queue.claim("w2", 5, LEASE) == TASKS[2:]
+    assert queue.claim("w2", 5, LEASE) == []
+    assert queue.counts() == {"leased": 3}
+
+
+def test_expired_lease_is_reclaimed(queue, clock):
+    queue.claim("w1", 1, LEASE)
+    clock.now += LEASE / 2
+    assert queue.claim("w2", 1, LEASE) == [TASKS[1]]
+    clock.now += LEASE
+    # the lease on task 0 ran out; task 1's (claimed later) has not
+    assert queue.claim("w2", 5, LEASE) == [TASKS[0], TASKS[2]]
+    assert task(queue, 0)["worker"] == "w2"
+    assert task(queue, 0)["attempts"] == 2
+
+
+def test_heartbeat_keeps_only_the_given_leases(queue, clock):
+    queue.claim("w1", 2, LEASE)
+    clock.now += LEASE * 0.75
+    queue.heartbeat("w1", [1], LEASE)
+    # another worker's heartbeat does not extend w1's leases
+    queue.heartbeat("w2", [0], LEASE)
+    clock.now += LEASE * 0.5
+    assert queue.claim("w2", 5, LEASE) == [TASKS[0], TASKS[2]]
+
+
+def test_complete_returns_false_after_the_lease_was_lost(queue, clock):
+    queue.claim("w1", 1, LEASE)
+    clock.now += LEASE + 1
+    queue.claim("w2", 1, LEASE)
+    assert not queue.complete(0, "w1", {"stage": "complete", "run_id": "late"}, Path("results/late"))
+    assert queue.complete(0, "w2", {"stage": "complete", "run_id": "r0"}, Path("results/r0"))
+    (done,) = queue.finished()
+    assert (done["seq"], done["state"], done["worker"], done["run_id"]) == (0, "done", "w2", "r0")
+    assert done["finish_order"] == 1
+    # a second completion of the same task is also refused
+    assert not queue.complete(0, "w2", {"stage": "complete", "run_id": "again"}, None)
+    workers = dict(queue.connection().execute("SELECT worker, finished FROM workers").fetchall())
+    assert workers == {"w1": 0, "w2": 1}
+
+
+def test_task_is_abandoned_after_max_attempts(queue, clock):
+    for attempt in range(MAX_ATTEMPTS):
+        assert queue.claim(f"w{attempt}", 1, LEASE) == [TASKS[0]]
+        assert queue.abandon_expired() == 0
+        clock.now += LEASE + 1
+    assert task(queue, 0)["attempts"] == MAX_ATTEMPTS
+    # the expired lease is not claimable any more; the next task is
+    assert queue.claim("w1", 1, LEASE) == [TASKS[1]]
+    assert queue.abandon_expired() == 1
+    abandoned = task(queue, 0)
+    assert abandoned["state"] == "failed" and abandoned["stage"] == "error"
+    assert abandoned["error"] == f"lease expired {MAX_ATTEMPTS} times (last worker w{MAX_ATTEMPTS - 1})"
+    assert abandoned["finish_order"] == 1
+    assert queue.abandon_expired() == 0
+
+
+def test_enqueue_requeues_failed_tasks_and_keeps_done_ones(queue):
+    queue.claim("w1", 3, LEASE)
+    queue.complete(0, "w1", {"stage": "complete", "run_id": "r0"}, Path("results/r0"))
+    queue.complete(1, "w1", {"stage": "llm", "error": "429"}, None)
+    assert queue.counts() == {"done": 1, "failed": 1, "leased": 1}
+
+    queue.enqueue(TASKS + [NEW_TASK])
+    assert queue.counts() == {"done": 1, "pending": 2, "leased": 1}
+    requeued = task(queue, 1)
+    assert (requeued["state"], requeued["worker"], requeued["attempts"]) == ("pending", None, 0)
+    assert requeued["finish_order"] is None
+    assert [t["seq"] for t in queue.finished()] == [0]
+    # the leased task stays with its worker
+    assert queue.claim("w2", 5, LEASE) == [TASKS[1], NEW_TASK]
+
+
+def test_release_hands_tasks_back_without_counting_the_attempt(queue):
+    queue.claim("w1", 2, LEASE)
+    queue.release("w1")
+    assert queue.counts() == {"pending": 3}
+    assert task(queue, 0)["attempts"] == 0
+    assert queue.claim("w2", 1, LEASE) == [TASKS[0]]
+
+
+def test_heartbeat_renews_started_tasks_until_the_task_timeout(queue, clock):
+    beat = Heartbeat(queue, "w1", lease_seconds=LEASE, task_timeout=30.0)
+    beat.started(0)
+    clock.now += 10
+    beat.started(1)
+    beat.started(2)
+    beat.finished(2)
+    assert beat.live_tasks() == [0, 1]
+    clock.now += 25
+    # task 0 has run for 35 s, past the task timeout
+    assert beat.live_tasks() == [1]
+
+
+def test_missing_queue_is_an_error(tmp_path):
+    with pytest.raises(ValueError):
+        TaskQueue(tmp_path / "missing.sqlite")
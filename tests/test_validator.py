@@ -0,0 +1,126 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmark.asp.validator import ASPValidator
+
+pytest.importorskip("clingo")
+CLINGO = shutil.which("clingo")
+pytestmark = pytest.mark.skipif(CLINGO is None, reason="needs the clingo executable")
+
+DOMAINS = Path(__file__).resolve().parents[1] / "benchmark" / "domains"
+SECRET_AGENT_INSTANCE = "secret_agent/instances/random_grid_4x4_4obstacle_1key/random_grid_4x4_4obstacle_1key_0"
+SECRET_AGENT_PLAN = [
+    "act(secret_agent,move(l1_0),0)",
+    "act(secret_agent,move(l1_1),1)",
+    "act(secret_agent,move(l2_1),2)",
+    "act(secret_agent,move(l3_1),3)",
+    "act(secret_agent,pickup(gun),4)",
+    "act(secret_agent,move(l2_1),5)",
+    "act(secret_agent,move(l2_2),6)",
+    "act(secret_agent,move(l2_3),7)",
+    "act(secret_agent,move(l3_3),8)",
+    "act(secret_agent,kill(mastermind,gun),9)",
+]
+WESTERN_INSTANCE = "western/instances/western_instances_5/instance_0"
+WESTERN_PLAN = [
+    "act(agent_2,snakebite,0)",
+    "act(agent_2,move(l3_1),alive(agent_2),1)",
+    "act(agent_2,move(l3_2),alive(agent_2),2)",
+    "act(agent_2,move(gen_store),alive(agent_2),3)",
+    "act(agent_2,take(meds,carl),alive(agent_2),4)",
+    "act(agent_2,take(meds,carl),alive(agent_2),5)",
+    "act(agent_2,heal(agent_2,meds),alive(agent_2),6)",
+]
+# satisfiable, but agent_3 has neither medicine nor a gun
+WESTERN_NONEXEC_PLAN = [
+    "act(agent_3,snakebite,0)",
+    "act(agent_3,heal(agent_3,meds),alive(agent_3),1)",
+    "act(agent_3,kill(agent_3),alive(agent_3),2)",
+]
+
+
+def secret_agent_plan(acts):
+    return "".join(f":- not {a}.\n" for a in acts)
+
+
+def western_plan(acts):
+    return "".join(f"{a}.\n" for a in acts) + ":- not conflict(_,_,_,_,_).\n"
+
+
+# (domain, instance, [(maxstep, constraints_text)]): Secret Agent plans are solved as
+# assumptions on the shared incremental base, Western plans as guarded `batch_plan(i)` programs
+BATCHES = {
+    "secret_agent": (
+        SECRET_AGENT_INSTANCE,
+        [
+            (10, secret_agent_plan(SECRET_AGENT_PLAN)),
+            (3, secret_agent_plan(SECRET_AGENT_PLAN[:3])),
+            (11, secret_agent_plan(SECRET_AGENT_PLAN[:9])),
+        ],
+    ),
+    "western": (
+        WESTERN_INSTANCE,
+        [
+            (7, western_plan(WESTERN_PLAN)),
+            (3, western_plan(WESTERN_NONEXEC_PLAN)),
+            (2, western_plan(WESTERN_PLAN[:2])),
+        ],
+    ),
+}
+
+
+def validator(domain, instance, api, first_model_only):
+    return ASPValidator(
+        domain,
+        DOMAINS / domain / "base",
+        DOMAINS / instance,
+        clingo_path=CLINGO,
+        use_clingo_api=api,
+        first_model_only=first_model_only,
+    )
+
+
+def feedback(result):
+    return {
+        "satisfiable": result["satisfiable"],
+        "nonexec_feedback": sorted(result["nonexec_feedback"], key=lambda f: f["time"]),
+        "unjustified": result["unjustified"],
+        "open_commitment_frames": result["open_commitment_frames"],
+    }
+
+
+@pytest.mark.parametrize("first_model_only", [True, False])
+@pytest.mark.parametrize("domain", sorted(BATCHES))
+def test_validate_many_matches_one_subprocess_per_plan(domain, first_model_only):
+    instance, plans = BATCHES[domain]
+    plans = [{"maxstep": maxstep, "constraints_text": text} for maxstep, text in plans]
+    expected = validator(domain, instance, False, first_model_only).validate_many(plans)
+    batch_validator = validator(domain, instance, True, first_model_only)
+    results = batch_validator.validate_many(plans)
+
+    assert len(results) == len(batch_validator.last_stdouts) == len(plans)
+    for result, one in zip(results, expected):
+        assert result["api_strategy"] == "batch"
+        assert feedback(result) == feedback(one)
+        for key in ("models", "exhausted"):
+            assert result["solver_stats"][key] == one["solver_stats"][key], key
+        stats = result["solver_stats"]
+        assert stats["wall_time"] == pytest.approx((stats["ground_time"] or 0.0) + stats["total_time"])
+
+
+def test_validate_many_reports_feedback_of_each_plan():
+    instance, plans = BATCHES["western"]
+    plans = [{"maxstep": maxstep, "constraints_text": text} for maxstep, text in plans]
+    valid, nonexec, unsatisfiable = validator("western", instance, True, True).validate_many(plans)
+
+    assert valid["satisfiable"] and not valid["nonexec_feedback"] and not valid["unjustified"]
+    assert sorted(f["message"] for f in nonexec["nonexec_feedback"]) == [
+        "The subject does not have the medicine",
+        "The subject is not armed",
+    ]
+    assert nonexec["unjustified"] == [
+        {"subject": "agent_3", "fluent": "alive(agent_3,f)", "intention": "alive(agent_3)", "time": 3}
+    ]
+    assert not unsatisfiable["satisfiable"] and unsatisfiable["solver_stats"]["models"] == 0